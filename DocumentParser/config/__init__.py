@@ -20,6 +20,7 @@ from .model_registry import (
     list_available_models,
     get_default_model,
     merge_model_params,
+    merge_payload_settings,
     supports_grounding,
 )
 
@@ -56,6 +57,7 @@ __all__ = [
     'list_available_models',
     'get_default_model',
     'merge_model_params',
+    'merge_payload_settings',
     'supports_grounding',
     # Output config
     'OutputConfig',
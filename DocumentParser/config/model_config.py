@@ -4,13 +4,14 @@ Main configuration class for DeepSeek OCR.
 This is what users interact with to configure the system.
 """
 
-from typing import Dict, Optional
+from typing import Dict, Optional, Union
 from dataclasses import dataclass, field
 
 from .model_registry import (
     get_model_config,
     get_default_model,
     merge_model_params,
+    merge_payload_settings,
     supports_grounding
 )
 from .output_config import OutputConfig, get_default_output_config
@@ -50,9 +51,41 @@ class OCRConfig:
     save_annotation_copy: Optional[bool] = None
     
     # ========== Processing Configuration ==========
-    preprocess_image: bool = False
+    preprocess_image: bool = False       # Contrast-normalize pages before OCR
+    preprocess_deskew: bool = False      # Straighten small skew angles before OCR (bboxes mapped back)
+    preprocess_binarize: bool = False    # Otsu black/white conversion (array pipeline)
     parallel_processing: bool = False
     max_workers: int = 4
+    render_lookahead: int = 2         # PDF pages rendered ahead of OCR (0 = inline)
+    auto_orient: bool = False         # Detect sideways pages and skew before OCR
+    orient_upside_down: bool = False  # auto_orient also tests 180° and 90/270° direction (Latin script only; unreliable for CJK)
+    max_skew: float = 5.0             # Largest skew (degrees) corrected by auto_orient / preprocess_deskew
+    crop_margins: bool = False        # Crop blank margins/punch holes before OCR
+    crop_padding: int = 16            # Pixels kept around the detected content
+    suppress_overlaps: bool = False   # Drop duplicate regions and nest contained elements
+    overlap_iou_threshold: float = 0.85          # IoU at which two elements are duplicates
+    overlap_containment_threshold: float = 0.9   # Covered fraction at which an element is nested
+    merge_paragraphs: bool = False    # Merge line-level text fragments into paragraphs
+    paragraph_gap_factor: float = 0.8  # Largest line gap, as a multiple of median line height
+    keep_fragments: bool = False      # Keep merged fragments in paragraph metadata
+    sort_reading_order: bool = False  # Reorder elements into column-aware reading order
+    detect_running_elements: bool = False  # Drop repeated page headers/footers from combined outputs
+    running_element_ratio: float = 0.5     # Fraction of pages a header/footer must repeat on
+    stitch_tables: bool = False       # Merge tables continued over page breaks
+
+    # ========== Tiling Configuration ==========
+    # Oversized pages (A3 drawings, fold-out tables) are split into
+    # overlapping native-resolution tiles instead of being squashed to 1024px
+    tile_pages: bool = False
+    tile_size: int = 1024             # Tile edge length in native pixels
+    tile_overlap: int = 128           # Overlap between neighbouring tiles
+    tile_min_dimension: int = 2048    # Only tile pages whose longest side exceeds this
+
+    # ========== Payload Configuration ==========
+    # Image encoding sent to the model (None = use model defaults)
+    payload_format: Optional[str] = None       # PNG, JPEG, WEBP
+    payload_colorspace: Optional[str] = None   # rgb, grayscale, bilevel
+    payload_quality: Optional[Union[int, str]] = None  # 1-100 or max/high/medium/low
     
     # ========== Visualization Configuration ==========
     show_labels: bool = True
@@ -102,6 +135,41 @@ class OCRConfig:
         
         return params
     
+    def get_payload_settings(self) -> Dict:
+        """
+        Get image payload settings after merging model defaults with overrides.
+        
+        Returns:
+            dict: Payload settings (format, colorspace, quality)
+        
+        Example:
+            >>> config = OCRConfig(payload_format="JPEG", payload_quality="medium")
+            >>> config.get_payload_settings()
+            {'format': 'JPEG', 'colorspace': 'rgb', 'quality': 'medium'}
+        """
+        overrides = {}
+        if self.payload_format is not None:
+            overrides["format"] = self.payload_format
+        if self.payload_colorspace is not None:
+            overrides["colorspace"] = self.payload_colorspace
+        if self.payload_quality is not None:
+            overrides["quality"] = self.payload_quality
+        
+        return merge_payload_settings(self.model_name, overrides)
+    
+    def get_bbox_coordinate_range(self) -> Optional[int]:
+        """
+        Get the largest bbox coordinate the model reports.
+        
+        Returns:
+            Optional[int]: e.g. 999 for normalized boxes, None for image pixels
+        
+        Example:
+            >>> OCRConfig(model_name="deepseek-ocr:3b").get_bbox_coordinate_range()
+            999
+        """
+        return get_model_config(self.model_name).bbox_coordinate_range
+    
     def get_prompt(self) -> str:
         """
         Get the prompt to use for OCR.
@@ -172,6 +240,32 @@ class OCRConfig:
         if self.max_workers < 1:
             raise ValueError("max_workers must be at least 1")
         
+        if self.render_lookahead < 0:
+            raise ValueError("render_lookahead cannot be negative")
+
+        if not 0 <= self.max_skew <= 45:
+            raise ValueError("max_skew must be between 0 and 45 degrees")
+        
+        if self.crop_padding < 0:
+            raise ValueError("crop_padding cannot be negative")
+        
+        if not 0 < self.overlap_iou_threshold <= 1:
+            raise ValueError("overlap_iou_threshold must be between 0 and 1")
+        if not 0 < self.overlap_containment_threshold <= 1:
+            raise ValueError("overlap_containment_threshold must be between 0 and 1")
+        
+        if self.paragraph_gap_factor < 0:
+            raise ValueError("paragraph_gap_factor cannot be negative")
+        
+        if not 0 < self.running_element_ratio <= 1:
+            raise ValueError("running_element_ratio must be between 0 and 1")
+        
+        # Check tiling settings
+        if self.tile_size < 64:
+            raise ValueError("tile_size must be at least 64 pixels")
+        if not 0 <= self.tile_overlap < self.tile_size:
+            raise ValueError("tile_overlap must be between 0 and tile_size")
+
         return True
 
 
@@ -276,6 +370,18 @@ def print_config_summary(config: OCRConfig):
     print(f"  Parallel: {config.parallel_processing}")
     print(f"  Workers: {config.max_workers}")
     print(f"  Preprocess: {config.preprocess_image}")
+    print(f"  Auto Orient: {config.auto_orient} (180°: {config.orient_upside_down})")
+    print(f"  Crop Margins: {config.crop_margins}")
+    print(f"  Suppress Overlaps: {config.suppress_overlaps}")
+    print(f"  Merge Paragraphs: {config.merge_paragraphs}")
+    print(f"  Reading Order: {config.sort_reading_order}")
+    print(f"  Running Headers/Footers: {config.detect_running_elements}")
+    print(f"  Stitch Tables: {config.stitch_tables}")
+    print(f"  Tile Pages: {config.tile_pages}")
+
+    print(f"\nPayload:")
+    for key, value in config.get_payload_settings().items():
+        print(f"  {key}: {value}")
     
     print("=" * 60)
 
@@ -5,7 +5,7 @@ Each model has recommended parameters and capabilities.
 """
 
 from typing import Dict, List, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 
 @dataclass
@@ -27,6 +27,14 @@ class ModelConfig:
     recommended_params: Dict
     prompt_prefix: str = ""
     description: str = ""
+    # Image payload encoding sent with each request (see processors/payload_encoder.py)
+    payload_settings: Dict = field(default_factory=lambda: {
+        "format": "PNG",
+        "colorspace": "rgb",
+        "quality": "high"
+    })
+    # Largest bbox coordinate for models reporting normalized boxes (None = image pixels)
+    bbox_coordinate_range: Optional[int] = None
 
 
 # Model Registry - Currently only tested models
@@ -49,7 +57,8 @@ MODEL_REGISTRY: Dict[str, ModelConfig] = {
             "num_ctx": 8192
         },
         prompt_prefix="<|grounding|>",
-        description="DeepSeek OCR 3B - Fast OCR with grounding support"
+        description="DeepSeek OCR 3B - Fast OCR with grounding support",
+        bbox_coordinate_range=999  # Grounding boxes are normalized to 0-999
     ),
     
     # Fallback for custom/unknown models
@@ -151,6 +160,38 @@ def merge_model_params(
     return merged_params
 
 
+def merge_payload_settings(
+    model_name: str,
+    user_settings: Optional[Dict] = None
+) -> Dict:
+    """
+    Merge user payload settings with model defaults.
+    User settings override defaults.
+    
+    Args:
+        model_name: Name of the model
+        user_settings: User-provided payload settings (format, colorspace, quality)
+    
+    Returns:
+        dict: Merged payload settings
+    
+    Example:
+        >>> settings = merge_payload_settings("deepseek-ocr:3b", {"colorspace": "grayscale"})
+        >>> print(settings)
+        {'format': 'PNG', 'colorspace': 'grayscale', 'quality': 'high'}
+    """
+    config = get_model_config(model_name)
+    
+    # Start with model defaults
+    merged_settings = config.payload_settings.copy()
+    
+    # Override with user settings
+    if user_settings:
+        merged_settings.update(user_settings)
+    
+    return merged_settings
+
+
 def supports_grounding(model_name: str) -> bool:
     """
     Check if model supports grounding/bounding boxes.
@@ -56,7 +56,42 @@ class OutputConfig:
     # ====================================
     
     # Cleanup
-    cleanup_intermediates: bool = False  # Remove temporary files
+    cleanup_intermediates: bool = False  # Remove OCR intermediates and consumed page renders per page
+    
+    # Page images
+    dedupe_images: bool = False      # Keep page images once in a content-addressed blob store
+    blob_subfolder: str = "blobs"    # Blob store under output_base_dir (shared by all documents)
+    image_links: str = "hardlink"    # Page image files hardlink to blobs, or "manifest" (images.json only)
+    
+    # Disk budgets (renders, annotations and caches are evicted oldest first; results never are)
+    storage_budgets_mb: Dict[str, int] = field(default_factory=dict)  # Per category: renders, annotations, caches, raw_outputs, results
+    min_free_disk_mb: int = 0        # Refuse new pages below this much free disk (0 = no check)
+    
+    # Writing
+    async_writes: bool = False       # Write page outputs on a background thread
+    write_queue_size: int = 8        # Pages queued for writing before extraction waits
+    
+    # Serialization of grounding, combined and metadata files
+    serializer: str = "json"          # json (compact), json-pretty (export/debugging) or msgpack
+    
+    # Compression per artifact: none, gzip or zstd (adds .gz / .zst to file names)
+    compression: Dict[str, str] = field(default_factory=lambda: {
+        "raw_output": "none",
+        "grounding_json": "none",
+        "markdown": "none",
+        "combined": "none"            # full_document.md / .json
+    })
+    compression_level: Dict[str, int] = field(default_factory=dict)  # Per artifact (missing = codec default)
+    
+    # Analytics export (needs pyarrow): elements and page stats per document, partitioned by model
+    columnar_export: bool = False
+    columnar_format: str = "parquet"   # parquet or arrow
+    columnar_subfolder: str = "analytics"  # Under output_base_dir (shared by all documents)
+    
+    # Storage backend
+    storage_backend: str = "folders"  # folders (files per page) or sqlite (one indexed file)
+    store_scope: str = "document"     # sqlite file per document, or "batch" (one in output_base_dir)
+    store_filename: str = "results.sqlite"
 
 
 def get_default_output_config() -> OutputConfig:
@@ -167,6 +202,80 @@ def validate_output_config(config: OutputConfig) -> bool:
                 f"Must be one of: {valid_formats}"
             )
     
+    # Check serializer
+    valid_serializers = ["json", "json-pretty", "msgpack"]
+    if config.serializer not in valid_serializers:
+        raise ValueError(
+            f"Invalid serializer: {config.serializer}. "
+            f"Must be one of: {valid_serializers}"
+        )
+    
+    # Check compression
+    valid_artifacts = ["raw_output", "grounding_json", "markdown", "combined"]
+    valid_codecs = ["none", "gzip", "zstd"]
+    for artifact, codec in config.compression.items():
+        if artifact not in valid_artifacts:
+            raise ValueError(
+                f"Invalid compression artifact: {artifact}. "
+                f"Must be one of: {valid_artifacts}"
+            )
+        if codec not in valid_codecs:
+            raise ValueError(
+                f"Invalid compression codec for {artifact}: {codec}. "
+                f"Must be one of: {valid_codecs}"
+            )
+    levels = {"gzip": (1, 9), "zstd": (1, 22)}
+    for artifact, level in config.compression_level.items():
+        codec = config.compression.get(artifact, "none")
+        if codec in levels and not levels[codec][0] <= level <= levels[codec][1]:
+            raise ValueError(
+                f"Invalid compression level for {artifact} ({codec}): {level}. "
+                f"Must be in {list(levels[codec])}"
+            )
+    
+    # Check storage backend
+    if config.storage_backend not in ["folders", "sqlite"]:
+        raise ValueError(
+            f"Invalid storage_backend: {config.storage_backend}. "
+            f"Must be one of: ['folders', 'sqlite']"
+        )
+    if config.store_scope not in ["document", "batch"]:
+        raise ValueError(
+            f"Invalid store_scope: {config.store_scope}. "
+            f"Must be one of: ['document', 'batch']"
+        )
+    
+    # Check image links
+    if config.image_links not in ["hardlink", "manifest"]:
+        raise ValueError(
+            f"Invalid image_links: {config.image_links}. "
+            f"Must be one of: ['hardlink', 'manifest']"
+        )
+    
+    # Check storage budgets
+    storage_categories = ["renders", "annotations", "caches", "raw_outputs", "results"]
+    for category, budget in config.storage_budgets_mb.items():
+        if category not in storage_categories:
+            raise ValueError(
+                f"Invalid storage budget category: {category}. "
+                f"Must be one of: {storage_categories}"
+            )
+        if budget < 0:
+            raise ValueError(f"Storage budget for {category} must be non-negative")
+    if config.min_free_disk_mb < 0:
+        raise ValueError("min_free_disk_mb must be non-negative")
+    
+    # Check columnar export
+    if config.columnar_format not in ["parquet", "arrow"]:
+        raise ValueError(
+            f"Invalid columnar_format: {config.columnar_format}. "
+            f"Must be one of: ['parquet', 'arrow']"
+        )
+    
+    # Check writer queue
+    if config.write_queue_size < 1:
+        raise ValueError("write_queue_size must be at least 1")
+    
     return True
 
 
@@ -208,9 +317,24 @@ def print_output_config(config: OutputConfig):
     print(f"\nVisualization:")
     print(f"  Save Visualizations: {config.save_visualizations}")
     
+    print(f"\nPage Images:")
+    print(f"  Deduplicate: {config.dedupe_images} ({config.image_links})")
+    print(f"  Cleanup Intermediates: {config.cleanup_intermediates}")
+    if config.storage_budgets_mb or config.min_free_disk_mb:
+        print(f"  Budgets (MB): {config.storage_budgets_mb or 'none'}, keep free: {config.min_free_disk_mb}")
+    
     print(f"\nMetadata:")
     print(f"  Save Metadata: {config.save_metadata}")
     
+    print(f"\nWriting:")
+    print(f"  Async Writes: {config.async_writes}")
+    print(f"  Serializer: {config.serializer}")
+    compressed = {artifact: codec for artifact, codec in config.compression.items() if codec != "none"}
+    print(f"  Compression: {compressed or 'none'}")
+    print(f"  Storage Backend: {config.storage_backend}")
+    if config.columnar_export:
+        print(f"  Columnar Export: {config.columnar_format} in {config.columnar_subfolder}/")
+    
     print("=" * 60)
 
 
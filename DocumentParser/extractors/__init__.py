@@ -18,6 +18,7 @@ from .multipage_processor import (
     PageResult,
     DocumentResult,
 )
+from .result_loader import LazyPageResults, load_document_result
 
 __all__ = [
     # Base classes
@@ -30,4 +31,6 @@ __all__ = [
     'MultiPageProcessor',
     'PageResult',
     'DocumentResult',
+    'LazyPageResults',
+    'load_document_result',
 ]
\ No newline at end of file
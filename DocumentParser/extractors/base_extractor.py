@@ -68,6 +68,53 @@ class ExtractionResult:
             ],
             'metadata': self.metadata
         }
+    
+    def to_record(self) -> Dict[str, Any]:
+        """
+        Convert to a lossless dictionary (full content and raw text).
+        
+        Unlike to_dict(), which is a truncated summary, the record restores
+        the result with from_record().
+        
+        Returns:
+            dict: Record of plain data
+        """
+        parse_data = self.parse_result.to_dict()
+        parse_data['raw_text'] = self.parse_result.raw_text
+        return {
+            'raw_output': self.raw_output,
+            'parse_result': parse_data,
+            'model_name': self.model_name,
+            'prompt_used': self.prompt_used,
+            'image_path': self.image_path,
+            'processing_time': self.processing_time,
+            'success': self.success,
+            'error_message': self.error_message,
+            'metadata': self.metadata
+        }
+    
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> 'ExtractionResult':
+        """
+        Rebuild a result from to_record() output.
+        
+        Args:
+            record: Dictionary from to_record()
+        
+        Returns:
+            ExtractionResult: Restored result
+        """
+        return cls(
+            raw_output=record['raw_output'],
+            parse_result=ParseResult.from_dict(record['parse_result']),
+            model_name=record['model_name'],
+            prompt_used=record['prompt_used'],
+            image_path=record['image_path'],
+            processing_time=record['processing_time'],
+            success=record.get('success', True),
+            error_message=record.get('error_message'),
+            metadata=record.get('metadata')
+        )
 
 
 class BaseExtractor(ABC):
@@ -200,12 +200,13 @@ class HuggingFaceExtractor(BaseExtractor):
             )
         
         try:
-            # Get prompt
-            if custom_prompt is None:
-                if self.config and self.config.use_grounding:
-                    custom_prompt = "<image>\n<|grounding|>Convert the document to markdown."
-                else:
-                    custom_prompt = "<image>\nFree OCR."
+            # Get prompt (the one actually sent is also the parser cache key)
+            if custom_prompt:
+                prompt = custom_prompt
+            elif self.config and self.config.use_grounding:
+                prompt = "<image>\n<|grounding|>Convert the document to markdown."
+            else:
+                prompt = "<image>\nFree OCR."
             
             # Run inference
             print(f"    [HF] Running inference on {Path(image_path).name}...")
@@ -214,7 +215,7 @@ class HuggingFaceExtractor(BaseExtractor):
             with torch.no_grad():
                 result_dict = self.model.infer(
                     self.tokenizer,
-                    prompt=custom_prompt,
+                    prompt=prompt,
                     image_file=image_path,
                     base_size=self.base_size,
                     image_size=self.image_size,
@@ -238,8 +239,11 @@ class HuggingFaceExtractor(BaseExtractor):
                     error_message="Empty response from model"
                 )
             
-            # Parse output
-            parse_result = parse_ocr_output(raw_output)
+            # Parse output (parser choice cached per model and prompt)
+            parse_result = parse_ocr_output(
+                raw_output,
+                cache_key=(self.model_name, prompt)
+            )
             
             # Calculate processing time
             processing_time = time.time() - start_time
@@ -252,7 +256,7 @@ class HuggingFaceExtractor(BaseExtractor):
                 raw_output=raw_output,
                 parse_result=parse_result,
                 model_name=self.model_name,
-                prompt_used=custom_prompt,
+                prompt_used=prompt,
                 image_path=image_path,
                 processing_time=processing_time,
                 success=True
@@ -5,16 +5,29 @@ Handles PDFs and multi-image documents, combining results from multiple pages.
 """
 
 from pathlib import Path
-from typing import List, Optional, Dict, Any
-import json
+from typing import List, Optional, Dict, Any, Set, Tuple, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
 import time
+import numpy as np
 from dataclasses import dataclass
 
-from ..processors import PDFProcessor, ImageProcessor
-from ..storage import OutputManager, DirectoryBuilder
+from ..processors import (
+    PDFProcessor,
+    ImageProcessor,
+    ImageTile,
+    PageOrientation,
+    ArrayPreprocessor,
+    CoordinateTransform,
+)
+from ..storage import OutputManager, DirectoryBuilder, CombinedWriter, StorageGovernor, StorageBudgetError
 from ..utils import is_pdf, is_supported_image, get_file_stem
+from ..parsers import ParseResult, ParsedElement, OverlapSuppressor, ParagraphMerger
+from ..parsers.overlap_suppressor import box_areas, pairwise_intersections, greedy_suppression
+from ..parsers.spatial_index import reading_order
+from ..postprocessors import RunningElementDetector, TableStitcher, is_running_element, is_continuation
 from .base_extractor import BaseExtractor, ExtractionResult
-from ..config import get_default_output_config
+from ..config import get_default_output_config, create_default_config
 
 @dataclass
 class PageResult:
@@ -23,6 +36,7 @@ class PageResult:
     extraction_result: ExtractionResult
     page_image_path: str
     output_dir: str
+    transform: Optional[CoordinateTransform] = None  # Model space -> page_image_path pixels
 
 
 @dataclass
@@ -33,7 +47,7 @@ class DocumentResult:
     input_file: str
     output_dir: str
     page_count: int
-    page_results: List[PageResult]
+    page_results: List[PageResult]  # LazyPageResults when loaded with load(lazy=True)
     total_processing_time: float
     success: bool = True
     error_message: Optional[str] = None
@@ -68,12 +82,118 @@ class DocumentResult:
                     'page_number': pr.page_number,
                     'success': pr.extraction_result.success,
                     'elements': pr.extraction_result.get_element_count(),
-                    'processing_time': pr.extraction_result.processing_time
+                    'processing_time': pr.extraction_result.processing_time,
+                    'payload_bytes': _payload_stats(pr.extraction_result).get('byte_size')
                 }
                 for pr in self.page_results
             ],
             'metadata': self.metadata
         }
+    
+    def to_record(self) -> Dict[str, Any]:
+        """
+        Convert to a lossless dictionary for serializers (see storage.serializers).
+        
+        Returns:
+            dict: Record of plain data, restored by from_record()
+        
+        Example:
+            >>> serializer = get_serializer("msgpack")
+            >>> serializer.dump(result.to_record(), "manual.msgpack")
+            >>> restored = DocumentResult.from_record(serializer.load("manual.msgpack"))
+        """
+        return {
+            'input_file': self.input_file,
+            'output_dir': self.output_dir,
+            'page_count': self.page_count,
+            'total_processing_time': self.total_processing_time,
+            'success': self.success,
+            'error_message': self.error_message,
+            'metadata': self.metadata,
+            'pages': [
+                {
+                    'page_number': pr.page_number,
+                    'page_image_path': pr.page_image_path,
+                    'output_dir': pr.output_dir,
+                    'transform': pr.transform.to_dict() if pr.transform else None,
+                    'extraction': pr.extraction_result.to_record()
+                }
+                for pr in self.page_results
+            ]
+        }
+    
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> 'DocumentResult':
+        """
+        Rebuild a result from to_record() output.
+        
+        Args:
+            record: Dictionary from to_record()
+        
+        Returns:
+            DocumentResult: Restored result
+        """
+        return cls(
+            input_file=record['input_file'],
+            output_dir=record['output_dir'],
+            page_count=record['page_count'],
+            page_results=[
+                PageResult(
+                    page_number=page['page_number'],
+                    extraction_result=ExtractionResult.from_record(page['extraction']),
+                    page_image_path=page['page_image_path'],
+                    output_dir=page['output_dir'],
+                    transform=CoordinateTransform.from_dict(page['transform']) if page.get('transform') else None
+                )
+                for page in record['pages']
+            ],
+            total_processing_time=record['total_processing_time'],
+            success=record.get('success', True),
+            error_message=record.get('error_message'),
+            metadata=record.get('metadata')
+        )
+    
+    @classmethod
+    def load(
+        cls,
+        output_dir: str,
+        lazy: bool = True,
+        output_config: Optional[Any] = None
+    ) -> 'DocumentResult':
+        """
+        Reopen the output directory of a past run without re-running OCR.
+        
+        Metadata and the page index are read now. With lazy=True,
+        page_results is a LazyPageResults that reads each page when
+        accessed (grounding files through a memory map, or the SQLite
+        store named in metadata['storage']) and keeps only a few pages
+        in memory, so iterating a long document stays small.
+        
+        Args:
+            output_dir: Document output directory
+            lazy: Load pages on access (False = load all pages now)
+            output_config: Output configuration the run used (None = defaults)
+        
+        Returns:
+            DocumentResult: Restored result (image paths and prompts may be partial)
+        
+        Example:
+            >>> result = DocumentResult.load("output/manual")
+            >>> for page in result.page_results:
+            ...     print(page.page_number, page.extraction_result.get_element_count())
+        """
+        from .result_loader import load_document_result
+        return load_document_result(output_dir, lazy=lazy, output_config=output_config)
+    
+    def close(self):
+        """Release the page source of a lazily loaded result (no-op otherwise)"""
+        if hasattr(self.page_results, 'close'):
+            self.page_results.close()
+
+
+def _payload_stats(result: ExtractionResult) -> Dict[str, Any]:
+    """Payload statistics recorded by the extractor (empty if none)"""
+    return (result.metadata or {}).get('payload') or {}
 
 
 class MultiPageProcessor:
@@ -108,6 +228,9 @@ class MultiPageProcessor:
         """
         self.extractor = extractor
         
+        # Processing settings (tiling, workers) come from the extractor's OCR config
+        self.ocr_config = getattr(extractor, 'config', None) or create_default_config()
+        
         # Get output config
         if output_config is None:
             # from config import get_default_output_config
@@ -117,6 +240,28 @@ class MultiPageProcessor:
         # Initialize processors
         self.pdf_processor = PDFProcessor(dpi=300)
         self.image_processor = ImageProcessor()
+        self.array_preprocessor = ArrayPreprocessor(
+            target_size=(1024, 1024),  # DeepSeek OCR Base resolution
+            normalize=self.ocr_config.preprocess_image,
+            binarize=self.ocr_config.preprocess_binarize
+        )
+        self.overlap_suppressor = OverlapSuppressor(
+            iou_threshold=self.ocr_config.overlap_iou_threshold,
+            containment_threshold=self.ocr_config.overlap_containment_threshold
+        )
+        self.paragraph_merger = ParagraphMerger(
+            gap_factor=self.ocr_config.paragraph_gap_factor,
+            keep_fragments=self.ocr_config.keep_fragments
+        )
+        self.running_detector = RunningElementDetector(
+            min_page_ratio=self.ocr_config.running_element_ratio
+        )
+        self.table_stitcher = TableStitcher(
+            running_detector=RunningElementDetector(
+                min_page_ratio=self.ocr_config.running_element_ratio,
+                min_pages=2
+            )
+        )
         
         # Initialize output manager and directory builder
         self.output_manager = OutputManager(output_config)
@@ -154,40 +299,95 @@ class MultiPageProcessor:
                 error_message=f"File not found: {file_path}"
             )
         
+        # Refuse the document up front when the disk budget cannot be met
+        governor = self.output_manager.governor
+        if governor is not None:
+            try:
+                governor.check()
+            except StorageBudgetError as e:
+                return self._create_error_result(file_path=str(file_path), error_message=str(e))
+        
         start_time = time.time()
+        combined_writer = None
+        output_dir = None
+        page_bytes = 0
         
         try:
             # Create output directory structure
             output_dir = self.dir_builder.create_document_structure(str(file_path))
+            self.output_manager.begin_document(output_dir)
+            if governor is not None:
+                governor.protect(output_dir)
             
-            # Get list of images to process
+            # Get images to process (PDF pages are rendered lazily)
             if is_pdf(str(file_path)):
+                total_pages = self._count_pdf_pages(str(file_path), page_range)
                 images = self._process_pdf(str(file_path), output_dir, page_range)
             elif is_supported_image(str(file_path)):
-                images = [str(file_path)]
+                total_pages = 1
+                # Generator (not list iterator) so closing() works for both paths
+                images = (image for image in [str(file_path)])
             else:
                 return self._create_error_result(
                     file_path=str(file_path),
                     error_message=f"Unsupported file format: {file_path.suffix}"
                 )
             
+            # Open combined output; pages are appended as they complete unless
+            # document-level passes (running elements, table stitching) must see all pages first
+            combined_writer = self._open_combined_output(output_dir, total_pages)
+            stream_combined = combined_writer is not None and not (
+                self.ocr_config.detect_running_elements or self.ocr_config.stitch_tables
+            )
+            
             # Process each page
             page_results = []
-            for page_num, image_path in enumerate(images, 1):
-                print(f"Processing page {page_num}/{len(images)}...")
-                
-                page_result = self._process_page(
-                    image_path=image_path,
-                    page_number=page_num,
-                    output_dir=output_dir,
-                    custom_prompt=custom_prompt
-                )
-                
-                page_results.append(page_result)
+            with closing(images):
+                for page_num, image_path in enumerate(images, 1):
+                    print(f"Processing page {page_num}/{total_pages}...")
+                    
+                    # Make room for this page (sized like the pages so far) or stop
+                    if governor is not None:
+                        governor.check(required_bytes=page_bytes // max(1, page_num - 1))
+                    
+                    page_result = self._process_page(
+                        image_path=image_path,
+                        page_number=page_num,
+                        output_dir=output_dir,
+                        custom_prompt=custom_prompt
+                    )
+                    
+                    page_results.append(page_result)
+                    if stream_combined:
+                        self._append_combined_page(combined_writer, page_result)
+                    if governor is not None:
+                        page_bytes += self._track_page_storage(governor, page_result, output_dir)
+            
+            # Wait for background page writes before document-level passes mutate elements
+            write_errors = self.output_manager.flush()
+            
+            # Optionally flag headers/footers repeated across pages
+            updated_pages = set()
+            if self.ocr_config.detect_running_elements:
+                updated_pages |= self._flag_running_elements(page_results)
+            
+            # Optionally merge tables continued over page breaks
+            if self.ocr_config.stitch_tables:
+                updated_pages |= self._stitch_tables(page_results)
             
-            # Create combined output
-            if self.output_config.create_combined and len(page_results) > 1:
-                self._create_combined_output(page_results, output_dir)
+            # Pages were written before the document-level passes; save the ones they changed again
+            if updated_pages:
+                self._rewrite_pages(page_results, updated_pages)
+                write_errors += self.output_manager.flush()
+            
+            # Finish combined output
+            if combined_writer is not None:
+                if not stream_combined:
+                    for page_result in page_results:
+                        combined_writer.add_page(
+                            page_result.page_number, *self._combined_page(page_result)
+                        )
+                combined_writer.finalize()
             
             # Generate metadata
             total_time = time.time() - start_time
@@ -197,35 +397,68 @@ class MultiPageProcessor:
                 total_time=total_time
             )
             
+            # Failed background writes fail the document like synchronous ones would
+            error_message = None
+            if write_errors:
+                metadata['write_errors'] = [str(error) for error in write_errors]
+                error_message = f"Failed to write {len(write_errors)} page output(s): {write_errors[0]}"
+                print(f"  ✗ {error_message}")
+            
             # Save metadata
             if self.output_config.save_metadata:
                 self._save_metadata(metadata, output_dir)
+                self.output_manager.save_document(str(file_path), metadata)
+            
+            # List deduplicated page images and drop temp renders (cleanup_intermediates)
+            self.output_manager.save_image_manifest(output_dir)
+            self.dir_builder.cleanup_temp_files(output_dir)
             
             # Create result
-            return DocumentResult(
+            result = DocumentResult(
                 input_file=str(file_path),
                 output_dir=output_dir,
                 page_count=len(page_results),
                 page_results=page_results,
                 total_processing_time=total_time,
-                success=True,
+                success=not write_errors,
+                error_message=error_message,
                 metadata=metadata
             )
+            
+            # Add elements and page statistics to the analytics datasets (columnar_export)
+            self.output_manager.save_columnar(result)
+            
+            return result
         
         except Exception as e:
+            # Drain queued writes so they cannot leak into the next document
+            self.output_manager.flush()
+            # Close the pages written so far into a well-formed partial document
+            if combined_writer is not None:
+                combined_writer.finalize()
             return self._create_error_result(
                 file_path=str(file_path),
                 error_message=f"Processing failed: {str(e)}"
             )
+        
+        finally:
+            # Re-index what the document left on disk; it may be evicted from now on
+            if governor is not None and output_dir is not None:
+                governor.track(output_dir)
+                governor.release(output_dir)
+                self.output_manager.release_page_images()
     
     def _process_pdf(
         self,
         pdf_path: str,
         output_dir: str,
         page_range: Optional[tuple]
-    ) -> List[str]:
+    ) -> Iterator[str]:
         """
-        Convert PDF to images.
+        Lazily convert PDF pages to images.
+        
+        Pages are rendered at most `render_lookahead` pages ahead of OCR,
+        so large documents do not need every page rendered up front.
         
         Args:
             pdf_path: Path to PDF file
@@ -233,20 +466,32 @@ class MultiPageProcessor:
             page_range: Optional page range
             
         Returns:
-            List[str]: List of image paths
+            Iterator[str]: Image paths in page order
         """
         # Create temp directory for page images
         pages_temp_dir = Path(output_dir) / "temp_pages"
         pages_temp_dir.mkdir(parents=True, exist_ok=True)
         
-        # Convert PDF to images
-        images = self.pdf_processor.pdf_to_images(
+        # Render pages on demand
+        pages = self.pdf_processor.iter_pages(
             pdf_path=pdf_path,
             output_dir=str(pages_temp_dir),
-            page_range=page_range
+            page_range=page_range,
+            lookahead=self.ocr_config.render_lookahead
         )
         
-        return images
+        with closing(pages):
+            for _, image_path in pages:
+                yield image_path
+    
+    def _count_pdf_pages(self, pdf_path: str, page_range: Optional[tuple]) -> int:
+        """Number of pages that will be processed for a PDF"""
+        page_count = self.pdf_processor.get_page_count(pdf_path)
+        
+        if not page_range:
+            return page_count
+        
+        return max(0, min(page_count, page_range[1]) - max(1, page_range[0]) + 1)
     
     def _process_page(
         self,
@@ -270,49 +515,53 @@ class MultiPageProcessor:
         # Create page output directory
         page_dir = self.dir_builder.create_page_directory(output_dir, page_number)
         
-        # ========== NEW: Resize image to 1024x1024 for OCR ==========
-        from PIL import Image
-        print(f"  [PRE-PROCESSING] Resizing image for OCR...")
-        
-        # Load original image
-        original_img = Image.open(image_path)
-        original_width, original_height = original_img.size
-        print(f"    Original size: {original_width} × {original_height}")
-        
-        # Resize to 1024x1024 (DeepSeek OCR Base resolution)
-        target_size = 1024
-        resized_img = original_img.resize((target_size, target_size), Image.LANCZOS)
+        # Optionally turn rotated/skewed scans upright (before any retries);
+        # the correction is part of the coordinate transform below
+        source_path, orientation = image_path, None
+        if self.ocr_config.auto_orient or self.ocr_config.preprocess_deskew:
+            source_path, orientation = self._orient_for_ocr(
+                image_path, rotations=self.ocr_config.auto_orient
+            )
         
-        # Save resized image for OCR processing
-        resized_path = Path(image_path).parent / f"{Path(image_path).stem}_ocr.png"
-        resized_img.save(resized_path)
-        print(f"    Resized to: {target_size} × {target_size}")
+        # Optionally crop blank margins so the model's resolution goes to text
+        crop_box = None
+        if self.ocr_config.crop_margins:
+            source_path, crop_box = self._crop_for_ocr(source_path)
         
-        # Store scale factors for later (if needed)
-        scale_x = original_width / target_size
-        scale_y = original_height / target_size
-        # ===========================================================
-
-        # Extract with retry if configured
-        if hasattr(self.extractor, 'config') and self.extractor.config.retry_on_failure:
-            extraction_result = self.extractor.extract_with_retry(
-                # image_path=image_path,
-                image_path=str(resized_path),
-                custom_prompt=custom_prompt
-            )
+        # Oversized pages are extracted as native-resolution tiles instead
+        ocr_image_path = None
+        if self._should_tile(source_path):
+            # Tile results are already merged in source pixels
+            extraction_result = self._extract_tiled(source_path, custom_prompt)
+            source_size = self._get_image_size(source_path)
+            model_size, coordinate_range = source_size, None
         else:
-            extraction_result = self.extractor.extract(
-                # image_path=image_path,
-                image_path=str(resized_path),
-                custom_prompt=custom_prompt
-            )
+            ocr_image_path, source_size, model_size = self._resize_for_ocr(source_path)
+            extraction_result = self._extract(ocr_image_path, custom_prompt)
+            coordinate_range = self.ocr_config.get_bbox_coordinate_range()
         
+        # Map bboxes from model space onto the original page render
+        transform = CoordinateTransform(
+            model_size=model_size,
+            region=crop_box or (0, 0) + tuple(source_size),
+            coordinate_range=coordinate_range,
+            orientation=orientation,
+            page_size=orientation.source_size if orientation else self._get_image_size(image_path)
+        )
+        self._map_to_page(extraction_result, transform, crop_box)
 
-        # ========== NEW: Scale bboxes back to original size ==========
-        # (Optional - only if I want to draw on original size) then i can use the scale_x , scale_y
-        # For now, we'll save everything at 1024x1024 size
-        # ==============================================================
-
+        # Optionally drop duplicate regions and nest contained ones
+        if self.ocr_config.suppress_overlaps:
+            self._suppress_overlaps(extraction_result)
+        
+        # Optionally merge line-level text fragments into paragraphs
+        if self.ocr_config.merge_paragraphs:
+            self._merge_paragraphs(extraction_result)
+        
+        # Optionally reorder elements (and so all page/combined outputs) for multi-column layouts
+        if self.ocr_config.sort_reading_order and extraction_result.parse_result is not None:
+            extraction_result.parse_result.elements = extraction_result.parse_result.get_reading_order()
+        
         # Save page results
         self.output_manager.save_page_result(
             result=extraction_result,
@@ -323,22 +572,493 @@ class MultiPageProcessor:
         # Save annotated image if configured
         if self.output_config.save_per_page.get('annotated_image', False):
             self._create_page_annotation(
-                # image_path=image_path,
-                image_path=str(resized_path),
+                image_path=image_path,
                 extraction_result=extraction_result,
                 page_dir=page_dir,
                 page_number=page_number
             )
             
+        # Move page images into the document store (sqlite backend)
+        self.output_manager.save_page_files(page_number, page_dir)
+        
+        # Optionally drop orientation/crop/resize/tile intermediates now that the page is saved
+        if self.output_config.cleanup_intermediates:
+            self._remove_intermediates(image_path, source_path, ocr_image_path)
+        
+        # Keep the page render once in the blob store (moved there if this run rendered it)
+        if self.output_manager.blobs is not None:
+            image_path = self.output_manager.add_page_image(
+                page_number, image_path, move=Path(output_dir) in Path(image_path).parents
+            )
+        # Otherwise drop this run's render now, so temp_pages only holds look-ahead pages
+        elif self.output_config.cleanup_intermediates and Path(output_dir) in Path(image_path).parents:
+            image_path = self._release_render(image_path, page_dir, page_number)
         
         return PageResult(
             page_number=page_number,
             extraction_result=extraction_result,
-            # page_image_path=image_path,
-            page_image_path=str(resized_path),
-            output_dir=page_dir
+            page_image_path=image_path,
+            output_dir=page_dir,
+            transform=transform
         )
     
+    def _track_page_storage(self, governor: StorageGovernor, page_result: PageResult, output_dir: str) -> int:
+        """
+        Index a finished page's files with the storage governor.
+        
+        Returns:
+            int: Bytes the page added (page folder and page image)
+        """
+        tracked = governor.track(page_result.output_dir)
+        if page_result.page_image_path and Path(page_result.page_image_path).exists():
+            tracked += governor.track(page_result.page_image_path)
+        # Lookahead renders are indexed so they count against the renders budget
+        temp_pages = Path(output_dir) / "temp_pages"
+        if temp_pages.exists():
+            governor.track(temp_pages)
+        return tracked
+    
+    def _release_render(self, image_path: str, page_dir: str, page_number: int) -> str:
+        """
+        Delete a consumed page render.
+        
+        With the sqlite backend the saved original is moved into the store
+        by save_page_files() (possibly still queued on the background
+        writer), so it is never used as the page image there.
+        
+        Returns:
+            str: The page's saved original image if there is one, else ""
+        """
+        Path(image_path).unlink(missing_ok=True)
+        if self.output_manager.store is not None:
+            return ""
+        original_path = Path(page_dir) / f"page_{page_number:03d}_original.png"
+        return str(original_path) if original_path.exists() else ""
+    
+    def _remove_intermediates(self, image_path: str, source_path: str, ocr_image_path: Optional[str]):
+        """
+        Delete per-page files derived from the page image.
+        
+        Args:
+            image_path: Page image (kept)
+            source_path: Upright/cropped image (removed if not image_path)
+            ocr_image_path: Resized image sent to the model (None when tiled)
+        """
+        import shutil
+        
+        for path in (source_path, ocr_image_path):
+            if path and path != image_path:
+                Path(path).unlink(missing_ok=True)
+        
+        # Tiles (and their resized copies) of oversized pages
+        tiles_dir = Path(source_path).parent / f"{Path(source_path).stem}_tiles"
+        if tiles_dir.is_dir():
+            shutil.rmtree(tiles_dir)
+    
+    def _crop_for_ocr(self, image_path: str) -> Tuple[str, Optional[Tuple[int, int, int, int]]]:
+        """
+        Crop a page image to its content bounds.
+        
+        Args:
+            image_path: Path to page image
+        
+        Returns:
+            Tuple[str, Optional[Tuple[int, int, int, int]]]: (image path to
+            extract from, crop box in page pixels or None if not cropped)
+        """
+        cropped_path, crop_box = self.image_processor.crop_to_content(
+            image_path,
+            padding=self.ocr_config.crop_padding
+        )
+        
+        if cropped_path == image_path:
+            return image_path, None
+        
+        x1, y1, x2, y2 = crop_box
+        print(f"  [CROP] Content box ({x1}, {y1}, {x2}, {y2}) -> {x2 - x1} × {y2 - y1}")
+        return cropped_path, crop_box
+    
+    def _orient_for_ocr(self, image_path: str, rotations: bool = True) -> Tuple[str, Optional[PageOrientation]]:
+        """
+        Rotate and deskew a page image so its text is upright.
+        
+        Args:
+            image_path: Path to page image
+            rotations: Also correct quarter-turns (False = deskew only)
+        
+        Returns:
+            Tuple[str, Optional[PageOrientation]]: (image path to extract
+            from, applied correction or None if the page was already upright)
+        """
+        upright_path, orientation = self.image_processor.correct_orientation(
+            image_path,
+            max_skew=self.ocr_config.max_skew,
+            rotations=rotations,
+            upside_down=self.ocr_config.orient_upside_down
+        )
+        
+        if orientation.is_identity():
+            return image_path, None
+        
+        print(
+            f"  [ORIENT] Rotated {orientation.rotation}°, deskewed {orientation.skew:.2f}° "
+            f"(confidence {orientation.confidence:.2f})"
+        )
+        return upright_path, orientation
+    
+    def _map_to_page(
+        self,
+        extraction_result: ExtractionResult,
+        transform: CoordinateTransform,
+        crop_box: Optional[Tuple[int, int, int, int]]
+    ):
+        """
+        Map element bboxes from model space onto the original page render.
+        
+        All bboxes are transformed at once (see CoordinateTransform). The
+        transform, and any crop and orientation applied, are recorded in the
+        result metadata so the mapping can be reproduced or inverted.
+        
+        Args:
+            extraction_result: Result whose elements are updated in place
+            transform: Transform from model space to page pixels
+            crop_box: (x1, y1, x2, y2) crop region on the upright page, or None
+        """
+        metadata = dict(extraction_result.metadata or {})
+        
+        if crop_box is not None:
+            metadata['crop'] = {'box': list(crop_box)}
+        
+        if transform.orientation is not None:
+            metadata['orientation'] = transform.orientation.to_dict()
+        
+        metadata['coordinate_transform'] = transform.to_dict()
+        
+        if not transform.is_identity():
+            transform.apply_to_elements(extraction_result.get_elements())
+        
+        extraction_result.metadata = metadata
+    
+    def _suppress_overlaps(self, extraction_result: ExtractionResult):
+        """
+        Remove duplicate elements and nest contained ones (see OverlapSuppressor).
+        
+        Args:
+            extraction_result: Result whose elements are updated in place
+        """
+        parse_result = extraction_result.parse_result
+        if parse_result is None or not parse_result.elements:
+            return
+        
+        parse_result.elements, stats = self.overlap_suppressor.suppress(parse_result.elements)
+        parse_result.metadata = dict(parse_result.metadata or {}, element_count=stats['output'])
+        extraction_result.metadata = dict(extraction_result.metadata or {}, overlaps=stats)
+        
+        if stats['duplicates_removed'] or stats['nested']:
+            print(
+                f"  [OVERLAP] Removed {stats['duplicates_removed']} duplicate(s), "
+                f"nested {stats['nested']} element(s)"
+            )
+    
+    def _merge_paragraphs(self, extraction_result: ExtractionResult):
+        """
+        Merge line-level text fragments into paragraphs (see ParagraphMerger).
+        
+        Args:
+            extraction_result: Result whose elements are updated in place
+        """
+        parse_result = extraction_result.parse_result
+        if parse_result is None or not parse_result.elements:
+            return
+        
+        parse_result.elements, stats = self.paragraph_merger.merge(parse_result.elements)
+        parse_result.metadata = dict(parse_result.metadata or {}, element_count=stats['output'])
+        extraction_result.metadata = dict(extraction_result.metadata or {}, paragraphs=stats)
+        
+        if stats['paragraphs']:
+            print(
+                f"  [PARAGRAPH] Merged {stats['fragments_merged']} fragment(s) "
+                f"into {stats['paragraphs']} paragraph(s)"
+            )
+    
+    def _get_image_size(self, image_path: str) -> Tuple[int, int]:
+        """Read image dimensions (header only)"""
+        from PIL import Image
+        
+        with Image.open(image_path) as img:
+            return img.size
+    
+    def _resize_for_ocr(self, image_path: str) -> Tuple[str, Tuple[int, int], Tuple[int, int]]:
+        """
+        Resize a page image to the model's base resolution.
+        
+        Args:
+            image_path: Path to page image
+            
+        Returns:
+            Tuple[str, Tuple[int, int], Tuple[int, int]]: (path to resized
+            image used for OCR, source size, resized size)
+        """
+        print(f"  [PRE-PROCESSING] Resizing image for OCR...")
+        
+        # Decode once, area-resize (+ optional contrast/binarize), save once; deskew is done by _orient_for_ocr
+        resized_path = Path(image_path).parent / f"{Path(image_path).stem}_ocr.png"
+        stats = self.array_preprocessor.run(image_path, str(resized_path))
+        
+        original_width, original_height = stats['source_size']
+        target_width, target_height = stats['size']
+        print(f"    Original size: {original_width} × {original_height}")
+        print(f"    Resized to: {target_width} × {target_height}")
+        
+        return str(resized_path), tuple(stats['source_size']), tuple(stats['size'])
+    
+    def _extract(
+        self,
+        image_path: str,
+        custom_prompt: Optional[str]
+    ) -> ExtractionResult:
+        """
+        Run the extractor on a single image.
+        
+        Args:
+            image_path: Path to image sent to the model
+            custom_prompt: Optional custom prompt
+            
+        Returns:
+            ExtractionResult: Extraction result
+        """
+        # Extract with retry if configured
+        if hasattr(self.extractor, 'config') and self.extractor.config.retry_on_failure:
+            return self.extractor.extract_with_retry(
+                image_path=image_path,
+                custom_prompt=custom_prompt
+            )
+        
+        return self.extractor.extract(
+            image_path=image_path,
+            custom_prompt=custom_prompt
+        )
+    
+    def _should_tile(self, image_path: str) -> bool:
+        """Check if a page should be extracted as tiles"""
+        if not self.ocr_config.tile_pages:
+            return False
+        
+        return self.image_processor.needs_tiling(
+            image_path,
+            min_dimension=self.ocr_config.tile_min_dimension
+        )
+    
+    def _extract_tiled(
+        self,
+        image_path: str,
+        custom_prompt: Optional[str]
+    ) -> ExtractionResult:
+        """
+        Extract an oversized page tile by tile.
+        
+        The page is split into overlapping tiles at native resolution and
+        the tiles are extracted concurrently (up to max_workers). Grounding
+        boxes are mapped from each tile's model space back into page pixel
+        space before merging.
+        
+        Args:
+            image_path: Path to full-resolution page image
+            custom_prompt: Optional custom prompt
+            
+        Returns:
+            ExtractionResult: Merged result in page pixel space
+        """
+        tiles_dir = Path(image_path).parent / f"{Path(image_path).stem}_tiles"
+        tiles = self.image_processor.split_into_tiles(
+            image_path,
+            str(tiles_dir),
+            tile_size=self.ocr_config.tile_size,
+            overlap=self.ocr_config.tile_overlap
+        )
+        print(
+            f"  [TILING] Split page into {len(tiles)} tiles "
+            f"({self.ocr_config.tile_size}px, {self.ocr_config.tile_overlap}px overlap)"
+        )
+        
+        start_time = time.time()
+        
+        workers = max(1, min(self.ocr_config.max_workers, len(tiles)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            tile_results = list(executor.map(
+                lambda tile: self._extract(tile.image_path, custom_prompt),
+                tiles
+            ))
+        
+        return self._merge_tile_results(
+            image_path=image_path,
+            tiles=tiles,
+            tile_results=tile_results,
+            processing_time=time.time() - start_time
+        )
+    
+    def _merge_tile_results(
+        self,
+        image_path: str,
+        tiles: List[ImageTile],
+        tile_results: List[ExtractionResult],
+        processing_time: float
+    ) -> ExtractionResult:
+        """
+        Merge per-tile extraction results into one page result.
+        
+        Args:
+            image_path: Path to full-resolution page image
+            tiles: Tiles in the same order as tile_results
+            tile_results: Extraction result per tile
+            processing_time: Wall time for all tiles
+            
+        Returns:
+            ExtractionResult: Page-level result
+        """
+        tagged_elements = []
+        raw_parts = []
+        failed_tiles = []
+        coordinate_range = self.ocr_config.get_bbox_coordinate_range()
+        
+        for tile, result in zip(tiles, tile_results):
+            raw_parts.append(
+                f"<!-- tile {tile.row},{tile.col} at ({tile.x_offset}, {tile.y_offset}) -->\n"
+                f"{result.raw_output}"
+            )
+            
+            if not result.success:
+                failed_tiles.append(f"tile {tile.row},{tile.col}: {result.error_message}")
+                continue
+            
+            # Map tile coordinates into page space
+            tile_box = tile.get_box()
+            CoordinateTransform(
+                model_size=(tile_box[2] - tile_box[0], tile_box[3] - tile_box[1]),
+                region=tile_box,
+                coordinate_range=coordinate_range
+            ).apply_to_elements(result.get_elements())
+            
+            for element in result.get_elements():
+                element.metadata = dict(element.metadata or {}, tile=[tile.row, tile.col])
+                tagged_elements.append((tile, element))
+        
+        elements = self._dedupe_tile_elements(tagged_elements)
+        
+        # Renumber in column-aware reading order (tiles split columns arbitrarily)
+        elements = [elements[i] for i in reading_order([element.bbox for element in elements])]
+        for element_id, element in enumerate(elements, 1):
+            element.element_id = element_id
+        
+        reference = next((r for r in tile_results if r.success), tile_results[0])
+        raw_output = '\n'.join(raw_parts)
+        error_message = "; ".join(failed_tiles) if failed_tiles else None
+        
+        parse_result = ParseResult(
+            elements=elements,
+            raw_text=raw_output,
+            parser_type=reference.parse_result.parser_type,
+            success=not failed_tiles,
+            error_message=error_message,
+            metadata={
+                'element_count': len(elements),
+                'tile_count': len(tiles),
+                'duplicates_removed': len(tagged_elements) - len(elements)
+            }
+        )
+        
+        return ExtractionResult(
+            raw_output=raw_output,
+            parse_result=parse_result,
+            model_name=reference.model_name,
+            prompt_used=reference.prompt_used,
+            image_path=image_path,
+            processing_time=processing_time,
+            success=not failed_tiles,
+            error_message=error_message,
+            metadata={
+                'tiling': {
+                    'tile_size': self.ocr_config.tile_size,
+                    'tile_overlap': self.ocr_config.tile_overlap,
+                    'tiles': [
+                        {
+                            'row': tile.row,
+                            'col': tile.col,
+                            'box': list(tile.get_box()),
+                            'success': result.success,
+                            'elements': result.get_element_count(),
+                            'processing_time': result.processing_time
+                        }
+                        for tile, result in zip(tiles, tile_results)
+                    ]
+                },
+                'payload': self._sum_payload_stats(tile_results)
+            }
+        )
+    
+    def _sum_payload_stats(self, results: List[ExtractionResult]) -> Dict[str, Any]:
+        """
+        Total payload sizes and encode times across several requests.
+        
+        Args:
+            results: Extraction results (e.g. one per tile)
+        
+        Returns:
+            dict: Summed byte_size, base64_size and encode_time plus request count
+        """
+        stats = [_payload_stats(result) for result in results]
+        stats = [entry for entry in stats if entry]
+        return {
+            'requests': len(stats),
+            'byte_size': sum(entry['byte_size'] for entry in stats),
+            'base64_size': sum(entry['base64_size'] for entry in stats),
+            'encode_time': sum(entry['encode_time'] for entry in stats)
+        }
+    
+    def _dedupe_tile_elements(
+        self,
+        tagged_elements: List[Tuple[ImageTile, ParsedElement]],
+        min_overlap: float = 0.7
+    ) -> List[ParsedElement]:
+        """
+        Drop elements detected twice where neighbouring tiles overlap.
+        
+        Two elements from different tiles are duplicates when they share a
+        type and the smaller box lies mostly inside the larger one. The
+        larger copy is kept, since a copy clipped by a tile edge is smaller.
+        
+        Args:
+            tagged_elements: (tile, element) pairs in page coordinates
+            min_overlap: Fraction of the smaller box that must be covered
+            
+        Returns:
+            List[ParsedElement]: De-duplicated elements
+        """
+        if len(tagged_elements) < 2:
+            return [element for _, element in tagged_elements]
+        
+        boxes = np.array([element.bbox for _, element in tagged_elements], dtype=np.float64)
+        areas = box_areas(boxes)
+        tile_ids = np.array([id(tile) for tile, _ in tagged_elements])
+        types = np.array([element.element_type for _, element in tagged_elements])
+        
+        # Intersection as a fraction of the smaller box of each pair
+        smaller = np.minimum(areas[:, None], areas[None, :])
+        intersections = pairwise_intersections(boxes)
+        containment = np.divide(intersections, smaller, out=np.zeros_like(intersections), where=smaller > 0)
+        
+        suppressed_by = greedy_suppression(
+            containment,
+            order=np.argsort(-areas, kind='stable'),
+            threshold=min_overlap,
+            compatible=(types[:, None] == types[None, :]) & (tile_ids[:, None] != tile_ids[None, :])
+        )
+        
+        return [
+            element for (_, element), keeper in zip(tagged_elements, suppressed_by.tolist())
+            if keeper < 0
+        ]
+    
     def _create_page_annotation(
         self,
         image_path: str,
@@ -373,14 +1093,16 @@ class MultiPageProcessor:
                 color_scheme=color_scheme
             )
 
-            # ========== FIX: Copy the RESIZED image as original ==========
+            # Copy the full-resolution page render (bboxes are in its pixel space)
             original_path = Path(page_dir) / f"page_{page_number:03d}_original.png"
         
-            # Copy the resized image (1024×1024) to output directory
             if not original_path.exists():
-                shutil.copy2(image_path, original_path)  # ← image_path is already resized!
+                if self.output_manager.blobs is not None:
+                    self.output_manager.add_page_image(page_number, image_path, original_path.name, page_dir)
+                else:
+                    shutil.copy2(image_path, original_path)
                 print(f"  ✓ Saved original image: {original_path.name}")
-            # ====================================================
+            
             # Create annotated image path
             annotated_path = Path(page_dir) / f"page_{page_number:03d}_annotated.png"
             
@@ -414,71 +1136,139 @@ class MultiPageProcessor:
 
 
 
-    def _create_combined_output(
-        self,
-        page_results: List[PageResult],
-        output_dir: str
-    ):
+    def _flag_running_elements(self, page_results: List[PageResult]) -> Set[int]:
         """
-        Create combined output from all pages.
+        Flag running headers/footers (see RunningElementDetector).
+        
+        Flagged elements keep their place in per-page outputs but are left
+        out of combined outputs; downstream consumers can skip them with
+        is_running_element().
         
         Args:
-            page_results: List of page results
-            output_dir: Base output directory
+            page_results: Results of all pages; elements are updated in place
+        
+        Returns:
+            Set[int]: Numbers of the pages with flagged elements
+        """
+        stats = self.running_detector.detect(
+            [pr.extraction_result.get_elements() for pr in page_results],
+            [pr.transform.page_size if pr.transform else None for pr in page_results]
+        )
+        
+        if stats['patterns']:
+            print(
+                f"  [RUNNING] Flagged {stats['headers']} header(s) and "
+                f"{stats['footers']} footer(s) from {stats['patterns']} repeated pattern(s)"
+            )
+        return {
+            pr.page_number for pr in page_results
+            if any(is_running_element(element) for element in pr.extraction_result.get_elements())
+        }
+    
+    def _stitch_tables(self, page_results: List[PageResult]) -> Set[int]:
         """
-        combined_dir = Path(output_dir) / self.output_config.combined_subfolder
-        combined_dir.mkdir(parents=True, exist_ok=True)
+        Merge continuation tables into the table they continue (see TableStitcher).
         
-        # Combine markdown
-        if "markdown" in self.output_config.combined_formats:
-            self._create_combined_markdown(page_results, combined_dir)
+        Continuations keep their place in per-page outputs but are left out
+        of combined outputs, where the first part holds the whole table.
         
-        # Combine JSON
-        if "json" in self.output_config.combined_formats:
-            self._create_combined_json(page_results, combined_dir)
+        Args:
+            page_results: Results of all pages; elements are updated in place
+        
+        Returns:
+            Set[int]: Numbers of the pages holding stitched tables or continuations
+        """
+        stats = self.table_stitcher.stitch(
+            [(pr.page_number, pr.extraction_result.get_elements()) for pr in page_results],
+            [pr.transform.page_size if pr.transform else None for pr in page_results]
+        )
+        
+        if stats['continuations']:
+            print(
+                f"  [TABLE] Stitched {stats['continuations']} continuation(s) "
+                f"into {stats['tables']} table(s)"
+            )
+        return {
+            pr.page_number for pr in page_results
+            if any(
+                is_continuation(element) or 'table_parts' in (element.metadata or {})
+                for element in pr.extraction_result.get_elements()
+            )
+        }
     
-    def _create_combined_markdown(
-        self,
-        page_results: List[PageResult],
-        combined_dir: Path
-    ):
-        """Create combined markdown file"""
-        markdown_content = []
+    def _rewrite_pages(self, page_results: List[PageResult], page_numbers: Set[int]):
+        """
+        Save the per-page outputs of pages changed by document-level passes again.
         
+        Args:
+            page_results: Results of all pages
+            page_numbers: Pages to rewrite
+        """
         for page_result in page_results:
-            markdown_content.append(f"# Page {page_result.page_number}\n")
-            
-            # Extract text from elements
-            for element in page_result.extraction_result.get_elements():
-                markdown_content.append(element.content)
-                markdown_content.append("\n")
-            
-            markdown_content.append("\n---\n\n")
+            if page_result.page_number in page_numbers:
+                self.output_manager.save_page_result(
+                    result=page_result.extraction_result,
+                    page_number=page_result.page_number,
+                    page_dir=page_result.output_dir
+                )
+    
+    def _open_combined_output(self, output_dir: str, total_pages: int) -> Optional[CombinedWriter]:
+        """
+        Open the streaming combined output (None if disabled or single page).
         
-        # Save combined markdown
-        output_file = combined_dir / "full_document.md"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(''.join(markdown_content))
+        Args:
+            output_dir: Base output directory
+            total_pages: Pages that will be processed
+        """
+        if not self.output_config.create_combined or total_pages <= 1:
+            return None
+        return CombinedWriter(
+            Path(output_dir) / self.output_config.combined_subfolder,
+            formats=self.output_config.combined_formats,
+            serializer=self.output_manager.serializer,
+            codec=self.output_manager.codecs['combined']
+        )
     
-    def _create_combined_json(
-        self,
-        page_results: List[PageResult],
-        combined_dir: Path
-    ):
-        """Create combined JSON file"""
-        combined_data = {
-            'pages': [
-                {
-                    'page_number': pr.page_number,
-                    'elements': pr.extraction_result.parse_result.to_dict()
-                }
-                for pr in page_results
-            ]
-        }
+    def _append_combined_page(self, combined_writer: CombinedWriter, page_result: PageResult):
+        """Append a finished page to the combined output (on the background writer if enabled)"""
+        self.output_manager.write(
+            combined_writer.add_page,
+            page_result.page_number,
+            *self._combined_page(page_result),
+            label=f"page {page_result.page_number} combined"
+        )
+    
+    def _combined_page(self, page_result: PageResult) -> Tuple[str, Dict[str, Any]]:
+        """Markdown chunk and JSON entry of a page for the combined output"""
+        markdown_content = [f"# Page {page_result.page_number}\n"]
+        
+        # Extract text from elements (running headers/footers and table continuations skipped)
+        for element in page_result.extraction_result.get_elements():
+            if is_running_element(element) or is_continuation(element):
+                continue
+            markdown_content.append(element.content)
+            markdown_content.append("\n")
         
-        output_file = combined_dir / "full_document.json"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(combined_data, f, indent=2, ensure_ascii=False)
+        markdown_content.append("\n---\n\n")
+        
+        data = {
+            'page_number': page_result.page_number,
+            'elements': self._combined_page_dict(page_result)
+        }
+        return ''.join(markdown_content), data
+    
+    def _combined_page_dict(self, page_result: PageResult) -> Dict[str, Any]:
+        """Page parse result as a dict, without running headers/footers or table continuations"""
+        data = page_result.extraction_result.parse_result.to_dict()
+        elements = page_result.extraction_result.get_elements()
+        kept = [
+            element_dict for element, element_dict in zip(elements, data['elements'])
+            if not (is_running_element(element) or is_continuation(element))
+        ]
+        if len(kept) != len(data['elements']):
+            data['elements'] = kept
+            data['element_count'] = len(kept)
+        return data
     
     def _generate_metadata(
         self,
@@ -493,6 +1283,26 @@ class MultiPageProcessor:
             'total_processing_time': total_time,
             'successful_pages': sum(1 for pr in page_results if pr.extraction_result.success),
             'total_elements': sum(pr.extraction_result.get_element_count() for pr in page_results),
+            'payload': self._sum_payload_stats([pr.extraction_result for pr in page_results]),
+            'duplicates_removed': sum(
+                (pr.extraction_result.metadata or {}).get('overlaps', {}).get('duplicates_removed', 0)
+                for pr in page_results
+            ),
+            'paragraphs_merged': sum(
+                (pr.extraction_result.metadata or {}).get('paragraphs', {}).get('paragraphs', 0)
+                for pr in page_results
+            ),
+            'running_elements': sum(
+                is_running_element(element)
+                for pr in page_results
+                for element in pr.extraction_result.get_elements()
+            ),
+            'tables_stitched': sum(
+                is_continuation(element)
+                for pr in page_results
+                for element in pr.extraction_result.get_elements()
+            ),
+            'storage': self.output_manager.get_storage_info(),
             'model_used': self.extractor.get_extractor_name(),
             'timestamp': time.strftime('%Y-%m-%d %H:%M:%S')
         }
@@ -500,8 +1310,7 @@ class MultiPageProcessor:
     def _save_metadata(self, metadata: dict, output_dir: str):
         """Save metadata to file"""
         metadata_file = Path(output_dir) / self.output_config.metadata_filename
-        with open(metadata_file, 'w', encoding='utf-8') as f:
-            json.dump(metadata, f, indent=2, ensure_ascii=False)
+        self.output_manager.metadata_serializer.dump(metadata, metadata_file)
     
     def _create_error_result(
         self,
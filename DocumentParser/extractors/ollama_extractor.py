@@ -5,7 +5,7 @@ Supports: DeepSeek OCR, LLaVA, Llama-Vision, Qwen-VL, etc.
 """
 
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Callable
 import time
 
 try:
@@ -15,7 +15,9 @@ except ImportError:
     OLLAMA_AVAILABLE = False
 
 from ..config import OCRConfig
-from ..parsers import parse_ocr_output
+from ..parsers import parse_ocr_output, ParsedElement
+from ..parsers.streaming_parser import create_streaming_parser
+from ..processors.payload_encoder import PayloadEncoder, PayloadSettings
 from ..utils import configure_proxy_bypass, check_ollama_running, verify_model_exists
 from .base_extractor import BaseExtractor, ExtractionResult
 from ..config import create_default_config
@@ -66,6 +68,11 @@ class OllamaExtractor(BaseExtractor):
         # Create Ollama client
         self.client = ollama.Client(host=self.config.host)
         
+        # Image payload encoder (format/colorspace/quality per model)
+        self.payload_encoder = PayloadEncoder(
+            PayloadSettings(**self.config.get_payload_settings())
+        )
+        
         # Verify connection and configuration
         if not self.validate_config():
             raise ConnectionError(
@@ -148,11 +155,14 @@ class OllamaExtractor(BaseExtractor):
         try:
             start_time = time.time()
             
+            # Encode image payload (Ollama base64-encodes these bytes)
+            payload = self.payload_encoder.encode(str(image_path))
+            
             # Call Ollama API
             response = self.client.generate(
                 model=self.config.model_name,
                 prompt=prompt,
-                images=[str(image_path)],
+                images=[payload.data],
                 options=model_params,
                 stream=False
             )
@@ -169,51 +179,15 @@ class OllamaExtractor(BaseExtractor):
                     model_name=self.config.model_name
                 )
             
-            # Parse output
-            parse_result = parse_ocr_output(raw_output)
-            
-            # # ========== NEW: Auto-scale bounding boxes (as of now not requires )==========
-            # from PIL import Image
+            # Parse output (parser choice cached per model and prompt)
+            parse_result = parse_ocr_output(
+                raw_output,
+                cache_key=(self.config.model_name, prompt)
+            )
             
-            # # Get original image size
-            # img = Image.open(image_path)
-            # original_width, original_height = img.size
+            # Bboxes stay in model space here; MultiPageProcessor maps them
+            # onto page pixels with a CoordinateTransform
             
-            # # Scale bboxes if needed
-            # if parse_result and parse_result.elements:
-            #     # Find max coordinates
-            #     max_x = 0
-            #     max_y = 0
-            #     for elem in parse_result.elements:
-            #         if elem.bbox:
-            #             max_x = max(max_x, elem.bbox[2])
-            #             max_y = max(max_y, elem.bbox[3])
-                
-            #     # If max coords are much smaller than image, scale is needed
-            #     if max_x > 0 and max_y > 0 and (max_x < original_width * 0.7 or max_y < original_height * 0.7):
-            #         # Calculate scale factors
-            #         scale_x = original_width / max_x
-            #         scale_y = original_height / max_y
-            #         scale = min(scale_x, scale_y)  # Use minimum to avoid overflow
-                    
-            #         print(f"    [BBOX AUTO-SCALING]")
-            #         print(f"      Image size: {original_width} × {original_height}")
-            #         print(f"      Model coords: ~{max_x} × ~{max_y}")
-            #         print(f"      Scale factor: {scale:.2f}x")
-                    
-            #         # Scale all bounding boxes
-            #         for elem in parse_result.elements:
-            #             if elem.bbox:
-            #                 elem.bbox = [
-            #                     int(elem.bbox[0] * scale),
-            #                     int(elem.bbox[1] * scale),
-            #                     int(elem.bbox[2] * scale),
-            #                     int(elem.bbox[3] * scale)
-            #                 ]
-                    
-            #         print(f"      ✓ Scaled {len(parse_result.elements)} bboxes")
-            # # ===================================================
-
             # Calculate processing time
             processing_time = time.time() - start_time
             # Create result
@@ -227,7 +201,106 @@ class OllamaExtractor(BaseExtractor):
                 success=True,
                 metadata={
                     'ollama_host': self.config.host,
-                    'model_params': model_params
+                    'model_params': model_params,
+                    'payload': payload.to_dict()
+                }
+            )
+        
+        except Exception as e:
+            return self.create_error_result(
+                image_path=str(image_path),
+                error_message=f"Extraction failed: {str(e)}",
+                model_name=self.config.model_name
+            )
+    
+    def extract_streaming(
+        self,
+        image_path: str,
+        custom_prompt: Optional[str] = None,
+        on_element: Optional[Callable[[ParsedElement], None]] = None
+    ) -> ExtractionResult:
+        """
+        Extract with a streamed response, parsing elements as tokens arrive.
+        
+        Each element is passed to `on_element` as soon as it is complete,
+        before generation has finished.
+        
+        Args:
+            image_path: Path to image file
+            custom_prompt: Override default prompt
+            on_element: Called with each completed ParsedElement
+        
+        Returns:
+            ExtractionResult: Extraction result with parsed elements
+        
+        Example:
+            >>> extractor = OllamaExtractor()
+            >>> result = extractor.extract_streaming(
+            ...     "document.png",
+            ...     on_element=lambda e: print(e.element_type, e.bbox)
+            ... )
+        """
+        image_path = Path(image_path)
+        
+        if not self.validate_image_path(str(image_path)):
+            return self.create_error_result(
+                image_path=str(image_path),
+                error_message=f"Invalid or missing image: {image_path}",
+                model_name=self.config.model_name
+            )
+        
+        prompt = custom_prompt or self.config.get_prompt()
+        model_params = self.config.get_merged_model_params()
+        
+        # Grounding prompts produce <|ref|>/<|det|> tags
+        parser = create_streaming_parser(
+            grounding='<|grounding|>' in prompt,
+            on_element=on_element
+        )
+        
+        try:
+            start_time = time.time()
+            payload = self.payload_encoder.encode(str(image_path))
+            
+            stream = self.client.generate(
+                model=self.config.model_name,
+                prompt=prompt,
+                images=[payload.data],
+                options=model_params,
+                stream=True
+            )
+            
+            first_token_time = None
+            for part in stream:
+                chunk = part.get('response', '')
+                if chunk and first_token_time is None:
+                    first_token_time = time.time() - start_time
+                parser.feed(chunk)
+            
+            parse_result = parser.result()
+            raw_output = parse_result.raw_text
+            
+            if not raw_output:
+                return self.create_error_result(
+                    image_path=str(image_path),
+                    error_message="Empty response from model",
+                    model_name=self.config.model_name
+                )
+            
+            return ExtractionResult(
+                raw_output=raw_output,
+                parse_result=parse_result,
+                model_name=self.config.model_name,
+                prompt_used=prompt,
+                image_path=str(image_path),
+                processing_time=time.time() - start_time,
+                success=True,
+                metadata={
+                    'ollama_host': self.config.host,
+                    'model_params': model_params,
+                    'payload': payload.to_dict(),
+                    'streamed': True,
+                    'first_token_time': first_token_time
                 }
             )
         
@@ -0,0 +1,419 @@
+"""
+Result Loader Module
+Reopens the output of a past run as a DocumentResult without re-running OCR.
+Pages are read on access from page folders or the SQLite document store.
+"""
+
+from collections import OrderedDict
+from collections.abc import Sequence
+from pathlib import Path
+from typing import List, Optional, Dict, Any, Union
+import os
+import re
+
+from ..config import OutputConfig, get_default_output_config
+from ..parsers import ParseResult
+from ..processors import CoordinateTransform
+from ..storage import (
+    DocumentStore,
+    JsonSerializer,
+    serializer_for_path,
+    codec_for_path,
+    find_artifact,
+    read_artifact,
+)
+from .base_extractor import ExtractionResult
+
+# Extraction metadata keys written by OutputManager._grounding_data()
+_METADATA_KEYS = ('payload', 'coordinate_transform', 'overlaps', 'paragraphs')
+
+# Let SQLite map up to this much of a store file for page reads
+_STORE_MMAP_SIZE = 256 * 1024 * 1024
+
+
+class FolderPageSource:
+    """
+    Reads pages from the per-page folder layout.
+    
+    Grounding files (grounding.json or grounding.msgpack) are decoded
+    through a memory map; raw_output.txt supplies the raw text. Files
+    compressed by the run (e.g. grounding.json.zst) are decompressed.
+    """
+    
+    def __init__(
+        self,
+        document_dir: Path,
+        config: OutputConfig,
+        page_numbers: Optional[List[int]] = None,
+        compression: Optional[Dict[str, str]] = None
+    ):
+        """
+        Index the page folders.
+        
+        Args:
+            document_dir: Document output directory
+            config: Output configuration the run used (folder naming)
+            page_numbers: Expected pages (None = every page folder found)
+            compression: Codec per artifact recorded in metadata['storage']
+        """
+        self.document_dir = document_dir
+        self.config = config
+        self.compression = compression or {}
+        pages_dir = document_dir / config.pages_subfolder
+        
+        if page_numbers is None:
+            page_numbers = sorted(
+                int(match.group()) for match in (
+                    re.search(r'\d+', path.name) for path in pages_dir.glob('*') if path.is_dir()
+                ) if match
+            )
+        
+        # Page number -> grounding file (None if the page has none)
+        self.index: Dict[int, Optional[Path]] = {}
+        for page_number in page_numbers:
+            page_dir = pages_dir / config.page_naming_format.format(num=page_number)
+            self.index[page_number] = next(
+                (
+                    path for path in (
+                        find_artifact(page_dir / name, self.compression.get('grounding_json'))
+                        for name in ("grounding.json", "grounding.msgpack")
+                    ) if path is not None
+                ),
+                None
+            )
+    
+    def page_numbers(self) -> List[int]:
+        return list(self.index)
+    
+    def page_dir(self, page_number: int) -> Path:
+        return self.document_dir / self.config.pages_subfolder / self.config.page_naming_format.format(num=page_number)
+    
+    def read(self, page_number: int) -> Dict[str, Any]:
+        """Raw output and decoded grounding data of a page"""
+        grounding_path = self.index[page_number]
+        raw_path = find_artifact(self.page_dir(page_number) / "raw_output.txt", self.compression.get('raw_output'))
+        return {
+            'raw_output': read_artifact(raw_path).decode('utf-8') if raw_path else None,
+            'grounding': self._load_grounding(grounding_path) if grounding_path else None
+        }
+    
+    def _load_grounding(self, path: Path) -> Dict[str, Any]:
+        """Decode a grounding file (memory-mapped unless compressed)"""
+        serializer = serializer_for_path(path)
+        if codec_for_path(path).extension:
+            return serializer.loads(read_artifact(path))
+        return serializer.load_mapped(path)
+    
+    def close(self):
+        pass
+
+
+class StorePageSource:
+    """Reads pages from a DocumentStore (see storage.document_store)"""
+    
+    def __init__(self, store_file: Path, document_key: str):
+        """
+        Open the store and index the document's pages.
+        
+        Args:
+            store_file: SQLite store path
+            document_key: Document key inside the store
+        """
+        self.store = DocumentStore(store_file, mmap_size=_STORE_MMAP_SIZE)
+        self.document_key = document_key
+        self.index = self.store.list_pages(document_key)
+    
+    def page_numbers(self) -> List[int]:
+        return list(self.index)
+    
+    def read(self, page_number: int) -> Dict[str, Any]:
+        """Raw output and decoded grounding data of a page"""
+        return self.store.get_page(self.document_key, page_number) or {'raw_output': None, 'grounding': None}
+    
+    def close(self):
+        self.store.close()
+
+
+class LazyPageResults(Sequence):
+    """
+    Read-only sequence of PageResult that loads each page on access.
+    
+    Only the cache_size most recently used pages are kept, so iterating
+    a long document holds one page (plus the cache) in memory at a time.
+    
+    Example:
+        >>> pages = result.page_results  # From DocumentResult.load()
+        >>> for page in pages:
+        ...     index(page.extraction_result.get_elements())
+    """
+    
+    def __init__(
+        self,
+        source,
+        output_dir: Path,
+        cache_size: int = 8,
+        page_images: Optional[Dict[int, str]] = None,
+        config: Optional[OutputConfig] = None
+    ):
+        """
+        Initialize sequence.
+        
+        Args:
+            source: FolderPageSource or StorePageSource
+            output_dir: Document output directory
+            cache_size: Pages kept after loading (0 = none)
+            page_images: Page number -> page image path (from images.json)
+            config: Output configuration the run used (page folder naming)
+        """
+        self.source = source
+        self.output_dir = output_dir
+        self.config = config or get_default_output_config()
+        self.cache_size = cache_size
+        self.page_images = page_images or {}
+        self._page_numbers = source.page_numbers()
+        self._known = set(self._page_numbers)
+        self._cache: 'OrderedDict[int, Any]' = OrderedDict()
+    
+    def __len__(self) -> int:
+        return len(self._page_numbers)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return self.get_page(self._page_numbers[index])
+    
+    def __iter__(self):
+        for page_number in self._page_numbers:
+            yield self.get_page(page_number)
+    
+    def page_numbers(self) -> List[int]:
+        """Page numbers in order (no page is loaded)"""
+        return list(self._page_numbers)
+    
+    def get_page(self, page_number: int):
+        """
+        Load one page by number.
+        
+        Args:
+            page_number: Page number
+        
+        Returns:
+            PageResult: Restored page
+        
+        Raises:
+            KeyError: If the page is not in the output
+        """
+        if page_number in self._cache:
+            self._cache.move_to_end(page_number)
+            return self._cache[page_number]
+        if page_number not in self._known:
+            raise KeyError(f"Page {page_number} not found in {self.output_dir}")
+        
+        page_result = _build_page_result(
+            page_number, self.source.read(page_number), _page_dir(self.output_dir, self.config, page_number),
+            self.output_dir, self.page_images.get(page_number)
+        )
+        if self.cache_size:
+            self._cache[page_number] = page_result
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return page_result
+    
+    def close(self):
+        """Release the page source (closes a SQLite store)"""
+        self._cache.clear()
+        self.source.close()
+
+
+def _page_dir(output_dir: Path, config: OutputConfig, page_number: int) -> Path:
+    """Page folder as created by DirectoryBuilder.create_page_directory"""
+    if not config.split_pages:
+        return output_dir
+    return output_dir / config.pages_subfolder / config.page_naming_format.format(num=page_number)
+
+
+def _build_page_result(
+    page_number: int,
+    page: Dict[str, Any],
+    page_dir: Path,
+    output_dir: Path,
+    page_image: Optional[str] = None
+):
+    """PageResult from stored raw output and grounding data"""
+    from .multipage_processor import PageResult
+    
+    raw_output = page.get('raw_output')
+    grounding = page.get('grounding')
+    
+    if grounding is None:
+        grounding = {'success': False, 'error_message': "No grounding data saved for page"}
+    extraction_metadata = grounding.get('extraction_metadata') or {}
+    extraction_result = ExtractionResult(
+        raw_output=raw_output or "",
+        parse_result=ParseResult.from_dict(grounding, raw_text=raw_output),
+        model_name=extraction_metadata.get('model', ""),
+        prompt_used=extraction_metadata.get('prompt_used', ""),
+        image_path="",
+        processing_time=extraction_metadata.get('processing_time', 0.0),
+        success=grounding.get('success', True),
+        error_message=grounding.get('error_message'),
+        metadata={key: extraction_metadata[key] for key in _METADATA_KEYS if key in extraction_metadata}
+    )
+    
+    transform = extraction_metadata.get('coordinate_transform')
+    if page_image is None:
+        # Kept render, else the saved original (cleanup_intermediates deletes renders)
+        candidates = (
+            output_dir / "temp_pages" / f"page_{page_number:03d}.png",
+            page_dir / f"page_{page_number:03d}_original.png"
+        )
+        page_image = next((str(path) for path in candidates if path.exists()), "")
+    return PageResult(
+        page_number=page_number,
+        extraction_result=extraction_result,
+        page_image_path=page_image,
+        output_dir=str(page_dir),
+        transform=CoordinateTransform.from_dict(transform) if transform else None
+    )
+
+
+def _recorded_path(output_dir: Path, recorded: Optional[str], default: Path) -> Path:
+    """
+    Resolve a path from document metadata.
+    
+    Paths are recorded relative to the document directory; outputs written
+    before that hold cwd-relative paths, which are tried next, then default.
+    """
+    if not recorded:
+        return default
+    for candidate in (Path(os.path.normpath(output_dir / recorded)), Path(recorded)):
+        if candidate.exists():
+            return candidate
+    return default if default.exists() else output_dir / recorded
+
+
+def load_document_result(
+    output_dir: Union[str, Path],
+    lazy: bool = True,
+    output_config: Optional[OutputConfig] = None,
+    cache_size: int = 8
+):
+    """
+    Reopen a document output directory (see DocumentResult.load).
+    
+    Args:
+        output_dir: Document output directory of a past run
+        lazy: Load pages on access (False = load all pages now)
+        output_config: Output configuration the run used (None = defaults)
+        cache_size: Pages kept in memory by the lazy sequence
+    
+    Returns:
+        DocumentResult: Result whose page_results is a LazyPageResults (lazy)
+            or a list of PageResult
+    
+    Raises:
+        FileNotFoundError: If output_dir has no metadata, pages or store
+    """
+    from .multipage_processor import DocumentResult
+    
+    output_dir = Path(output_dir)
+    config = output_config or get_default_output_config()
+    
+    metadata_file = output_dir / config.metadata_filename
+    metadata = JsonSerializer().load(metadata_file) if metadata_file.exists() else None
+    storage = (metadata or {}).get('storage') or {}
+    
+    # Pages live in the SQLite store named by the run's metadata, else in page folders
+    store_file = _recorded_path(output_dir, storage.get('store_file'), output_dir / config.store_filename)
+    if storage.get('backend') == 'sqlite' or (not storage and store_file.exists()):
+        if not store_file.exists():
+            raise FileNotFoundError(f"Document store not found: {store_file}")
+        source = StorePageSource(store_file, storage.get('document_key') or output_dir.name)
+    elif metadata is not None or (output_dir / config.pages_subfolder).is_dir():
+        page_numbers = list(range(1, metadata['page_count'] + 1)) if metadata and 'page_count' in metadata else None
+        source = FolderPageSource(output_dir, config, page_numbers, storage.get('compression'))
+    else:
+        raise FileNotFoundError(f"No document output found in {output_dir}")
+    
+    # Page renders kept in the blob store (dedupe_images)
+    page_images = {}
+    manifest_file = output_dir / "images.json"
+    if manifest_file.exists():
+        manifest = JsonSerializer().load(manifest_file)
+        blob_dir = _recorded_path(
+            output_dir, manifest.get('blob_dir'),
+            Path(config.output_base_dir) / config.blob_subfolder
+        )
+        page_images = {
+            int(page): str(blob_dir / images['page_image'])
+            for page, images in manifest['pages'].items() if 'page_image' in images
+        }
+    
+    page_results = LazyPageResults(
+        source, output_dir, cache_size=cache_size, page_images=page_images, config=config
+    )
+    if not lazy:
+        page_results = list(page_results)
+        source.close()
+    
+    metadata = metadata or {}
+    write_errors = metadata.get('write_errors')
+    return DocumentResult(
+        input_file=metadata.get('input_file', ""),
+        output_dir=str(output_dir),
+        page_count=metadata.get('page_count', len(page_results)),
+        page_results=page_results,
+        total_processing_time=metadata.get('total_processing_time', 0.0),
+        success=not write_errors,
+        error_message=f"Failed to write {len(write_errors)} page output(s): {write_errors[0]}" if write_errors else None,
+        metadata=metadata or None
+    )
+
+
+if __name__ == "__main__":
+    print("Testing result_loader.py...\n")
+    
+    import tempfile
+    import tracemalloc
+    
+    temp_dir = Path(tempfile.mkdtemp())
+    serializer = JsonSerializer()
+    for page in range(1, 501):
+        page_dir = temp_dir / "pages" / f"page_{page:03d}"
+        page_dir.mkdir(parents=True)
+        serializer.dump({
+            'success': True,
+            'parser_type': 'grounding_parser',
+            'element_count': 50,
+            'elements': [
+                {'id': i, 'type': 'text', 'bbox': [10, 20 * i, 900, 20 * i + 15], 'content': f"line {i} " * 20}
+                for i in range(50)
+            ],
+            'extraction_metadata': {'model': 'deepseek-ocr', 'processing_time': 1.5}
+        }, page_dir / "grounding.json")
+    serializer.dump({'input_file': 'manual.pdf', 'page_count': 500, 'total_processing_time': 750.0}, temp_dir / "metadata.json")
+    
+    # Test 1: Lazy vs eager memory
+    print("Test 1: Iterate 500 Pages")
+    print("-" * 60)
+    tracemalloc.start()
+    result = load_document_result(temp_dir)
+    elements = sum(page.extraction_result.get_element_count() for page in result.page_results)
+    print(f"Lazy:  {elements} elements, peak {tracemalloc.get_traced_memory()[1] / 1e6:.1f} MB")
+    tracemalloc.reset_peak()
+    eager = load_document_result(temp_dir, lazy=False)
+    print(f"Eager: {eager.get_total_elements()} elements, peak {tracemalloc.get_traced_memory()[1] / 1e6:.1f} MB")
+    tracemalloc.stop()
+    
+    # Test 2: Random access
+    print("\n" + "="*60)
+    print("Test 2: Random Access")
+    print("-" * 60)
+    page = result.page_results.get_page(217)
+    print(f"Page {page.page_number}: {page.extraction_result.model_name}, {page.extraction_result.get_element_count()} elements")
+    try:
+        result.page_results.get_page(501)
+    except KeyError as e:
+        print(f"✓ Caught: {e}")
+    
+    print("\n✅ result_loader.py tests passed!")
@@ -10,9 +10,36 @@ from .base_parser import (
     ParseResult,
 )
 
+# Format detection
+from .format_sniffer import (
+    sniff_format,
+    FORMAT_EMPTY,
+    FORMAT_GROUNDING,
+    FORMAT_MARKDOWN,
+    FORMAT_PARTIAL,
+)
+
+# Columnar storage
+from .element_table import ElementTable
+
+# Spatial queries and reading order
+from .spatial_index import SpatialIndex, reading_order
+
+# Overlap suppression
+from .overlap_suppressor import OverlapSuppressor, pairwise_iou
+
+# Paragraph merging
+from .paragraph_merger import ParagraphMerger, restore_fragments
+
 # Parser implementations
 from .grounding_parser import GroundingParser
 from .markdown_parser import MarkdownParser
+from .streaming_parser import (
+    StreamingParser,
+    StreamingGroundingParser,
+    StreamingMarkdownParser,
+    create_streaming_parser,
+)
 
 # Parser registry
 from .parser_registry import (
@@ -26,9 +53,31 @@ __all__ = [
     'BaseParser',
     'ParsedElement',
     'ParseResult',
+    # Format detection
+    'sniff_format',
+    'FORMAT_EMPTY',
+    'FORMAT_GROUNDING',
+    'FORMAT_MARKDOWN',
+    'FORMAT_PARTIAL',
+    # Columnar storage
+    'ElementTable',
+    # Spatial queries and reading order
+    'SpatialIndex',
+    'reading_order',
+    # Overlap suppression
+    'OverlapSuppressor',
+    'pairwise_iou',
+    # Paragraph merging
+    'ParagraphMerger',
+    'restore_fragments',
     # Parser implementations
     'GroundingParser',
     'MarkdownParser',
+    # Streaming parsers
+    'StreamingParser',
+    'StreamingGroundingParser',
+    'StreamingMarkdownParser',
+    'create_streaming_parser',
     # Registry
     'ParserRegistry',
     'get_global_registry',
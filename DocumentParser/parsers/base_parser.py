@@ -5,8 +5,10 @@ Defines the interface that all parsers must implement.
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Sequence, Union
+from dataclasses import dataclass, field
+
+from .spatial_index import SpatialIndex
 
 
 @dataclass
@@ -58,6 +60,8 @@ class ParseResult:
     success: bool = True
     error_message: Optional[str] = None
     metadata: Optional[Dict[str, Any]] = None
+    # (cache key, SpatialIndex) built on first spatial query
+    _spatial_cache: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
     
     def get_elements_by_type(self, element_type: str) -> List[ParsedElement]:
         """
@@ -86,6 +90,90 @@ class ParseResult:
         """
         return len(self.elements)
     
+    def get_spatial_index(self, rebuild: bool = False) -> SpatialIndex:
+        """
+        Get the spatial index over element bboxes.
+        
+        Built on first use and rebuilt when the element list is replaced or
+        resized. Pass rebuild=True after moving bboxes in place.
+        
+        Args:
+            rebuild: Force a rebuild
+        
+        Returns:
+            SpatialIndex: Grid index whose box i is self.elements[i]
+        """
+        key = (id(self.elements), len(self.elements))
+        if rebuild or self._spatial_cache is None or self._spatial_cache[0] != key:
+            self._spatial_cache = (key, SpatialIndex([elem.bbox for elem in self.elements]))
+        return self._spatial_cache[1]
+    
+    def query_region(
+        self,
+        region: Sequence[float],
+        mode: str = 'intersects'
+    ) -> List[ParsedElement]:
+        """
+        Find elements overlapping or inside a region.
+        
+        Args:
+            region: [x1, y1, x2, y2] in the elements' coordinate space
+            mode: 'intersects' or 'within' (element fully inside region)
+        
+        Returns:
+            List of matching elements in document order
+        
+        Example:
+            >>> inside = result.query_region([0, 0, 500, 400], mode='within')
+        """
+        return [self.elements[i] for i in self.get_spatial_index().query(region, mode).tolist()]
+    
+    def nearest(
+        self,
+        target: Union[ParsedElement, Sequence[float]],
+        k: int = 1,
+        direction: Optional[str] = None
+    ) -> List[ParsedElement]:
+        """
+        Find the elements closest to an element or box.
+        
+        Args:
+            target: An element of this result (excluded from the results) or [x1, y1, x2, y2]
+            k: Number of elements to return
+            direction: Optional 'right', 'left', 'above' or 'below'
+        
+        Returns:
+            List of up to k elements, closest first
+        
+        Example:
+            >>> label = result.get_elements_by_type("text")[0]
+            >>> value = result.nearest(label, direction="right")
+        """
+        exclude = None
+        bbox = target
+        if isinstance(target, ParsedElement):
+            bbox = target.bbox
+            exclude = {i for i, elem in enumerate(self.elements) if elem is target}
+        
+        indices = self.get_spatial_index().nearest(bbox, k=k, direction=direction, exclude=exclude)
+        return [self.elements[i] for i in indices.tolist()]
+    
+    def get_reading_order(self) -> List[ParsedElement]:
+        """
+        Get elements in column-aware reading order.
+        
+        Full-width elements split the page into bands; within a band,
+        columns are read left to right, each top to bottom. Results without
+        real bboxes (markdown parser) keep their original order.
+        
+        Returns:
+            List of elements in reading order
+        """
+        if not any(any(elem.bbox) for elem in self.elements):
+            return list(self.elements)
+        
+        return [self.elements[i] for i in self.get_spatial_index().reading_order().tolist()]
+    
     def to_dict(self) -> Dict[str, Any]:
         """
         Convert to dictionary for JSON serialization.
@@ -111,6 +199,38 @@ class ParseResult:
             ],
             "metadata": self.metadata
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], raw_text: Optional[str] = None) -> 'ParseResult':
+        """
+        Rebuild a result from to_dict() output (e.g. a loaded grounding.json).
+        
+        Args:
+            data: Dictionary from to_dict()
+            raw_text: Raw output (to_dict() does not include it); falls back
+                to data['raw_text'] if present, else ""
+        
+        Returns:
+            ParseResult: Restored result
+        """
+        return cls(
+            elements=[
+                ParsedElement(
+                    element_id=elem["id"],
+                    element_type=elem["type"],
+                    bbox=list(elem["bbox"]),
+                    content=elem["content"],
+                    confidence=elem.get("confidence"),
+                    metadata=elem.get("metadata")
+                )
+                for elem in data.get("elements", [])
+            ],
+            raw_text=raw_text if raw_text is not None else data.get("raw_text", ""),
+            parser_type=data.get("parser_type", ""),
+            success=data.get("success", True),
+            error_message=data.get("error_message"),
+            metadata=data.get("metadata")
+        )
 
 
 class BaseParser(ABC):
@@ -119,8 +239,15 @@ class BaseParser(ABC):
     
     All parser implementations must inherit from this class
     and implement the parse() method.
+    
+    Parsers that handle a format recognised by format_sniffer set
+    output_format, which lets the registry dispatch on a single sniff
+    instead of calling can_parse() on every parser.
     """
     
+    # Format constant from format_sniffer handled by this parser (None = unknown)
+    output_format: Optional[str] = None
+    
     def __init__(self, parser_name: str):
         """
         Initialize parser.
@@ -167,6 +294,21 @@ class BaseParser(ABC):
         """
         raise NotImplementedError("Subclasses must implement can_parse()")
     
+    def parse_detected(self, raw_output: str) -> ParseResult:
+        """
+        Parse output whose format has already been detected.
+        
+        Called by the registry after sniffing, so implementations may skip
+        their own format checks. Defaults to parse().
+        
+        Args:
+            raw_output: Raw text output from OCR model
+        
+        Returns:
+            ParseResult: Parsed result with elements
+        """
+        return self.parse(raw_output)
+    
     def get_parser_name(self) -> str:
         """
         Get name of this parser.
@@ -277,4 +419,15 @@ if __name__ == "__main__":
     except ValueError as e:
         print(f"✓ Validation caught error: {e}")
     
+    # Test 5: Spatial queries
+    print("\n" + "="*60)
+    print("Test 5: Spatial Queries")
+    print("-" * 60)
+    label = ParsedElement(4, "text", [120, 20, 180, 40], "Label:")
+    value = ParsedElement(5, "text", [200, 20, 300, 40], "Value")
+    result.elements.extend([label, value])
+    print(f"Inside [0, 0, 110, 260]: {[e.element_id for e in result.query_region([0, 0, 110, 260], mode='within')]}")
+    print(f"Right of label: {[e.content for e in result.nearest(label, direction='right')]}")
+    print(f"Reading order: {[e.element_id for e in result.get_reading_order()]}")
+    
     print("\n✅ base_parser.py tests passed!")
\ No newline at end of file
@@ -0,0 +1,562 @@
+"""
+Element Table Module
+Compact columnar storage for parsed elements.
+Holds bboxes, type codes and content offsets in NumPy arrays for vectorized analytics.
+"""
+
+from typing import List, Dict, Any, Optional, Sequence
+import numpy as np
+
+from .base_parser import ParsedElement, ParseResult
+
+
+# Metadata keys stored as columns (everything else goes to extra_metadata)
+COLUMN_METADATA_KEYS = ('line_number', 'raw_line')
+
+
+class ElementTable:
+    """
+    Columnar representation of parsed elements.
+    
+    Instead of one ParsedElement object per element, a table keeps:
+    - bboxes: int32 array of shape (n, 4)
+    - type_codes: int16 array indexing into type_names (interned types)
+    - content_offsets: int64 array of shape (n + 1,) into one content buffer
+    - element_ids, line_numbers, page_numbers: int32 arrays
+    - confidences: float32 array (NaN where no confidence)
+    - raw_line_flags: bool array, True where raw_line is rebuilt from raw_text
+    
+    Metadata other than line numbers is kept sparsely in extra_metadata
+    (row index -> dict). raw_line is not copied per element when it equals
+    line line_number of the raw text; it is rebuilt from there when
+    converting back to a ParseResult. Rows without raw_line get none back,
+    and raw_lines from another source (e.g. tile outputs of a tiled page)
+    are kept verbatim in extra_metadata.
+    
+    Example:
+        >>> table = ElementTable.from_parse_result(result)
+        >>> tables = table.select(table.type_mask("table"))
+        >>> print(tables.areas().sum())
+    """
+    
+    def __init__(
+        self,
+        element_ids: np.ndarray,
+        type_codes: np.ndarray,
+        type_names: Sequence[str],
+        bboxes: np.ndarray,
+        content_offsets: np.ndarray,
+        content_buffer: str,
+        confidences: Optional[np.ndarray] = None,
+        line_numbers: Optional[np.ndarray] = None,
+        page_numbers: Optional[np.ndarray] = None,
+        extra_metadata: Optional[Dict[int, Dict[str, Any]]] = None,
+        raw_text: Optional[str] = None,
+        raw_line_flags: Optional[np.ndarray] = None
+    ):
+        """
+        Initialize table from column arrays.
+        
+        Args:
+            element_ids: Element IDs, shape (n,)
+            type_codes: Indices into type_names, shape (n,)
+            type_names: Interned element type names
+            bboxes: Bounding boxes [x1, y1, x2, y2], shape (n, 4)
+            content_offsets: Content boundaries in content_buffer, shape (n + 1,)
+            content_buffer: All element contents concatenated
+            confidences: Confidence scores (NaN = None), shape (n,)
+            line_numbers: Source line numbers (0 = unknown), shape (n,)
+            page_numbers: Page numbers (0 = unknown), shape (n,)
+            extra_metadata: Row index -> remaining metadata
+            raw_text: Raw OCR output, used to rebuild raw_line
+            raw_line_flags: Rows whose raw_line is rebuilt from raw_text, shape (n,)
+        """
+        count = len(element_ids)
+        
+        self.element_ids = np.asarray(element_ids, dtype=np.int32)
+        self.type_codes = np.asarray(type_codes, dtype=np.int16)
+        self.type_names = list(type_names)
+        self.bboxes = np.asarray(bboxes, dtype=np.int32).reshape(count, 4)
+        self.content_offsets = np.asarray(content_offsets, dtype=np.int64)
+        self.content_buffer = content_buffer
+        self.confidences = (
+            np.full(count, np.nan, dtype=np.float32) if confidences is None
+            else np.asarray(confidences, dtype=np.float32)
+        )
+        self.line_numbers = (
+            np.zeros(count, dtype=np.int32) if line_numbers is None
+            else np.asarray(line_numbers, dtype=np.int32)
+        )
+        self.page_numbers = (
+            np.zeros(count, dtype=np.int32) if page_numbers is None
+            else np.asarray(page_numbers, dtype=np.int32)
+        )
+        self.raw_line_flags = (
+            np.zeros(count, dtype=bool) if raw_line_flags is None
+            else np.asarray(raw_line_flags, dtype=bool)
+        )
+        self.extra_metadata = extra_metadata or {}
+        self.raw_text = raw_text
+        
+        if len(self.content_offsets) != count + 1:
+            raise ValueError(
+                f"content_offsets must have {count + 1} entries, got {len(self.content_offsets)}"
+            )
+        for name in ('type_codes', 'confidences', 'line_numbers', 'page_numbers', 'raw_line_flags'):
+            if len(getattr(self, name)) != count:
+                raise ValueError(f"{name} must have {count} entries, got {len(getattr(self, name))}")
+    
+    # ========== Construction ==========
+    
+    @classmethod
+    def from_elements(
+        cls,
+        elements: Sequence[ParsedElement],
+        raw_text: Optional[str] = None,
+        page_number: int = 0
+    ) -> 'ElementTable':
+        """
+        Build a table from ParsedElement objects.
+        
+        Args:
+            elements: Parsed elements
+            raw_text: Raw OCR output (kept to rebuild raw_line)
+            page_number: Page number assigned to every row
+        
+        Returns:
+            ElementTable: Columnar table
+        """
+        count = len(elements)
+        type_index: Dict[str, int] = {}
+        type_codes = np.empty(count, dtype=np.int16)
+        bboxes = np.empty((count, 4), dtype=np.int32)
+        element_ids = np.empty(count, dtype=np.int32)
+        confidences = np.full(count, np.nan, dtype=np.float32)
+        line_numbers = np.zeros(count, dtype=np.int32)
+        raw_line_flags = np.zeros(count, dtype=bool)
+        content_offsets = np.zeros(count + 1, dtype=np.int64)
+        contents = []
+        extra_metadata = {}
+        offset = 0
+        raw_lines = None
+        
+        for row, element in enumerate(elements):
+            element_ids[row] = element.element_id
+            type_codes[row] = type_index.setdefault(element.element_type, len(type_index))
+            bboxes[row] = element.bbox
+            if element.confidence is not None:
+                confidences[row] = element.confidence
+            
+            contents.append(element.content)
+            offset += len(element.content)
+            content_offsets[row + 1] = offset
+            
+            metadata = element.metadata
+            if metadata:
+                line_number = metadata.get('line_number') or 0
+                line_numbers[row] = line_number
+                extra = {
+                    key: value for key, value in metadata.items()
+                    if key not in COLUMN_METADATA_KEYS
+                }
+                if 'raw_line' in metadata:
+                    if raw_lines is None and raw_text is not None:
+                        raw_lines = raw_text.split('\n')
+                    if (
+                        raw_lines is not None and 0 < line_number <= len(raw_lines)
+                        and raw_lines[line_number - 1] == metadata['raw_line']
+                    ):
+                        raw_line_flags[row] = True
+                    else:
+                        # Not a line of this raw text - keep it as is
+                        extra['raw_line'] = metadata['raw_line']
+                if extra:
+                    extra_metadata[row] = extra
+        
+        return cls(
+            element_ids=element_ids,
+            type_codes=type_codes,
+            type_names=list(type_index),
+            bboxes=bboxes,
+            content_offsets=content_offsets,
+            content_buffer=''.join(contents),
+            confidences=confidences,
+            line_numbers=line_numbers,
+            page_numbers=np.full(count, page_number, dtype=np.int32),
+            extra_metadata=extra_metadata,
+            raw_text=raw_text,
+            raw_line_flags=raw_line_flags
+        )
+    
+    @classmethod
+    def from_parse_result(
+        cls,
+        result: ParseResult,
+        page_number: int = 0,
+        keep_raw_text: bool = True
+    ) -> 'ElementTable':
+        """
+        Build a table from a ParseResult.
+        
+        Args:
+            result: Parsed result
+            page_number: Page number assigned to every row
+            keep_raw_text: Keep raw output so raw_line can be rebuilt
+        
+        Returns:
+            ElementTable: Columnar table
+        """
+        return cls.from_elements(
+            result.elements,
+            raw_text=result.raw_text if keep_raw_text else None,
+            page_number=page_number
+        )
+    
+    @classmethod
+    def concatenate(cls, tables: Sequence['ElementTable']) -> 'ElementTable':
+        """
+        Stack tables (e.g. all pages of a document) into one table.
+        
+        Type codes are re-interned into a shared vocabulary. Raw text is
+        dropped since rows may come from different outputs, so rebuilt
+        raw_lines are materialized into extra_metadata.
+        
+        Args:
+            tables: Tables to combine
+        
+        Returns:
+            ElementTable: Combined table
+        
+        Example:
+            >>> document = ElementTable.concatenate([
+            ...     ElementTable.from_parse_result(r, page_number=i + 1)
+            ...     for i, r in enumerate(page_results)
+            ... ])
+        """
+        type_index: Dict[str, int] = {}
+        type_codes = []
+        offsets = [np.zeros(1, dtype=np.int64)]
+        extra_metadata = {}
+        base_offset = 0
+        base_row = 0
+        
+        for table in tables:
+            remap = np.array(
+                [type_index.setdefault(name, len(type_index)) for name in table.type_names],
+                dtype=np.int16
+            )
+            type_codes.append(remap[table.type_codes] if len(table) else table.type_codes)
+            offsets.append(table.content_offsets[1:] + base_offset)
+            for row, extra in table.extra_metadata.items():
+                extra_metadata[base_row + row] = extra
+            for row, raw_line in table._rebuilt_raw_lines().items():
+                extra = extra_metadata.get(base_row + row, {})
+                extra_metadata[base_row + row] = dict(extra, raw_line=raw_line)
+            base_offset += len(table.content_buffer)
+            base_row += len(table)
+        
+        def stack(column: str, dtype) -> np.ndarray:
+            arrays = [getattr(table, column) for table in tables]
+            return np.concatenate(arrays).astype(dtype) if arrays else np.empty(0, dtype=dtype)
+        
+        return cls(
+            element_ids=stack('element_ids', np.int32),
+            type_codes=np.concatenate(type_codes) if type_codes else np.empty(0, dtype=np.int16),
+            type_names=list(type_index),
+            bboxes=(
+                np.concatenate([table.bboxes for table in tables]) if tables
+                else np.empty((0, 4), dtype=np.int32)
+            ),
+            content_offsets=np.concatenate(offsets),
+            content_buffer=''.join(table.content_buffer for table in tables),
+            confidences=stack('confidences', np.float32),
+            line_numbers=stack('line_numbers', np.int32),
+            page_numbers=stack('page_numbers', np.int32),
+            extra_metadata=extra_metadata
+        )
+    
+    # ========== Conversion back to objects ==========
+    
+    def _rebuilt_raw_lines(self) -> Dict[int, str]:
+        """Row index -> raw_line for rows flagged to rebuild it from raw_text"""
+        rows = np.flatnonzero(self.raw_line_flags).tolist()
+        if not rows or self.raw_text is None:
+            return {}
+        raw_lines = self.raw_text.split('\n')
+        return {
+            row: raw_lines[self.line_numbers[row] - 1]
+            for row in rows
+            if 0 < self.line_numbers[row] <= len(raw_lines)
+        }
+    
+    def to_elements(self) -> List[ParsedElement]:
+        """
+        Rebuild ParsedElement objects.
+        
+        Returns:
+            List[ParsedElement]: Elements in table order
+        """
+        rebuilt_raw_lines = self._rebuilt_raw_lines()
+        bboxes = self.bboxes.tolist()
+        offsets = self.content_offsets.tolist()
+        confidences = self.confidences.tolist()
+        line_numbers = self.line_numbers.tolist()
+        elements = []
+        
+        for row, element_id in enumerate(self.element_ids.tolist()):
+            metadata = None
+            line_number = line_numbers[row]
+            if line_number:
+                metadata = {'line_number': line_number}
+                if row in rebuilt_raw_lines:
+                    metadata['raw_line'] = rebuilt_raw_lines[row]
+            extra = self.extra_metadata.get(row)
+            if extra:
+                metadata = dict(metadata or {}, **extra)
+            
+            confidence = confidences[row]
+            elements.append(ParsedElement(
+                element_id=element_id,
+                element_type=self.type_names[self.type_codes[row]],
+                bbox=bboxes[row],
+                content=self.content_buffer[offsets[row]:offsets[row + 1]],
+                confidence=None if confidence != confidence else confidence,
+                metadata=metadata
+            ))
+        
+        return elements
+    
+    def to_parse_result(self, parser_type: str = "element_table") -> ParseResult:
+        """
+        Convert back to a ParseResult.
+        
+        Args:
+            parser_type: Parser name recorded on the result
+        
+        Returns:
+            ParseResult: Result with rebuilt elements
+        """
+        elements = self.to_elements()
+        return ParseResult(
+            elements=elements,
+            raw_text=self.raw_text or "",
+            parser_type=parser_type,
+            success=True,
+            metadata={'element_count': len(elements)}
+        )
+    
+    # ========== Vectorized access ==========
+    
+    def __len__(self) -> int:
+        return len(self.element_ids)
+    
+    def get_content(self, row: int) -> str:
+        """
+        Get content of one row without building an element.
+        
+        Args:
+            row: Row index
+        
+        Returns:
+            str: Element content
+        """
+        return self.content_buffer[self.content_offsets[row]:self.content_offsets[row + 1]]
+    
+    def get_types(self) -> List[str]:
+        """
+        Get element type name of every row.
+        
+        Returns:
+            List[str]: Type names in table order
+        """
+        return [self.type_names[code] for code in self.type_codes.tolist()]
+    
+    def type_mask(self, element_type: str) -> np.ndarray:
+        """
+        Boolean mask of rows with the given type.
+        
+        Args:
+            element_type: Type to match (e.g. "table")
+        
+        Returns:
+            np.ndarray: Boolean mask, shape (n,)
+        """
+        if element_type not in self.type_names:
+            return np.zeros(len(self), dtype=bool)
+        return self.type_codes == self.type_names.index(element_type)
+    
+    def count_by_type(self) -> Dict[str, int]:
+        """
+        Count rows per element type.
+        
+        Returns:
+            dict: Type name -> count
+        """
+        counts = np.bincount(self.type_codes, minlength=len(self.type_names))
+        return {name: int(count) for name, count in zip(self.type_names, counts) if count}
+    
+    def widths(self) -> np.ndarray:
+        """Bbox widths, shape (n,)"""
+        return self.bboxes[:, 2] - self.bboxes[:, 0]
+    
+    def heights(self) -> np.ndarray:
+        """Bbox heights, shape (n,)"""
+        return self.bboxes[:, 3] - self.bboxes[:, 1]
+    
+    def areas(self) -> np.ndarray:
+        """Bbox areas (int64 to avoid overflow), shape (n,)"""
+        return self.widths().astype(np.int64) * self.heights().astype(np.int64)
+    
+    def centers(self) -> np.ndarray:
+        """Bbox centers (x, y), shape (n, 2)"""
+        return (self.bboxes[:, :2] + self.bboxes[:, 2:]) / 2.0
+    
+    def content_lengths(self) -> np.ndarray:
+        """Content length in characters, shape (n,)"""
+        return np.diff(self.content_offsets)
+    
+    def select(self, rows: np.ndarray) -> 'ElementTable':
+        """
+        Select rows by boolean mask or index array.
+        
+        Args:
+            rows: Boolean mask of shape (n,) or integer row indices
+        
+        Returns:
+            ElementTable: New table with selected rows (content buffer compacted)
+        """
+        rows = np.asarray(rows)
+        indices = np.flatnonzero(rows) if rows.dtype == bool else rows.astype(np.int64)
+        
+        starts = self.content_offsets[indices].tolist()
+        ends = self.content_offsets[indices + 1].tolist()
+        contents = [self.content_buffer[start:end] for start, end in zip(starts, ends)]
+        offsets = np.zeros(len(indices) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(np.asarray(ends, dtype=np.int64) - np.asarray(starts, dtype=np.int64))
+        
+        extra_metadata = {
+            new_row: self.extra_metadata[old_row]
+            for new_row, old_row in enumerate(indices.tolist())
+            if old_row in self.extra_metadata
+        }
+        
+        return ElementTable(
+            element_ids=self.element_ids[indices],
+            type_codes=self.type_codes[indices],
+            type_names=self.type_names,
+            bboxes=self.bboxes[indices],
+            content_offsets=offsets,
+            content_buffer=''.join(contents),
+            confidences=self.confidences[indices],
+            line_numbers=self.line_numbers[indices],
+            page_numbers=self.page_numbers[indices],
+            extra_metadata=extra_metadata,
+            raw_text=self.raw_text,
+            raw_line_flags=self.raw_line_flags[indices]
+        )
+    
+    def nbytes(self) -> int:
+        """
+        Approximate memory used by the table.
+        
+        Returns:
+            int: Bytes used by arrays and the content buffer
+        """
+        arrays = (
+            self.element_ids, self.type_codes, self.bboxes, self.content_offsets,
+            self.confidences, self.line_numbers, self.page_numbers, self.raw_line_flags
+        )
+        return sum(array.nbytes for array in arrays) + len(self.content_buffer.encode('utf-8'))
+
+
+if __name__ == "__main__":
+    print("Testing element_table.py...\n")
+    
+    import sys
+    import time
+    from .grounding_parser import GroundingParser
+    
+    sample_output = """<|ref|>table<|/ref|><|det|>[[59, 53, 582, 105]]<|/det|>
+<table><tr><td>Test</td></tr></table>
+<|ref|>sub_title<|/ref|><|det|>[[245, 133, 392, 151]]<|/det|>
+社外者の入退場時のフロー
+<|ref|>image<|/ref|><|det|>[[65, 154, 575, 565]]<|/det|>
+<|ref|>text<|/ref|><|det|>[[10, 600, 300, 620], [10, 630, 300, 650]]<|/det|>
+Two boxes"""
+    
+    result = GroundingParser().parse(sample_output)
+    
+    # Test 1: Round trip
+    print("Test 1: Round Trip")
+    print("-" * 60)
+    table = ElementTable.from_parse_result(result, page_number=1)
+    restored = table.to_parse_result(parser_type=result.parser_type)
+    print(f"Rows: {len(table)}, types: {table.type_names}")
+    print(f"Round trip identical: {restored.to_dict()['elements'] == result.to_dict()['elements']}")
+    assert restored.to_dict()['elements'] == result.to_dict()['elements']
+    
+    # Markdown elements have line numbers but no raw_line
+    from .markdown_parser import MarkdownParser
+    markdown = MarkdownParser().parse("# Title\n\nSome paragraph\n\n- item")
+    markdown_restored = ElementTable.from_parse_result(markdown).to_parse_result(markdown.parser_type)
+    print(f"Markdown round trip identical: {markdown_restored.to_dict()['elements'] == markdown.to_dict()['elements']}")
+    assert markdown_restored.to_dict()['elements'] == markdown.to_dict()['elements']
+    
+    # raw_line taken from another output (e.g. a tile) is kept verbatim
+    tiled = ParseResult(
+        elements=[ParsedElement(1, "text", [0, 0, 5, 5], "x", metadata={'line_number': 1, 'raw_line': "tile line"})],
+        raw_text="page line", parser_type="grounding_parser", success=True
+    )
+    tiled_restored = ElementTable.from_parse_result(tiled).to_elements()
+    print(f"Foreign raw_line kept: {tiled_restored[0].metadata['raw_line']!r}")
+    assert tiled_restored[0].metadata['raw_line'] == "tile line"
+    
+    # Test 2: Vectorized queries
+    print("\n" + "="*60)
+    print("Test 2: Vectorized Queries")
+    print("-" * 60)
+    print(f"Counts: {table.count_by_type()}")
+    print(f"Areas: {table.areas().tolist()}")
+    images = table.select(table.type_mask("image"))
+    print(f"Images: {len(images)} at {images.bboxes.tolist()}")
+    print(f"Content of row 1: {table.get_content(1)}")
+    
+    # Test 3: Document table
+    print("\n" + "="*60)
+    print("Test 3: Concatenate Pages")
+    print("-" * 60)
+    document = ElementTable.concatenate([
+        ElementTable.from_parse_result(result, page_number=page)
+        for page in range(1, 4)
+    ])
+    print(f"Rows: {len(document)}, pages: {sorted(set(document.page_numbers.tolist()))}")
+    print(f"Tables per document: {document.count_by_type().get('table', 0)}")
+    assert document.to_elements()[:len(result.elements)] == result.elements
+    
+    # Test 4: Memory at scale
+    print("\n" + "="*60)
+    print("Test 4: Memory Footprint")
+    print("-" * 60)
+    large_output = "\n".join(
+        f"<|ref|>text<|/ref|><|det|>[[{i % 900}, {i % 700}, {i % 900 + 50}, {i % 700 + 20}]]<|/det|>\nLine {i}"
+        for i in range(20000)
+    )
+    large_result = GroundingParser().parse(large_output)
+    
+    def object_size(element: ParsedElement) -> int:
+        size = sys.getsizeof(element) + sys.getsizeof(element.__dict__)
+        size += sys.getsizeof(element.bbox) + sum(sys.getsizeof(v) for v in element.bbox)
+        size += sys.getsizeof(element.content) + sys.getsizeof(element.element_type)
+        size += sys.getsizeof(element.metadata)
+        size += sum(sys.getsizeof(v) for v in element.metadata.values())
+        return size
+    
+    start_time = time.perf_counter()
+    large_table = ElementTable.from_parse_result(large_result, keep_raw_text=False)
+    build_time = time.perf_counter() - start_time
+    object_bytes = sum(object_size(element) for element in large_result.elements)
+    print(f"Elements: {len(large_table)} (built in {build_time * 1000:.1f} ms)")
+    print(f"ParsedElement objects: ~{object_bytes / 1024:.0f} KB")
+    print(f"ElementTable:          ~{large_table.nbytes() / 1024:.0f} KB")
+    
+    print("\n✅ element_table.py tests passed!")
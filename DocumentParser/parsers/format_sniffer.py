@@ -0,0 +1,101 @@
+"""
+Format Sniffer Module
+Classifies raw OCR output in a single scan so parsers are chosen without
+repeated substring searches over large outputs.
+"""
+
+import re
+
+
+# Detected output formats
+FORMAT_EMPTY = "empty"
+FORMAT_GROUNDING = "grounding"
+FORMAT_MARKDOWN = "markdown"
+FORMAT_PARTIAL = "partial_grounding"  # Some grounding tags, but not all four
+
+# Any grounding tag: <|ref|>, <|/ref|>, <|det|>, <|/det|>
+TAG_PATTERN = re.compile(r'<\|/?(?:ref|det)\|>')
+
+# Opening grounding tags only (enough to rule out plain markdown)
+OPEN_TAG_PATTERN = re.compile(r'<\|(?:ref|det)\|>')
+
+GROUNDING_TAGS = frozenset(('<|ref|>', '<|/ref|>', '<|det|>', '<|/det|>'))
+
+
+def sniff_format(raw_output: str) -> str:
+    """
+    Detect the format of raw OCR output in one pass.
+    
+    Scanning stops as soon as all four grounding tags have been seen, which
+    for grounding output is within the first element.
+    
+    Args:
+        raw_output: Raw OCR output text
+    
+    Returns:
+        str: FORMAT_GROUNDING, FORMAT_MARKDOWN, FORMAT_PARTIAL or FORMAT_EMPTY
+    
+    Example:
+        >>> sniff_format("<|ref|>text<|/ref|><|det|>[[1, 2, 3, 4]]<|/det|>Hi")
+        'grounding'
+        >>> sniff_format("# Title")
+        'markdown'
+    """
+    if not raw_output or not isinstance(raw_output, str) or raw_output.isspace():
+        return FORMAT_EMPTY
+    
+    seen = set()
+    for match in TAG_PATTERN.finditer(raw_output):
+        seen.add(match.group(0))
+        if len(seen) == len(GROUNDING_TAGS):
+            return FORMAT_GROUNDING
+    
+    if '<|ref|>' in seen or '<|det|>' in seen:
+        return FORMAT_PARTIAL
+    
+    return FORMAT_MARKDOWN
+
+
+def has_grounding_tags(raw_output: str) -> bool:
+    """
+    Check for any opening grounding tag.
+    
+    Args:
+        raw_output: Raw OCR output text
+    
+    Returns:
+        bool: True if <|ref|> or <|det|> appears
+    """
+    return OPEN_TAG_PATTERN.search(raw_output) is not None
+
+
+if __name__ == "__main__":
+    print("Testing format_sniffer.py...\n")
+    
+    import time
+    
+    # Test 1: Classification
+    print("Test 1: Classify Outputs")
+    print("-" * 60)
+    samples = {
+        "grounding": "<|ref|>table<|/ref|><|det|>[[59, 53, 582, 105]]<|/det|>\n<table></table>",
+        "markdown": "# Title\n\nSome text",
+        "partial": "<|ref|>text<|/ref|> without boxes",
+        "empty": "   \n ",
+    }
+    for name, sample in samples.items():
+        print(f"{name:10s} -> {sniff_format(sample)}")
+    
+    # Test 2: Early exit on large grounding output
+    print("\n" + "="*60)
+    print("Test 2: Scan Cost")
+    print("-" * 60)
+    large_grounding = samples["grounding"] + "\nbody text line\n" * 200000
+    large_markdown = "body text line\n" * 200000
+    for name, sample in (("grounding", large_grounding), ("markdown", large_markdown)):
+        start_time = time.perf_counter()
+        detected = sniff_format(sample)
+        elapsed = time.perf_counter() - start_time
+        print(f"{name:10s} ({len(sample) / 1024:.0f} KB) -> {detected} in {elapsed * 1000:.2f} ms")
+    
+    print("\n✅ format_sniffer.py tests passed!")
@@ -4,10 +4,36 @@ Parses DeepSeek OCR output with grounding/bounding box information.
 Handles <|ref|>label<|/ref|><|det|>[[x1,y1,x2,y2]]<|/det|> format.
 """
 
-from typing import List, Optional
+from typing import List
 import re
+import time
 
 from .base_parser import BaseParser, ParseResult, ParsedElement
+from .format_sniffer import sniff_format, FORMAT_EMPTY, FORMAT_GROUNDING
+
+
+# <|ref|>label<|/ref|> optionally followed by <|det|>[[x1,y1,x2,y2], ...]<|/det|>
+# Labels may contain '<' (e.g. "受付置<「社外者") but not a newline or another <|ref|>
+REF_PATTERN = re.compile(
+    r'<\|ref\|>((?:(?!<\|ref\|>).)+?)<\|/ref\|>[ \t]*(?:<\|det\|>([^<]*)<\|/det\|>)?'
+)
+
+REF_OPEN = '<|ref|>'
+
+# A single [x1, y1, x2, y2] box inside a <|det|> block
+BOX_PATTERN = re.compile(r'\[\s*(\d+)\s*,\s*(\d+)\s*,\s*(\d+)\s*,\s*(\d+)\s*\]')
+
+
+def _union_box(boxes: List[List[int]]) -> List[int]:
+    """Smallest box enclosing all boxes"""
+    if len(boxes) == 1:
+        return boxes[0]
+    return [
+        min(box[0] for box in boxes),
+        min(box[1] for box in boxes),
+        max(box[2] for box in boxes),
+        max(box[3] for box in boxes)
+    ]
 
 
 class GroundingParser(BaseParser):
@@ -23,6 +49,8 @@ class GroundingParser(BaseParser):
     <table><tr><td>...</td></tr></table>
     """
     
+    output_format = FORMAT_GROUNDING
+    
     def __init__(self):
         super().__init__(parser_name="grounding_parser")
     
@@ -36,14 +64,7 @@ class GroundingParser(BaseParser):
         Returns:
             bool: True if contains <|ref|> and <|det|> tags
         """
-        if not self.validate_output(raw_output):
-            return False
-        
-        # Check for grounding tags
-        has_ref = '<|ref|>' in raw_output and '<|/ref|>' in raw_output
-        has_det = '<|det|>' in raw_output and '<|/det|>' in raw_output
-        
-        return has_ref and has_det
+        return sniff_format(raw_output) == FORMAT_GROUNDING
     
     def parse(self, raw_output: str) -> ParseResult:
         """
@@ -55,18 +76,35 @@ class GroundingParser(BaseParser):
         Returns:
             ParseResult: Parsed elements with bounding boxes
         """
-        if not self.validate_output(raw_output):
+        detected = sniff_format(raw_output)
+        
+        if detected == FORMAT_EMPTY:
             return self.create_error_result(
                 raw_output,
                 "Invalid or empty output"
             )
         
-        if not self.can_parse(raw_output):
+        if detected != FORMAT_GROUNDING:
             return self.create_error_result(
                 raw_output,
                 "Output does not contain grounding tags"
             )
         
+        return self.parse_detected(raw_output)
+    
+    def parse_detected(self, raw_output: str) -> ParseResult:
+        """
+        Parse output already known to be in grounding format.
+        
+        Skips the tag checks done by parse(); used by the registry after
+        sniffing the output once.
+        
+        Args:
+            raw_output: Raw OCR output with grounding tags
+        
+        Returns:
+            ParseResult: Parsed elements with bounding boxes
+        """
         try:
             elements = self._extract_elements(raw_output)
             
@@ -89,7 +127,11 @@ class GroundingParser(BaseParser):
     
     def _extract_elements(self, text: str) -> List[ParsedElement]:
         """
-        Extract all grounding elements from text.
+        Extract all grounding elements from text in a single forward scan.
+        
+        Each <|ref|> tag is matched once; an element's content is the text
+        between its <|/det|> and the next <|ref|>, so every character is
+        visited a constant number of times (O(n) in the output length).
         
         Args:
             text: Raw output text
@@ -98,121 +140,80 @@ class GroundingParser(BaseParser):
             List[ParsedElement]: List of parsed elements
         """
         elements = []
-        lines = text.split('\n')
-        
         element_id = 1
         
-        for i, line in enumerate(lines):
-            # Check if line contains grounding tags
-            if '<|ref|>' in line and '<|det|>' in line:
-                try:
-                    element = self._parse_line(line, element_id, lines, i)
-                    if element:
-                        elements.append(element)
-                        element_id += 1
-                except Exception as e:
-                    # Skip malformed lines but continue parsing
-                    print(f"Warning: Could not parse line {i+1}: {e}")
-                    continue
+        # Incremental line tracking (no rescans from the start of the text)
+        line_number = 1
+        line_start = 0
+        line_end = -1
+        raw_line = ""
+        scanned_to = 0
         
-        return elements
-    
-    def _parse_line(
-        self,
-        line: str,
-        element_id: int,
-        all_lines: List[str],
-        current_index: int
-    ) -> Optional[ParsedElement]:
-        """
-        Parse a single line with grounding tags.
-        
-        Args:
-            line: Line to parse
-            element_id: ID for this element
-            all_lines: All lines (for extracting content)
-            current_index: Index of current line
+        for match in REF_PATTERN.finditer(text):
+            start = match.start()
+            newline = text.rfind('\n', scanned_to, start)
+            if newline != -1:
+                line_number += text.count('\n', scanned_to, start)
+                line_start = newline + 1
+            scanned_to = start
+            if line_end < start:
+                line_end = text.find('\n', start)
+                if line_end == -1:
+                    line_end = len(text)
+                # Shared by every element on this line
+                raw_line = text[line_start:line_end]
             
-        Returns:
-            ParsedElement or None if parsing fails
-        """
-        # Extract label between <|ref|> and <|/ref|>
-        label_match = re.search(r'<\|ref\|>([^<]+)<\|/ref\|>', line)
-        if not label_match:
-            return None
-        label = label_match.group(1).strip()
-        
-        # Extract coordinates between [[ and ]]
-        coords_match = re.search(r'\[\[(\d+),\s*(\d+),\s*(\d+),\s*(\d+)\]\]', line)
-        if not coords_match:
-            return None
-        
-        x1 = int(coords_match.group(1))
-        y1 = int(coords_match.group(2))
-        x2 = int(coords_match.group(3))
-        y2 = int(coords_match.group(4))
-        bbox = [x1, y1, x2, y2]
-        
-        # Extract content after tags (on same line or next lines)
-        content = self._extract_content(line, all_lines, current_index)
-        
-        return ParsedElement(
-            element_id=element_id,
-            element_type=label,
-            bbox=bbox,
-            content=content,
-            confidence=None,  # DeepSeek OCR doesn't provide confidence scores
-            metadata={
-                'line_number': current_index + 1,
-                'raw_line': line
+            label = match.group(1).strip()
+            det_text = match.group(2)
+            if det_text is None or not label:
+                # Ref without boxes or label - only ends the previous element's content
+                continue
+            
+            boxes = [list(map(int, box)) for box in BOX_PATTERN.findall(det_text)]
+            if not boxes:
+                print(f"Warning: Could not parse line {line_number}: no boxes in {det_text!r}")
+                continue
+            
+            # Content runs until the next <|ref|> (or end of output), even
+            # one whose tag did not parse
+            content_end = text.find(REF_OPEN, match.end())
+            if content_end == -1:
+                content_end = len(text)
+            content = self._clean_content(text[match.end():content_end])
+            
+            metadata = {
+                'line_number': line_number,
+                'raw_line': raw_line
             }
-        )
+            if len(boxes) > 1:
+                metadata['boxes'] = boxes
+            
+            elements.append(ParsedElement(
+                element_id=element_id,
+                element_type=label,
+                bbox=_union_box(boxes),
+                content=content,
+                confidence=None,  # DeepSeek OCR doesn't provide confidence scores
+                metadata=metadata
+            ))
+            element_id += 1
+        
+        return elements
     
-    def _extract_content(
-        self,
-        current_line: str,
-        all_lines: List[str],
-        current_index: int
-    ) -> str:
+    @staticmethod
+    def _clean_content(segment: str) -> str:
         """
-        Extract content associated with the grounding element.
+        Normalize an element's content span.
         
-        Content can be on the same line after tags, or on following lines
-        until the next grounding tag or empty line.
+        Strips each line and drops empty lines.
         
         Args:
-            current_line: Current line with tags
-            all_lines: All lines
-            current_index: Index of current line
+            segment: Text between an element's tags and the next <|ref|>
             
         Returns:
             str: Extracted content
         """
-        content_parts = []
-        
-        # Get content after </det|> on same line
-        det_end = current_line.find('<|/det|>')
-        if det_end != -1:
-            same_line_content = current_line[det_end + 8:].strip()
-            if same_line_content:
-                content_parts.append(same_line_content)
-        
-        # Get content from following lines
-        for i in range(current_index + 1, len(all_lines)):
-            next_line = all_lines[i].strip()
-            
-            # Stop at next grounding tag
-            if '<|ref|>' in next_line:
-                break
-            
-            # Stop at empty line (optional - you can remove this if needed)
-            # if not next_line:
-            #     break
-            
-            if next_line:
-                content_parts.append(next_line)
-        
-        return '\n'.join(content_parts)
+        return '\n'.join([line for line in map(str.strip, segment.split('\n')) if line])
     
     def get_statistics(self, result: ParseResult) -> dict:
         """
@@ -313,4 +314,52 @@ if __name__ == "__main__":
     print(f"Success: {invalid_result.success}")
     print(f"Error: {invalid_result.error_message}")
     
+    # Test 7: Multiple boxes per ref
+    print("\n" + "="*60)
+    print("Test 7: Multiple Boxes")
+    print("-" * 60)
+    multi = parser.parse("<|ref|>image<|/ref|><|det|>[[10, 10, 50, 50], [60, 20, 90, 80]]<|/det|>")
+    elem = multi.elements[0]
+    print(f"Union bbox: {elem.bbox}, boxes: {elem.metadata['boxes']}")
+    
+    # Test 8: Labels containing '<', empty labels and unclosed refs
+    print("\n" + "="*60)
+    print("Test 8: Unusual Labels")
+    print("-" * 60)
+    odd = parser.parse(
+        "<|ref|>text<|/ref|><|det|>[[10, 10, 90, 20]]<|/det|>\nfirst\n"
+        "<|ref|>受付置<「社外者」<|/ref|><|det|>[[10, 30, 90, 40]]<|/det|>\n"
+        "<|ref|> <|/ref|><|det|>[[10, 50, 90, 60]]<|/det|>\n"
+        "<|ref|>text<|/ref|><|det|>[[10, 70, 90, 80]]<|/det|>\nlast\n<|ref|>unclosed\n"
+    )
+    print(f"Labels: {[e.element_type for e in odd.elements]}")
+    print(f"Contents: {[e.content for e in odd.elements]}")
+    assert [e.element_type for e in odd.elements] == ["text", "受付置<「社外者」", "text"]
+    assert [e.content for e in odd.elements] == ["first", "", "last"]
+    
+    # Test 9: Micro-benchmark on large synthetic outputs
+    print("\n" + "="*60)
+    print("Test 9: Benchmark")
+    print("-" * 60)
+    
+    def _synthetic_output(count: int) -> str:
+        blocks = []
+        for i in range(count):
+            y = (i * 7) % 950
+            blocks.append(
+                f"<|ref|>text<|/ref|><|det|>[[40, {y}, 960, {y + 20}]]<|/det|>\n"
+                f"Paragraph {i} with some body text that spans a line.\n"
+            )
+        return "".join(blocks)
+    
+    for count in (1000, 4000, 16000):
+        synthetic = _synthetic_output(count)
+        start_time = time.perf_counter()
+        bench_result = parser.parse(synthetic)
+        elapsed = time.perf_counter() - start_time
+        print(
+            f"{count:6d} elements ({len(synthetic) / 1024:7.1f} KB): "
+            f"{elapsed * 1000:7.1f} ms ({elapsed / count * 1e6:.2f} µs/element)"
+        )
+    
     print("\n✅ grounding_parser.py tests passed!")
\ No newline at end of file
@@ -8,6 +8,7 @@ from typing import List, Optional
 import re
 
 from .base_parser import BaseParser, ParseResult, ParsedElement
+from .format_sniffer import sniff_format, FORMAT_MARKDOWN
 
 
 class MarkdownParser(BaseParser):
@@ -20,6 +21,8 @@ class MarkdownParser(BaseParser):
     - Assigns element types based on content patterns
     """
     
+    output_format = FORMAT_MARKDOWN
+    
     def __init__(self):
         super().__init__(parser_name="markdown_parser")
     
@@ -33,13 +36,8 @@ class MarkdownParser(BaseParser):
         Returns:
             bool: True if no grounding tags present
         """
-        if not self.validate_output(raw_output):
-            return False
-        
         # If it has grounding tags, use grounding parser instead
-        has_grounding = '<|ref|>' in raw_output or '<|det|>' in raw_output
-        
-        return not has_grounding
+        return sniff_format(raw_output) == FORMAT_MARKDOWN
     
     def parse(self, raw_output: str) -> ParseResult:
         """
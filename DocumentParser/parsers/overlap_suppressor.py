@@ -0,0 +1,313 @@
+"""
+Overlap Suppressor Module
+Removes duplicate elements and nests contained ones using vectorized IoU/NMS.
+Models often emit the same region twice (e.g. a table and a text block with near-identical boxes).
+"""
+
+from typing import List, Dict, Any, Optional, Tuple
+import numpy as np
+
+from .base_parser import ParsedElement
+
+
+def box_areas(boxes: np.ndarray) -> np.ndarray:
+    """
+    Areas of [x1, y1, x2, y2] boxes (degenerate boxes have area 0).
+    
+    Args:
+        boxes: Array of shape (n, 4)
+    
+    Returns:
+        np.ndarray: float64 areas, shape (n,)
+    """
+    boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+    return np.clip(boxes[:, 2] - boxes[:, 0], 0, None) * np.clip(boxes[:, 3] - boxes[:, 1], 0, None)
+
+
+def pairwise_intersections(boxes: np.ndarray) -> np.ndarray:
+    """
+    Intersection areas between every pair of boxes.
+    
+    Args:
+        boxes: Array of shape (n, 4)
+    
+    Returns:
+        np.ndarray: Matrix of shape (n, n)
+    """
+    boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+    x1 = np.maximum(boxes[:, None, 0], boxes[None, :, 0])
+    y1 = np.maximum(boxes[:, None, 1], boxes[None, :, 1])
+    x2 = np.minimum(boxes[:, None, 2], boxes[None, :, 2])
+    y2 = np.minimum(boxes[:, None, 3], boxes[None, :, 3])
+    return np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+
+
+def pairwise_iou(boxes: np.ndarray) -> np.ndarray:
+    """
+    Intersection-over-union between every pair of boxes.
+    
+    Args:
+        boxes: Array of shape (n, 4)
+    
+    Returns:
+        np.ndarray: Matrix of shape (n, n), 0 where both boxes are empty
+    
+    Example:
+        >>> pairwise_iou(np.array([[0, 0, 10, 10], [5, 0, 15, 10]]))[0, 1]
+        0.3333333333333333
+    """
+    intersections = pairwise_intersections(boxes)
+    areas = box_areas(boxes)
+    unions = areas[:, None] + areas[None, :] - intersections
+    return np.divide(intersections, unions, out=np.zeros_like(intersections), where=unions > 0)
+
+
+def pairwise_containment(boxes: np.ndarray) -> np.ndarray:
+    """
+    Fraction of each row box covered by each column box.
+    
+    containment[i, j] = intersection(i, j) / area(i)
+    
+    Args:
+        boxes: Array of shape (n, 4)
+    
+    Returns:
+        np.ndarray: Matrix of shape (n, n), 0 for empty row boxes
+    """
+    intersections = pairwise_intersections(boxes)
+    areas = box_areas(boxes)[:, None]
+    return np.divide(intersections, areas, out=np.zeros_like(intersections), where=areas > 0)
+
+
+def greedy_suppression(
+    overlap: np.ndarray,
+    order: np.ndarray,
+    threshold: float,
+    compatible: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Greedy non-maximum suppression over a precomputed overlap matrix.
+    
+    Boxes are visited in `order`; each kept box suppresses every later box
+    whose overlap with it reaches the threshold.
+    
+    Args:
+        overlap: Matrix of shape (n, n); overlap[k, j] is compared to threshold
+        order: Row indices from best to worst
+        threshold: Overlap at which a box is suppressed
+        compatible: Optional boolean (n, n) matrix of pairs allowed to suppress each other
+    
+    Returns:
+        np.ndarray: int64 array of shape (n,): index of the suppressing box, or -1 if kept
+    """
+    count = len(order)
+    suppressed_by = np.full(count, -1, dtype=np.int64)
+    hits = overlap >= threshold
+    if compatible is not None:
+        hits &= compatible
+    np.fill_diagonal(hits, False)
+    
+    active = np.ones(count, dtype=bool)
+    for index in order:
+        if not active[index]:
+            continue
+        victims = hits[index] & active
+        suppressed_by[victims] = index
+        active[victims] = False
+    
+    return suppressed_by
+
+
+class OverlapSuppressor:
+    """
+    Per-page duplicate removal and nesting of overlapping elements.
+    
+    Two passes over the page's boxes:
+    1. Duplicates: boxes with IoU >= iou_threshold are the same region.
+       The copy with the most content is kept (larger box breaks ties) and
+       records the IDs it absorbed in metadata['merged_ids'].
+    2. Nesting: a remaining box covered by a larger one for at least
+       containment_threshold of its area gets metadata['parent_id'].
+    
+    Example:
+        >>> suppressor = OverlapSuppressor(iou_threshold=0.85)
+        >>> kept, stats = suppressor.suppress(result.elements)
+        >>> print(stats)
+        {'input': 12, 'duplicates_removed': 2, 'nested': 3, 'output': 10}
+    """
+    
+    def __init__(
+        self,
+        iou_threshold: float = 0.85,
+        containment_threshold: float = 0.9,
+        match_types: bool = False,
+        nest_contained: bool = True
+    ):
+        """
+        Initialize suppressor.
+        
+        Args:
+            iou_threshold: IoU at which two elements are duplicates
+            containment_threshold: Covered fraction at which an element is nested
+            match_types: Only treat elements of the same type as duplicates
+            nest_contained: Record parent_id for contained elements
+        """
+        if not 0.0 < iou_threshold <= 1.0:
+            raise ValueError("iou_threshold must be in (0, 1]")
+        if not 0.0 < containment_threshold <= 1.0:
+            raise ValueError("containment_threshold must be in (0, 1]")
+        
+        self.iou_threshold = iou_threshold
+        self.containment_threshold = containment_threshold
+        self.match_types = match_types
+        self.nest_contained = nest_contained
+    
+    def suppress(
+        self,
+        elements: List[ParsedElement]
+    ) -> Tuple[List[ParsedElement], Dict[str, int]]:
+        """
+        Remove duplicate elements and nest contained ones.
+        
+        Elements with all-zero (synthetic) bboxes are passed through.
+        Kept elements are returned in their original order.
+        
+        Args:
+            elements: Elements of one page, in one coordinate space
+        
+        Returns:
+            Tuple[List[ParsedElement], Dict[str, int]]: (kept elements, stats
+            with input, duplicates_removed, nested and output counts)
+        """
+        stats = {'input': len(elements), 'duplicates_removed': 0, 'nested': 0, 'output': len(elements)}
+        
+        grounded = [element for element in elements if any(element.bbox)]
+        if len(grounded) < 2:
+            return list(elements), stats
+        
+        boxes = np.array([element.bbox for element in grounded], dtype=np.float64)
+        areas = box_areas(boxes)
+        content_lengths = np.array([len(element.content) for element in grounded])
+        
+        # Best copy first: most content, then largest box, then earliest
+        order = np.lexsort((np.arange(len(grounded)), -areas, -content_lengths))
+        
+        compatible = None
+        if self.match_types:
+            types = np.array([element.element_type for element in grounded])
+            compatible = types[:, None] == types[None, :]
+        
+        suppressed_by = greedy_suppression(
+            pairwise_iou(boxes), order, self.iou_threshold, compatible
+        )
+        
+        dropped = set()
+        for index, keeper in enumerate(suppressed_by.tolist()):
+            if keeper < 0:
+                continue
+            dropped.add(id(grounded[index]))
+            keeper_element = grounded[keeper]
+            metadata = dict(keeper_element.metadata or {})
+            metadata.setdefault('merged_ids', []).append(grounded[index].element_id)
+            keeper_element.metadata = metadata
+        
+        stats['duplicates_removed'] = len(dropped)
+        
+        if self.nest_contained:
+            stats['nested'] = self._nest(grounded, boxes, areas, suppressed_by < 0)
+        
+        kept = [element for element in elements if id(element) not in dropped]
+        stats['output'] = len(kept)
+        return kept, stats
+    
+    def _nest(
+        self,
+        elements: List[ParsedElement],
+        boxes: np.ndarray,
+        areas: np.ndarray,
+        kept: np.ndarray
+    ) -> int:
+        """Record parent_id on kept elements lying inside a larger kept element"""
+        containment = pairwise_containment(boxes)
+        
+        # Candidate parents must be kept, strictly larger and cover enough of the child
+        candidates = (
+            (containment >= self.containment_threshold)
+            & (areas[None, :] > areas[:, None])
+            & kept[None, :]
+            & kept[:, None]
+        )
+        if not candidates.any():
+            return 0
+        
+        # Tightest enclosing parent: smallest area among candidates
+        parent_areas = np.where(candidates, areas[None, :], np.inf)
+        parents = parent_areas.argmin(axis=1)
+        has_parent = candidates.any(axis=1)
+        
+        for child, parent in zip(np.flatnonzero(has_parent).tolist(), parents[has_parent].tolist()):
+            element = elements[child]
+            element.metadata = dict(element.metadata or {}, parent_id=elements[parent].element_id)
+        
+        return int(has_parent.sum())
+
+
+if __name__ == "__main__":
+    print("Testing overlap_suppressor.py...\n")
+    
+    import time
+    
+    def make(element_id, element_type, bbox, content=""):
+        return ParsedElement(element_id, element_type, bbox, content)
+    
+    # Test 1: IoU matrix
+    print("Test 1: Pairwise IoU")
+    print("-" * 60)
+    boxes = np.array([[0, 0, 10, 10], [5, 0, 15, 10], [0, 0, 10, 10], [20, 20, 30, 30]])
+    print(np.round(pairwise_iou(boxes), 3))
+    
+    # Test 2: Cross-type duplicate and nesting
+    print("\n" + "="*60)
+    print("Test 2: Duplicates and Nesting")
+    print("-" * 60)
+    elements = [
+        make(1, "table", [100, 100, 500, 300], "<table><tr><td>A</td></tr></table>"),
+        make(2, "text", [102, 101, 499, 301], "A"),
+        make(3, "image", [100, 400, 500, 800]),
+        make(4, "image_caption", [120, 700, 480, 780], "Figure 1"),
+        make(5, "text", [0, 0, 0, 0], "synthetic"),
+    ]
+    kept, stats = OverlapSuppressor().suppress(elements)
+    print(f"Stats: {stats}")
+    for element in kept:
+        print(f"  #{element.element_id} {element.element_type}: {element.metadata}")
+    
+    # Test 3: Same-type matching only
+    print("\n" + "="*60)
+    print("Test 3: match_types=True")
+    print("-" * 60)
+    elements = [
+        make(1, "table", [100, 100, 500, 300], "<table></table>"),
+        make(2, "text", [102, 101, 499, 301], "A"),
+    ]
+    kept, stats = OverlapSuppressor(match_types=True).suppress(elements)
+    print(f"Stats: {stats}")
+    
+    # Test 4: Throughput
+    print("\n" + "="*60)
+    print("Test 4: Throughput")
+    print("-" * 60)
+    rng = np.random.default_rng(0)
+    corners = rng.integers(0, 2000, size=(500, 2))
+    sizes = rng.integers(20, 300, size=(500, 2))
+    elements = [
+        make(i + 1, "text", [int(x), int(y), int(x + w), int(y + h)], "x" * int(w % 50))
+        for i, ((x, y), (w, h)) in enumerate(zip(corners, sizes))
+    ]
+    elements += [make(1000 + i, "text", list(e.bbox), "") for i, e in enumerate(elements[:100])]
+    start_time = time.perf_counter()
+    kept, stats = OverlapSuppressor().suppress(elements)
+    elapsed = time.perf_counter() - start_time
+    print(f"{len(elements)} elements in {elapsed * 1000:.1f} ms: {stats}")
+    
+    print("\n✅ overlap_suppressor.py tests passed!")
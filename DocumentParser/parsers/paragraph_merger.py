@@ -0,0 +1,246 @@
+"""
+Paragraph Merger Module
+Merges line-level text fragments into paragraph elements after parsing.
+Adjacency is decided with vectorized gap statistics over each page's bboxes.
+"""
+
+from typing import List, Dict, Tuple, Sequence
+import numpy as np
+
+from .base_parser import ParsedElement
+from .spatial_index import reading_order
+
+
+class ParagraphMerger:
+    """
+    Cluster vertically adjacent, horizontally aligned text fragments.
+    
+    Elements are put in reading order; two consecutive elements join the
+    same paragraph when both are mergeable types and:
+    - the vertical gap is at most gap_factor × the page's median fragment height
+    - their x-ranges overlap by at least min_x_overlap of the narrower one
+    - their heights differ by less than max_height_ratio
+    
+    Each paragraph keeps the first fragment's ID and type, gets the union
+    bbox, and records metadata['fragment_ids'] (plus the full fragments
+    when keep_fragments=True, see restore_fragments()).
+    
+    Example:
+        >>> merger = ParagraphMerger(gap_factor=0.8)
+        >>> elements, stats = merger.merge(result.elements)
+        >>> print(stats)
+        {'input': 42, 'paragraphs': 6, 'fragments_merged': 36, 'output': 12}
+    """
+    
+    def __init__(
+        self,
+        gap_factor: float = 0.8,
+        min_x_overlap: float = 0.5,
+        max_height_ratio: float = 1.6,
+        merge_types: Sequence[str] = ('text',),
+        keep_fragments: bool = False
+    ):
+        """
+        Initialize merger.
+        
+        Args:
+            gap_factor: Largest vertical gap, as a multiple of the median fragment height
+            min_x_overlap: Required x-overlap as a fraction of the narrower fragment
+            max_height_ratio: Largest height ratio between neighbouring lines
+            merge_types: Element types that may be merged
+            keep_fragments: Store the original fragments in metadata['fragments']
+        """
+        if gap_factor < 0:
+            raise ValueError("gap_factor cannot be negative")
+        if not 0.0 <= min_x_overlap <= 1.0:
+            raise ValueError("min_x_overlap must be between 0 and 1")
+        if max_height_ratio < 1.0:
+            raise ValueError("max_height_ratio must be at least 1")
+        
+        self.gap_factor = gap_factor
+        self.min_x_overlap = min_x_overlap
+        self.max_height_ratio = max_height_ratio
+        self.merge_types = set(merge_types)
+        self.keep_fragments = keep_fragments
+    
+    def merge(self, elements: List[ParsedElement]) -> Tuple[List[ParsedElement], Dict[str, int]]:
+        """
+        Merge fragments of one page into paragraphs.
+        
+        Args:
+            elements: Elements of one page, in one coordinate space
+        
+        Returns:
+            Tuple[List[ParsedElement], Dict[str, int]]: (elements with each
+            paragraph in place of its first fragment, stats)
+        """
+        stats = {'input': len(elements), 'paragraphs': 0, 'fragments_merged': 0, 'output': len(elements)}
+        
+        grounded = [element for element in elements if any(element.bbox)]
+        if len(grounded) < 2:
+            return list(elements), stats
+        
+        order = reading_order([element.bbox for element in grounded])
+        ordered = [grounded[i] for i in order]
+        boxes = np.array([element.bbox for element in ordered], dtype=np.float64)
+        mergeable = np.array([element.element_type in self.merge_types for element in ordered])
+        
+        heights = np.maximum(boxes[:, 3] - boxes[:, 1], 1.0)
+        widths = np.maximum(boxes[:, 2] - boxes[:, 0], 1.0)
+        if not mergeable.any():
+            return list(elements), stats
+        median_height = float(np.median(heights[mergeable]))
+        
+        # Pairwise tests between each element and the next in reading order
+        current, following = boxes[:-1], boxes[1:]
+        gaps = following[:, 1] - current[:, 3]
+        x_overlap = np.minimum(current[:, 2], following[:, 2]) - np.maximum(current[:, 0], following[:, 0])
+        narrower = np.minimum(widths[:-1], widths[1:])
+        height_ratio = np.maximum(heights[:-1], heights[1:]) / np.minimum(heights[:-1], heights[1:])
+        
+        joins = (
+            mergeable[:-1] & mergeable[1:]
+            & (gaps <= self.gap_factor * median_height)
+            & (gaps >= -0.5 * median_height)
+            & (x_overlap >= self.min_x_overlap * narrower)
+            & (height_ratio <= self.max_height_ratio)
+        )
+        if not joins.any():
+            return list(elements), stats
+        
+        # Cluster label per element: a new cluster starts wherever a join fails
+        clusters = np.concatenate([[0], np.cumsum(~joins)])
+        starts = np.flatnonzero(np.diff(clusters, prepend=-1))
+        sizes = np.diff(np.append(starts, len(ordered)))
+        
+        union = np.column_stack([
+            np.minimum.reduceat(boxes[:, 0], starts),
+            np.minimum.reduceat(boxes[:, 1], starts),
+            np.maximum.reduceat(boxes[:, 2], starts),
+            np.maximum.reduceat(boxes[:, 3], starts)
+        ]).astype(np.int64).tolist()
+        
+        replacements: Dict[int, ParsedElement] = {}
+        absorbed = set()
+        for start, size, bbox in zip(starts.tolist(), sizes.tolist(), union):
+            if size < 2:
+                continue
+            fragments = ordered[start:start + size]
+            replacements[id(fragments[0])] = self._make_paragraph(fragments, bbox)
+            absorbed.update(id(fragment) for fragment in fragments[1:])
+            stats['paragraphs'] += 1
+            stats['fragments_merged'] += size
+        
+        merged = [
+            replacements.get(id(element), element)
+            for element in elements if id(element) not in absorbed
+        ]
+        stats['output'] = len(merged)
+        return merged, stats
+    
+    def _make_paragraph(self, fragments: List[ParsedElement], bbox: List[int]) -> ParsedElement:
+        """Build one paragraph element from its fragments (in reading order)"""
+        first = fragments[0]
+        metadata = dict(first.metadata or {})
+        metadata['fragment_ids'] = [fragment.element_id for fragment in fragments]
+        if self.keep_fragments:
+            metadata['fragments'] = [
+                {
+                    'id': fragment.element_id,
+                    'type': fragment.element_type,
+                    'bbox': list(fragment.bbox),
+                    'content': fragment.content,
+                    'metadata': fragment.metadata
+                }
+                for fragment in fragments
+            ]
+        
+        return ParsedElement(
+            element_id=first.element_id,
+            element_type=first.element_type,
+            bbox=bbox,
+            content='\n'.join(fragment.content for fragment in fragments if fragment.content),
+            confidence=first.confidence,
+            metadata=metadata
+        )
+
+
+def restore_fragments(elements: List[ParsedElement]) -> List[ParsedElement]:
+    """
+    Expand paragraphs merged with keep_fragments=True back into fragments.
+    
+    Args:
+        elements: Elements, some of which may be merged paragraphs
+    
+    Returns:
+        List[ParsedElement]: Elements with every stored paragraph replaced by its fragments
+    
+    Example:
+        >>> fragments = restore_fragments(merged_elements)
+    """
+    restored = []
+    for element in elements:
+        fragments = (element.metadata or {}).get('fragments')
+        if not fragments:
+            restored.append(element)
+            continue
+        restored.extend(
+            ParsedElement(
+                element_id=fragment['id'],
+                element_type=fragment['type'],
+                bbox=list(fragment['bbox']),
+                content=fragment['content'],
+                metadata=fragment['metadata']
+            )
+            for fragment in fragments
+        )
+    return restored
+
+
+if __name__ == "__main__":
+    print("Testing paragraph_merger.py...\n")
+    
+    import time
+    
+    def line(element_id, x1, y1, x2, content, element_type="text", height=20):
+        return ParsedElement(element_id, element_type, [x1, y1, x2, y1 + height], content)
+    
+    # Test 1: Two-column page with line fragments
+    print("Test 1: Merge Line Fragments")
+    print("-" * 60)
+    page = [
+        line(1, 100, 50, 900, "Document Title", element_type="title", height=40),
+        line(2, 100, 120, 480, "Left column line one"),
+        line(3, 100, 145, 470, "Left column line two"),
+        line(4, 100, 170, 300, "Left column end."),
+        line(5, 520, 120, 900, "Right column line one"),
+        line(6, 520, 145, 880, "Right column line two"),
+        line(7, 100, 260, 480, "New left paragraph"),
+        line(8, 100, 285, 480, "continues here"),
+        ParsedElement(9, "table", [100, 320, 900, 500], "<table></table>"),
+        line(10, 100, 520, 480, "After the table"),
+    ]
+    merger = ParagraphMerger(keep_fragments=True)
+    merged, stats = merger.merge(page)
+    print(f"Stats: {stats}")
+    for element in merged:
+        print(f"  #{element.element_id} [{element.element_type}] {element.bbox} <- {element.metadata and element.metadata.get('fragment_ids')}")
+    
+    # Test 2: Restore fragments
+    print("\n" + "="*60)
+    print("Test 2: Restore Fragments")
+    print("-" * 60)
+    restored = restore_fragments(merged)
+    print(f"Restored {len(restored)} elements, IDs: {sorted(e.element_id for e in restored)}")
+    
+    # Test 3: Throughput
+    print("\n" + "="*60)
+    print("Test 3: Throughput")
+    print("-" * 60)
+    lines = [line(i + 1, 100, 50 + i * 25 + (i // 8) * 30, 900, f"line {i}") for i in range(4000)]
+    start_time = time.perf_counter()
+    merged, stats = ParagraphMerger().merge(lines)
+    elapsed = time.perf_counter() - start_time
+    print(f"{len(lines)} fragments -> {stats['output']} elements in {elapsed * 1000:.1f} ms")
+    
+    print("\n✅ paragraph_merger.py tests passed!")
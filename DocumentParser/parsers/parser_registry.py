@@ -4,8 +4,16 @@ Automatically selects and manages appropriate parsers for different output forma
 This is the "smart dispatcher" that handles format detection.
 """
 
-from typing import Optional, List
+from typing import Optional, List, Dict, Hashable
+import threading
+
 from .base_parser import BaseParser, ParseResult
+from .format_sniffer import (
+    sniff_format,
+    has_grounding_tags,
+    FORMAT_GROUNDING,
+    FORMAT_MARKDOWN,
+)
 from .grounding_parser import GroundingParser
 from .markdown_parser import MarkdownParser
 
@@ -14,13 +22,22 @@ class ParserRegistry:
     """
     Registry that manages multiple parsers and auto-selects the appropriate one.
     
-    This class implements the Strategy Pattern - it tries each parser
-    until it finds one that can handle the input.
+    This class implements the Strategy Pattern. The output format is
+    sniffed once and matched against each parser's output_format; parsers
+    without one fall back to their own can_parse() check.
+    
+    Callers may pass a cache_key (e.g. (model_name, prompt)) to parse().
+    The detected parser is remembered per key, so later outputs from the
+    same model and prompt skip sniffing; if a cached parser finds nothing,
+    the output is sniffed again. The cache is shared by tile threads, so
+    it is only touched under a lock.
     """
     
     def __init__(self):
         """Initialize registry with default parsers"""
         self.parsers: List[BaseParser] = []
+        self._format_cache: Dict[Hashable, BaseParser] = {}
+        self._cache_lock = threading.Lock()
         self._register_default_parsers()
     
     def _register_default_parsers(self):
@@ -50,8 +67,9 @@ class ParserRegistry:
         """
         Get appropriate parser for the given output.
         
-        Tries each registered parser's can_parse() method until
-        one returns True.
+        Sniffs the output format once, then returns the first registered
+        parser handling that format (or whose can_parse() returns True,
+        for parsers without an output_format).
         
         Args:
             raw_output: Raw OCR output text
@@ -65,7 +83,16 @@ class ParserRegistry:
             >>> print(parser.get_parser_name())
             'grounding_parser'
         """
+        return self._select_parser(raw_output, sniff_format(raw_output))
+    
+    def _select_parser(self, raw_output: str, detected: str) -> Optional[BaseParser]:
+        """Pick the first parser matching the sniffed format, in priority order"""
         for parser in self.parsers:
+            if parser.output_format is not None:
+                if parser.output_format == detected:
+                    return parser
+                continue
+            
             try:
                 if parser.can_parse(raw_output):
                     return parser
@@ -76,13 +103,20 @@ class ParserRegistry:
         
         return None
     
-    def parse(self, raw_output: str, prefer_parser: Optional[str] = None) -> ParseResult:
+    def parse(
+        self,
+        raw_output: str,
+        prefer_parser: Optional[str] = None,
+        cache_key: Optional[Hashable] = None
+    ) -> ParseResult:
         """
         Parse output using auto-detected or preferred parser.
         
         Args:
             raw_output: Raw OCR output text
             prefer_parser: Optional parser name to try first
+            cache_key: Optional key (e.g. (model_name, prompt)) under which
+                the detected parser is cached for later outputs
             
         Returns:
             ParseResult: Parsed result
@@ -99,15 +133,68 @@ class ParserRegistry:
             if parser and parser.can_parse(raw_output):
                 return parser.parse(raw_output)
         
-        # Auto-detect parser
-        parser = self.get_parser(raw_output)
+        # Reuse the parser detected earlier for this model/prompt
+        if cache_key is not None:
+            with self._cache_lock:
+                cached_parser = self._format_cache.get(cache_key)
+            if cached_parser is not None:
+                result = self._parse_cached(raw_output, cached_parser)
+                if result is not None:
+                    return result
+                with self._cache_lock:
+                    # Another thread may already have dropped or replaced it
+                    if self._format_cache.get(cache_key) is cached_parser:
+                        self._format_cache.pop(cache_key, None)
+        
+        # Auto-detect parser (single sniff of the output)
+        detected = sniff_format(raw_output)
+        parser = self._select_parser(raw_output, detected)
         
         if parser is None:
             # No parser can handle this - use markdown as last resort
             fallback_parser = MarkdownParser()
             return fallback_parser.parse(raw_output)
         
-        return parser.parse(raw_output)
+        if cache_key is not None and parser.output_format == detected:
+            with self._cache_lock:
+                self._format_cache[cache_key] = parser
+        
+        return parser.parse_detected(raw_output)
+    
+    def _parse_cached(self, raw_output: str, parser: BaseParser) -> Optional[ParseResult]:
+        """
+        Parse with a cached parser, or return None if the output no longer fits.
+        
+        Grounding elements require complete ref/det tags, so a grounding
+        result with elements is exactly what sniffing would have selected.
+        Markdown only needs a check that no opening grounding tag appears.
+        """
+        if parser not in self.parsers:
+            return None
+        
+        if parser.output_format == FORMAT_GROUNDING:
+            result = parser.parse_detected(raw_output)
+            if result.success and result.elements:
+                return result
+            return None
+        
+        if parser.output_format == FORMAT_MARKDOWN:
+            if parser.validate_output(raw_output) and not has_grounding_tags(raw_output):
+                return parser.parse_detected(raw_output)
+            return None
+        
+        return None
+    
+    def clear_format_cache(self):
+        """
+        Forget parsers detected per cache key.
+        
+        Example:
+            >>> registry = ParserRegistry()
+            >>> registry.clear_format_cache()
+        """
+        with self._cache_lock:
+            self._format_cache.clear()
     
     def get_parser_by_name(self, parser_name: str) -> Optional[BaseParser]:
         """
@@ -163,6 +250,7 @@ class ParserRegistry:
         for i, parser in enumerate(self.parsers):
             if parser.get_parser_name() == parser_name:
                 self.parsers.pop(i)
+                self.clear_format_cache()
                 return True
         return False
     
@@ -177,6 +265,7 @@ class ParserRegistry:
             0
         """
         self.parsers.clear()
+        self.clear_format_cache()
 
 
 # Global registry instance (singleton pattern)
@@ -200,13 +289,19 @@ def get_global_registry() -> ParserRegistry:
     return _global_registry
 
 
-def parse_ocr_output(raw_output: str, prefer_parser: Optional[str] = None) -> ParseResult:
+def parse_ocr_output(
+    raw_output: str,
+    prefer_parser: Optional[str] = None,
+    cache_key: Optional[Hashable] = None
+) -> ParseResult:
     """
     Convenience function to parse OCR output using global registry.
     
     Args:
         raw_output: Raw OCR output text
         prefer_parser: Optional parser name to prefer
+        cache_key: Optional key (e.g. (model_name, prompt)) for caching
+            the detected parser across pages
         
     Returns:
         ParseResult: Parsed result
@@ -217,7 +312,7 @@ def parse_ocr_output(raw_output: str, prefer_parser: Optional[str] = None) -> Pa
         True
     """
     registry = get_global_registry()
-    return registry.parse(raw_output, prefer_parser)
+    return registry.parse(raw_output, prefer_parser, cache_key)
 
 
 if __name__ == "__main__":
@@ -296,4 +391,17 @@ if __name__ == "__main__":
     print(f"Parser used: {result.parser_type}")
     print(f"Elements: {result.get_element_count()}")
     
+    # Test 8: Cached format per (model, prompt)
+    print("\n" + "="*60)
+    print("Test 8: Format Cache")
+    print("-" * 60)
+    key = ("deepseek-ocr:3b", "<image>\n<|grounding|>Convert the document to markdown.")
+    first = registry.parse(grounding_output, cache_key=key)
+    second = registry.parse(grounding_output, cache_key=key)
+    print(f"Cached parser: {registry._format_cache[key].get_parser_name()}")
+    print(f"Same result: {first.to_dict() == second.to_dict()}")
+    drifted = registry.parse(markdown_output, cache_key=key)
+    print(f"Drifted output parsed by: {drifted.parser_type}")
+    print(f"Cache updated to: {registry._format_cache[key].get_parser_name()}")
+    
     print("\n✅ parser_registry.py tests passed!")
\ No newline at end of file
@@ -0,0 +1,362 @@
+"""
+Spatial Index Module
+Uniform-grid index over page element bboxes for region and nearest-neighbour queries.
+Also provides a column-aware reading-order sort built on the same bbox arrays.
+"""
+
+from typing import List, Optional, Sequence, Set
+import math
+import numpy as np
+
+
+# Directions accepted by SpatialIndex.nearest()
+DIRECTIONS = ('right', 'left', 'above', 'below')
+
+
+class SpatialIndex:
+    """
+    Uniform grid over a page's bboxes.
+    
+    Every box is registered in each grid cell it touches; cell contents are
+    stored as one sorted index array with per-cell offsets (CSR layout), so
+    building is a handful of NumPy operations and a query only inspects the
+    cells overlapping the query box.
+    
+    Example:
+        >>> index = SpatialIndex([[0, 0, 100, 50], [300, 0, 400, 50]])
+        >>> index.query([250, 0, 500, 100]).tolist()
+        [1]
+        >>> index.nearest([0, 0, 100, 50], direction='right', exclude={0}).tolist()
+        [1]
+    """
+    
+    def __init__(self, bboxes, cell_size: Optional[float] = None):
+        """
+        Build the grid.
+        
+        Args:
+            bboxes: Array-like of shape (n, 4) with [x1, y1, x2, y2] rows
+            cell_size: Grid cell edge in bbox units (None = about one box per cell)
+        """
+        self.boxes = np.asarray(bboxes, dtype=np.float64).reshape(-1, 4)
+        count = len(self.boxes)
+        
+        if count:
+            self.origin = (float(self.boxes[:, 0].min()), float(self.boxes[:, 1].min()))
+            width = max(float(self.boxes[:, 2].max()) - self.origin[0], 1.0)
+            height = max(float(self.boxes[:, 3].max()) - self.origin[1], 1.0)
+        else:
+            self.origin, width, height = (0.0, 0.0), 1.0, 1.0
+        
+        self.cell_size = float(cell_size) if cell_size else max(math.sqrt(width * height / max(count, 1)), 1.0)
+        self.columns = int(width // self.cell_size) + 1
+        self.rows = int(height // self.cell_size) + 1
+        
+        cx1, cy1, cx2, cy2 = self._cell_ranges(self.boxes)
+        spans_x = cx2 - cx1 + 1
+        counts = spans_x * (cy2 - cy1 + 1)
+        
+        # One (cell, box) pair per cell a box touches
+        box_ids = np.repeat(np.arange(count), counts)
+        local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        spans = np.repeat(spans_x, counts)
+        cells = (np.repeat(cy1, counts) + local // spans) * self.columns + np.repeat(cx1, counts) + local % spans
+        
+        order = np.argsort(cells, kind='stable')
+        self.cell_boxes = box_ids[order]
+        self.cell_offsets = np.searchsorted(cells[order], np.arange(self.columns * self.rows + 1))
+    
+    def __len__(self) -> int:
+        return len(self.boxes)
+    
+    def _cell_ranges(self, boxes: np.ndarray):
+        """Inclusive grid cell ranges (cx1, cy1, cx2, cy2) covered by boxes"""
+        scaled = (boxes - (self.origin + self.origin)) / self.cell_size
+        cx1 = np.clip(np.floor(scaled[:, 0]), 0, self.columns - 1).astype(np.int64)
+        cy1 = np.clip(np.floor(scaled[:, 1]), 0, self.rows - 1).astype(np.int64)
+        cx2 = np.clip(np.floor(scaled[:, 2]), 0, self.columns - 1).astype(np.int64)
+        cy2 = np.clip(np.floor(scaled[:, 3]), 0, self.rows - 1).astype(np.int64)
+        return cx1, cy1, cx2, cy2
+    
+    def _candidates(self, cx1: int, cy1: int, cx2: int, cy2: int) -> np.ndarray:
+        """Unique box indices registered in a rectangle of cells"""
+        cx1, cy1 = max(cx1, 0), max(cy1, 0)
+        cx2, cy2 = min(cx2, self.columns - 1), min(cy2, self.rows - 1)
+        if cx1 > cx2 or cy1 > cy2:
+            return np.empty(0, dtype=np.int64)
+        
+        slices = []
+        for row in range(cy1, cy2 + 1):
+            start = self.cell_offsets[row * self.columns + cx1]
+            end = self.cell_offsets[row * self.columns + cx2 + 1]
+            slices.append(self.cell_boxes[start:end])
+        return np.unique(np.concatenate(slices))
+    
+    def query(self, region: Sequence[float], mode: str = 'intersects') -> np.ndarray:
+        """
+        Find boxes overlapping or inside a region.
+        
+        Args:
+            region: [x1, y1, x2, y2] (a point is [x, y, x, y])
+            mode: 'intersects' (touching counts) or 'within' (box fully inside region)
+        
+        Returns:
+            np.ndarray: Matching box indices in ascending order
+        """
+        if mode not in ('intersects', 'within'):
+            raise ValueError(f"mode must be 'intersects' or 'within', got {mode!r}")
+        if not len(self):
+            return np.empty(0, dtype=np.int64)
+        
+        query_box = np.asarray(region, dtype=np.float64).reshape(1, 4)
+        candidates = self._candidates(*(int(value[0]) for value in self._cell_ranges(query_box)))
+        boxes = self.boxes[candidates]
+        qx1, qy1, qx2, qy2 = query_box[0]
+        
+        if mode == 'within':
+            hits = (boxes[:, 0] >= qx1) & (boxes[:, 1] >= qy1) & (boxes[:, 2] <= qx2) & (boxes[:, 3] <= qy2)
+        else:
+            hits = (boxes[:, 0] <= qx2) & (boxes[:, 2] >= qx1) & (boxes[:, 1] <= qy2) & (boxes[:, 3] >= qy1)
+        
+        return candidates[hits]
+    
+    def nearest(
+        self,
+        target: Sequence[float],
+        k: int = 1,
+        direction: Optional[str] = None,
+        exclude: Optional[Set[int]] = None
+    ) -> np.ndarray:
+        """
+        Find the boxes closest to a target box.
+        
+        Distance is the gap between box edges (0 for touching/overlapping
+        boxes). Cells are searched in rings around the target until the k-th
+        result is provably closer than anything further out.
+        
+        Args:
+            target: [x1, y1, x2, y2] (a point is [x, y, x, y])
+            k: Number of results
+            direction: Optional 'right', 'left', 'above' or 'below'; the box
+                must lie on that side and overlap the target's row/column span
+            exclude: Box indices to skip (e.g. the target element itself)
+        
+        Returns:
+            np.ndarray: Up to k box indices, closest first
+        """
+        if direction is not None and direction not in DIRECTIONS:
+            raise ValueError(f"direction must be one of {DIRECTIONS}, got {direction!r}")
+        if not len(self) or k < 1:
+            return np.empty(0, dtype=np.int64)
+        
+        target_box = np.asarray(target, dtype=np.float64).reshape(1, 4)
+        cx1, cy1, cx2, cy2 = (int(value[0]) for value in self._cell_ranges(target_box))
+        excluded = np.array(sorted(exclude), dtype=np.int64) if exclude else None
+        max_ring = max(self.columns, self.rows)
+        
+        for ring in range(max_ring + 1):
+            candidates = self._candidates(cx1 - ring, cy1 - ring, cx2 + ring, cy2 + ring)
+            if excluded is not None:
+                candidates = candidates[~np.isin(candidates, excluded)]
+            candidates = candidates[self._direction_mask(self.boxes[candidates], target_box[0], direction)]
+            
+            distances = _gap_distances(self.boxes[candidates], target_box[0])
+            if len(candidates) >= k or ring == max_ring:
+                order = np.lexsort((candidates, distances))[:k]
+                # Anything outside the searched window is at least `ring` cells away
+                if ring == max_ring or distances[order[-1]] <= ring * self.cell_size:
+                    return candidates[order]
+        
+        return np.empty(0, dtype=np.int64)
+    
+    @staticmethod
+    def _direction_mask(boxes: np.ndarray, target: np.ndarray, direction: Optional[str]) -> np.ndarray:
+        """Boxes on the requested side of the target, sharing its row/column span"""
+        if direction is None:
+            return np.ones(len(boxes), dtype=bool)
+        
+        tx1, ty1, tx2, ty2 = target
+        shares_row = (boxes[:, 1] < ty2) & (boxes[:, 3] > ty1)
+        shares_column = (boxes[:, 0] < tx2) & (boxes[:, 2] > tx1)
+        
+        if direction == 'right':
+            return shares_row & (boxes[:, 0] >= (tx1 + tx2) / 2)
+        if direction == 'left':
+            return shares_row & (boxes[:, 2] <= (tx1 + tx2) / 2)
+        if direction == 'below':
+            return shares_column & (boxes[:, 1] >= (ty1 + ty2) / 2)
+        return shares_column & (boxes[:, 3] <= (ty1 + ty2) / 2)
+    
+    def reading_order(
+        self,
+        span_ratio: float = 0.55,
+        min_gutter_ratio: float = 0.015
+    ) -> np.ndarray:
+        """
+        Column-aware reading order.
+        
+        Column gutters are found from the x-coverage of narrow boxes (boxes
+        narrower than span_ratio of the content width). Boxes crossing a
+        gutter (titles, full-width tables) split the page into horizontal
+        bands; inside a band, columns are read left to right and each column
+        top to bottom. Runs in O(n log n).
+        
+        Args:
+            span_ratio: Width fraction above which a box is ignored for gutter detection
+            min_gutter_ratio: Smallest gutter width as a fraction of the content width
+        
+        Returns:
+            np.ndarray: Box indices in reading order
+        """
+        count = len(self)
+        if count < 2:
+            return np.arange(count)
+        
+        x1, y1, x2 = self.boxes[:, 0], self.boxes[:, 1], self.boxes[:, 2]
+        boundaries = self.column_boundaries(span_ratio, min_gutter_ratio)
+        
+        # Boxes crossing a gutter span several columns and start a new band
+        spanning = (np.searchsorted(boundaries, x2) - np.searchsorted(boundaries, x1)) > 0
+        band_starts = np.sort(y1[spanning])
+        bands = np.searchsorted(band_starts, y1, side='right')
+        columns = np.where(spanning, 0, np.searchsorted(boundaries, (x1 + x2) / 2))
+        
+        # Primary key last: band, spanning box first, column, top, left
+        return np.lexsort((x1, y1, columns, ~spanning, bands))
+    
+    def column_boundaries(
+        self,
+        span_ratio: float = 0.55,
+        min_gutter_ratio: float = 0.015
+    ) -> np.ndarray:
+        """
+        X positions of column gutter centres.
+        
+        Args:
+            span_ratio: Width fraction above which a box is ignored
+            min_gutter_ratio: Smallest gutter width as a fraction of the content width
+        
+        Returns:
+            np.ndarray: Sorted gutter centre x coordinates (empty for one column)
+        """
+        left = float(self.boxes[:, 0].min())
+        content_width = float(self.boxes[:, 2].max()) - left
+        if content_width <= 0:
+            return np.empty(0)
+        
+        narrow = self.boxes[(self.boxes[:, 2] - self.boxes[:, 0]) < span_ratio * content_width]
+        if len(narrow) < 2:
+            return np.empty(0)
+        
+        # X coverage histogram via a difference array
+        bins = int(min(max(content_width, 1), 2048))
+        scale = bins / content_width
+        starts = np.clip(((narrow[:, 0] - left) * scale).astype(np.int64), 0, bins - 1)
+        ends = np.clip(((narrow[:, 2] - left) * scale).astype(np.int64), 0, bins - 1)
+        diff = np.zeros(bins + 1, dtype=np.int64)
+        np.add.at(diff, starts, 1)
+        np.add.at(diff, ends + 1, -1)
+        covered = np.cumsum(diff[:-1]) > 0
+        
+        # Interior runs of empty bins wide enough to be gutters
+        edges = np.flatnonzero(np.diff(covered.astype(np.int8)))
+        gaps_start = edges[covered[edges]] + 1          # covered -> empty
+        gaps_end = edges[~covered[edges]] + 1           # empty -> covered
+        gaps_end = gaps_end[gaps_end > gaps_start[0]] if len(gaps_start) else gaps_end
+        gap_count = min(len(gaps_start), len(gaps_end))
+        gaps_start, gaps_end = gaps_start[:gap_count], gaps_end[:gap_count]
+        
+        wide = (gaps_end - gaps_start) >= max(min_gutter_ratio * bins, 1)
+        centres = (gaps_start[wide] + gaps_end[wide]) / 2.0
+        return left + centres / scale
+
+
+def _gap_distances(boxes: np.ndarray, target: np.ndarray) -> np.ndarray:
+    """Euclidean gap between each box and the target (0 if they overlap)"""
+    tx1, ty1, tx2, ty2 = target
+    dx = np.maximum(0, np.maximum(tx1 - boxes[:, 2], boxes[:, 0] - tx2))
+    dy = np.maximum(0, np.maximum(ty1 - boxes[:, 3], boxes[:, 1] - ty2))
+    return np.hypot(dx, dy)
+
+
+def reading_order(bboxes, span_ratio: float = 0.55) -> List[int]:
+    """
+    Reading order of a page's bboxes (see SpatialIndex.reading_order).
+    
+    Args:
+        bboxes: Array-like of shape (n, 4)
+        span_ratio: Width fraction above which a box is ignored for gutter detection
+    
+    Returns:
+        List[int]: Indices in reading order
+    
+    Example:
+        >>> reading_order([[520, 0, 1000, 40], [0, 0, 480, 40], [0, 50, 480, 90]])
+        [1, 2, 0]
+    """
+    return SpatialIndex(bboxes).reading_order(span_ratio=span_ratio).tolist()
+
+
+if __name__ == "__main__":
+    print("Testing spatial_index.py...\n")
+    
+    import time
+    
+    # Test 1: Region queries
+    print("Test 1: Region Queries")
+    print("-" * 60)
+    boxes = [[0, 0, 100, 50], [300, 0, 400, 50], [0, 100, 400, 300], [50, 150, 150, 200]]
+    index = SpatialIndex(boxes)
+    print(f"Grid: {index.columns} × {index.rows} cells of {index.cell_size:.1f}")
+    print(f"Intersecting [250, 0, 500, 100]: {index.query([250, 0, 500, 100]).tolist()}")
+    print(f"Within [0, 90, 410, 310]: {index.query([0, 90, 410, 310], mode='within').tolist()}")
+    print(f"At point (60, 160): {index.query([60, 160, 60, 160]).tolist()}")
+    
+    # Test 2: Nearest neighbours
+    print("\n" + "="*60)
+    print("Test 2: Nearest")
+    print("-" * 60)
+    print(f"Right of box 0: {index.nearest(boxes[0], direction='right', exclude={0}).tolist()}")
+    print(f"Below box 0: {index.nearest(boxes[0], direction='below', exclude={0}).tolist()}")
+    print(f"2 nearest to (390, 60): {index.nearest([390, 60, 390, 60], k=2).tolist()}")
+    
+    # Test 3: Two-column reading order
+    print("\n" + "="*60)
+    print("Test 3: Reading Order")
+    print("-" * 60)
+    page = [
+        [100, 900, 500, 1000],   # 0: left column, lower
+        [550, 200, 950, 300],    # 1: right column, top
+        [100, 50, 950, 120],     # 2: full-width title
+        [100, 200, 500, 300],    # 3: left column, top
+        [550, 900, 950, 1000],   # 4: right column, lower
+        [100, 1100, 950, 1200],  # 5: full-width footer table
+        [100, 1250, 500, 1300],  # 6: left column after footer
+    ]
+    print(f"Column boundaries: {SpatialIndex(page).column_boundaries().tolist()}")
+    print(f"Order: {reading_order(page)} (expected [2, 3, 0, 1, 4, 5, 6])")
+    
+    # Test 4: Query cost vs linear scan
+    print("\n" + "="*60)
+    print("Test 4: Query Throughput")
+    print("-" * 60)
+    rng = np.random.default_rng(0)
+    corners = rng.uniform(0, 10000, size=(20000, 2))
+    many = np.hstack([corners, corners + rng.uniform(10, 80, size=(20000, 2))])
+    start_time = time.perf_counter()
+    big_index = SpatialIndex(many)
+    build_time = time.perf_counter() - start_time
+    queries = rng.uniform(0, 9800, size=(500, 2))
+    start_time = time.perf_counter()
+    for qx, qy in queries:
+        big_index.query([qx, qy, qx + 200, qy + 200])
+    index_time = time.perf_counter() - start_time
+    many_list = many.tolist()
+    start_time = time.perf_counter()
+    for qx, qy in queries:
+        [i for i, b in enumerate(many_list) if b[0] <= qx + 200 and b[2] >= qx and b[1] <= qy + 200 and b[3] >= qy]
+    scan_time = time.perf_counter() - start_time
+    print(f"Build: {build_time * 1000:.1f} ms for {len(many)} boxes")
+    print(f"500 queries: index {index_time * 1000:.1f} ms, linear scan {scan_time * 1000:.1f} ms")
+    
+    print("\n✅ spatial_index.py tests passed!")
@@ -0,0 +1,553 @@
+"""
+Streaming Parser Module
+Push-based incremental parsers for OCR output arriving in chunks.
+Completed ParsedElements are emitted while the model is still generating.
+"""
+
+from abc import abstractmethod
+from typing import List, Optional, Callable
+
+from .base_parser import BaseParser, ParseResult, ParsedElement
+from .grounding_parser import GroundingParser, REF_PATTERN, BOX_PATTERN, _union_box
+from .markdown_parser import MarkdownParser
+
+
+REF_OPEN = '<|ref|>'
+DET_OPEN = '<|det|>'
+
+# Longest ref/det tag held back waiting for its closing marker
+MAX_TAG_LENGTH = 2048
+
+
+class StreamingParser(BaseParser):
+    """
+    Base class for incremental parsers.
+    
+    Usage:
+        parser = StreamingGroundingParser(on_element=print)
+        for chunk in chunks:
+            parser.feed(chunk)      # returns elements completed by this chunk
+        parser.close()              # flushes the last element
+        result = parser.result()    # same shape as the batch parser's result
+    """
+    
+    def __init__(
+        self,
+        parser_name: str,
+        on_element: Optional[Callable[[ParsedElement], None]] = None,
+        keep_raw: bool = True
+    ):
+        """
+        Initialize streaming parser.
+        
+        Args:
+            parser_name: Name reported in ParseResult.parser_type
+            on_element: Called with each element as soon as it is complete
+            keep_raw: Keep the full text for ParseResult.raw_text
+                (False when the caller already holds the output)
+        """
+        super().__init__(parser_name=parser_name)
+        self.on_element = on_element
+        self.keep_raw = keep_raw
+        self.elements: List[ParsedElement] = []
+        self.closed = False
+        self._chunks: List[str] = []
+        self._received = 0
+    
+    def feed(self, chunk: str) -> List[ParsedElement]:
+        """
+        Push a chunk of model output.
+        
+        Args:
+            chunk: Next piece of text (any length, tags may be split)
+        
+        Returns:
+            List[ParsedElement]: Elements completed by this chunk
+        """
+        if self.closed:
+            raise RuntimeError(f"{self.parser_name} is closed")
+        
+        if not chunk:
+            return []
+        
+        if self.keep_raw:
+            self._chunks.append(chunk)
+        self._received += len(chunk)
+        
+        start = len(self.elements)
+        self._consume(chunk, final=False)
+        return self.elements[start:]
+    
+    def close(self) -> List[ParsedElement]:
+        """
+        Signal end of output and flush any pending element.
+        
+        Returns:
+            List[ParsedElement]: Elements completed at close
+        """
+        if self.closed:
+            return []
+        
+        start = len(self.elements)
+        self._consume("", final=True)
+        self.closed = True
+        return self.elements[start:]
+    
+    def result(self) -> ParseResult:
+        """
+        Build the final parse result (closes the parser if still open).
+        
+        Returns:
+            ParseResult: Parsed elements
+        """
+        if not self.closed:
+            self.close()
+        
+        raw_output = "".join(self._chunks)
+        
+        if self._received == 0:
+            return self.create_error_result(raw_output, "Invalid or empty output")
+        
+        error = self._result_error()
+        if error:
+            return self.create_error_result(raw_output, error)
+        
+        return ParseResult(
+            elements=self.elements,
+            raw_text=raw_output,
+            parser_type=self.parser_name,
+            success=True,
+            metadata=self._result_metadata()
+        )
+    
+    def parse(self, raw_output: str) -> ParseResult:
+        """
+        Parse a complete output in one go (feed + close + result).
+        
+        Args:
+            raw_output: Raw OCR output
+        
+        Returns:
+            ParseResult: Parsed elements
+        """
+        if not self.validate_output(raw_output):
+            return self.create_error_result(raw_output, "Invalid or empty output")
+        self.feed(raw_output)
+        return self.result()
+    
+    def _emit(self, element: ParsedElement):
+        """Record a completed element and notify the callback"""
+        self.elements.append(element)
+        if self.on_element:
+            self.on_element(element)
+    
+    def _next_id(self) -> int:
+        """ID for the next emitted element"""
+        return len(self.elements) + 1
+    
+    def _result_error(self) -> Optional[str]:
+        """Error message for the final result, or None if successful"""
+        return None
+    
+    def _result_metadata(self) -> dict:
+        """Metadata for the final result"""
+        return {'element_count': len(self.elements), 'streamed': True}
+    
+    @abstractmethod
+    def _consume(self, chunk: str, final: bool):
+        """
+        Process new text, emitting every element that is now complete.
+        
+        Args:
+            chunk: Newly received text
+            final: True when no more text will arrive
+        """
+        pass
+
+
+class StreamingGroundingParser(StreamingParser):
+    """
+    Incremental parser for DeepSeek grounding output.
+    
+    An element is emitted once its content is known to be complete - when
+    the next <|ref|> tag arrives or the stream is closed. Consumed text is
+    released from the internal buffer as it is processed.
+    
+    Elements match GroundingParser except that 'raw_line' only covers the
+    element's own line segment (identical for one-tag-per-line output).
+    """
+    
+    def __init__(
+        self,
+        on_element: Optional[Callable[[ParsedElement], None]] = None,
+        keep_raw: bool = True
+    ):
+        super().__init__("grounding_parser", on_element=on_element, keep_raw=keep_raw)
+        self._buffer = ""
+        self._pending: Optional[dict] = None
+        self._line_number = 1
+        self._line_prefix = ""
+        self._seen_ref = False
+    
+    def can_parse(self, raw_output: str) -> bool:
+        """Same detection rule as GroundingParser"""
+        return GroundingParser().can_parse(raw_output)
+    
+    def _consume(self, chunk: str, final: bool):
+        """Match complete tags in the buffer and emit finished elements"""
+        buffer = self._buffer + chunk
+        pos = 0
+        
+        while True:
+            match = REF_PATTERN.search(buffer, pos)
+            
+            if match is None:
+                break
+            
+            if not final and match.group(2) is None:
+                # A <|det|> block may still be arriving right after the ref
+                rest = buffer[match.end():match.end() + len(DET_OPEN)]
+                if DET_OPEN.startswith(rest) or rest == DET_OPEN:
+                    break
+            
+            # Text before the tag completes the pending element
+            self._advance(buffer[pos:match.start()])
+            self._flush_pending()
+            self._seen_ref = True
+            
+            boxes = []
+            if match.group(2) is not None:
+                boxes = [list(map(int, box)) for box in BOX_PATTERN.findall(match.group(2))]
+                if not boxes:
+                    print(f"Warning: Could not parse line {self._line_number}: "
+                          f"no boxes in {match.group(2)!r}")
+            
+            if boxes:
+                self._pending = {
+                    'label': match.group(1).strip(),
+                    'boxes': boxes,
+                    'line_number': self._line_number,
+                    'line_prefix': self._line_prefix,
+                    'parts': [match.group(0)]
+                }
+            self._advance(match.group(0), tag=True)
+            pos = match.end()
+        
+        if final:
+            self._advance(buffer[pos:])
+            self._flush_pending()
+            self._buffer = ""
+            return
+        
+        # Keep anything that could still become a tag; release the rest
+        hold = buffer.rfind(REF_OPEN, pos)
+        if hold == -1 or len(buffer) - hold > MAX_TAG_LENGTH:
+            hold = max(pos, len(buffer) - (len(REF_OPEN) - 1))
+        self._advance(buffer[pos:hold])
+        self._buffer = buffer[hold:]
+    
+    def _advance(self, text: str, tag: bool = False):
+        """Account for consumed text (line tracking and pending content)"""
+        if not text:
+            return
+        
+        if self._pending is not None and not tag:
+            self._pending['parts'].append(text)
+        
+        newlines = text.count('\n')
+        if newlines:
+            self._line_number += newlines
+            self._line_prefix = text[text.rfind('\n') + 1:]
+        else:
+            self._line_prefix += text
+        
+        # Prefix only needs the text since the last newline or tag
+        if tag:
+            self._line_prefix = ""
+    
+    def _flush_pending(self):
+        """Emit the pending element with its collected content"""
+        pending = self._pending
+        if pending is None:
+            return
+        self._pending = None
+        
+        tag, body = pending['parts'][0], "".join(pending['parts'][1:])
+        
+        metadata = {
+            'line_number': pending['line_number'],
+            'raw_line': pending['line_prefix'] + tag + body.split('\n', 1)[0]
+        }
+        if len(pending['boxes']) > 1:
+            metadata['boxes'] = pending['boxes']
+        
+        self._emit(ParsedElement(
+            element_id=self._next_id(),
+            element_type=pending['label'],
+            bbox=_union_box(pending['boxes']),
+            content=GroundingParser._clean_content(body),
+            confidence=None,
+            metadata=metadata
+        ))
+    
+    def _result_error(self) -> Optional[str]:
+        if not self._seen_ref:
+            return "Output does not contain grounding tags"
+        return None
+    
+    def _result_metadata(self) -> dict:
+        return {
+            'element_count': len(self.elements),
+            'has_grounding': True,
+            'streamed': True
+        }
+
+
+class StreamingMarkdownParser(StreamingParser):
+    """
+    Incremental parser for plain markdown output.
+    
+    Works on complete lines: headers are emitted as soon as their line
+    ends, multi-line blocks (paragraphs, lists, tables, code) when the line
+    that closes them arrives. Element types and metadata follow
+    MarkdownParser.
+    """
+    
+    def __init__(
+        self,
+        on_element: Optional[Callable[[ParsedElement], None]] = None,
+        keep_raw: bool = True
+    ):
+        super().__init__("markdown_parser", on_element=on_element, keep_raw=keep_raw)
+        self._partial_line = ""
+        self._line_index = 0
+        self._block: Optional[str] = None
+        self._block_lines: List[str] = []
+        self._block_start = 0
+    
+    def can_parse(self, raw_output: str) -> bool:
+        """Same detection rule as MarkdownParser"""
+        return MarkdownParser().can_parse(raw_output)
+    
+    def _consume(self, chunk: str, final: bool):
+        """Split complete lines off the buffer and feed the block machine"""
+        text = self._partial_line + chunk
+        lines = text.split('\n')
+        self._partial_line = lines.pop()
+        
+        if final and self._partial_line:
+            lines.append(self._partial_line)
+            self._partial_line = ""
+        
+        for line in lines:
+            self._process_line(line)
+            self._line_index += 1
+        
+        if final:
+            self._close_block()
+    
+    def _process_line(self, line: str):
+        """Advance the block state machine by one line"""
+        stripped = line.strip()
+        block = self._block
+        
+        if block == 'code':
+            self._block_lines.append(line)
+            if stripped.startswith('```'):
+                self._close_block()
+            return
+        
+        if block == 'html_table':
+            self._block_lines.append(line)
+            if '</table>' in stripped.lower():
+                self._close_block()
+            return
+        
+        if block == 'table':
+            if stripped.startswith('|'):
+                self._block_lines.append(line)
+                return
+            self._close_block()
+        
+        elif block == 'list':
+            if stripped.startswith(('-', '*', '+')):
+                self._block_lines.append(line)
+                return
+            if not stripped:
+                return
+            self._close_block()
+        
+        elif block == 'paragraph':
+            if not stripped:
+                self._close_block()
+                return
+            if not self._starts_block(stripped):
+                self._block_lines.append(line)
+                return
+            self._close_block()
+        
+        # No open block: start a new one
+        if not stripped:
+            return
+        
+        if stripped.startswith('#'):
+            level = len(stripped) - len(stripped.lstrip('#'))
+            self._emit(ParsedElement(
+                element_id=self._next_id(),
+                element_type=f"heading_{level}",
+                bbox=[0, 0, 0, 0],
+                content=stripped.lstrip('#').strip(),
+                metadata={
+                    'line_number': self._line_index + 1,
+                    'heading_level': level
+                }
+            ))
+            return
+        
+        if stripped.startswith('|'):
+            self._open_block('table', line)
+        elif stripped.startswith(('-', '*', '+')):
+            self._open_block('list', line)
+        elif '<table>' in stripped.lower():
+            self._open_block('html_table', line)
+            if '</table>' in stripped.lower():
+                self._close_block()
+        elif stripped.startswith('```'):
+            self._open_block('code', line)
+        else:
+            self._open_block('paragraph', line)
+    
+    @staticmethod
+    def _starts_block(stripped: str) -> bool:
+        """True if a line starts a structural element (ends a paragraph)"""
+        return (
+            stripped.startswith(('#', '|', '-', '*', '+', '```')) or
+            '<table>' in stripped.lower()
+        )
+    
+    def _open_block(self, block: str, line: str):
+        """Start collecting a multi-line block"""
+        self._block = block
+        self._block_lines = [line]
+        self._block_start = self._line_index
+    
+    def _close_block(self):
+        """Emit the open block as an element"""
+        block = self._block
+        if block is None:
+            return
+        
+        lines = self._block_lines
+        self._block = None
+        self._block_lines = []
+        
+        metadata = {'line_number': self._block_start + 1}
+        element_type = {
+            'table': 'table',
+            'html_table': 'table',
+            'list': 'list',
+            'code': 'code_block',
+            'paragraph': 'text'
+        }[block]
+        
+        if block == 'table':
+            metadata['rows'] = len(lines)
+        elif block == 'list':
+            metadata['items'] = len(lines)
+        elif block == 'html_table':
+            metadata['format'] = 'html'
+        
+        self._emit(ParsedElement(
+            element_id=self._next_id(),
+            element_type=element_type,
+            bbox=[0, 0, 0, 0],
+            content='\n'.join(lines),
+            metadata=metadata
+        ))
+    
+    def _result_metadata(self) -> dict:
+        return {
+            'element_count': len(self.elements),
+            'has_grounding': False,
+            'note': 'Bounding boxes are synthetic (not real)',
+            'streamed': True
+        }
+
+
+def create_streaming_parser(
+    grounding: bool,
+    on_element: Optional[Callable[[ParsedElement], None]] = None,
+    keep_raw: bool = True
+) -> StreamingParser:
+    """
+    Create the streaming parser for an expected output format.
+    
+    Args:
+        grounding: True if the prompt requests grounding tags
+        on_element: Called with each element as soon as it is complete
+        keep_raw: Keep the full text for ParseResult.raw_text
+    
+    Returns:
+        StreamingParser: Grounding or markdown streaming parser
+    
+    Example:
+        >>> parser = create_streaming_parser(True, on_element=lambda e: print(e.bbox))
+        >>> for chunk in response_chunks:
+        ...     parser.feed(chunk)
+        >>> result = parser.result()
+    """
+    if grounding:
+        return StreamingGroundingParser(on_element=on_element, keep_raw=keep_raw)
+    return StreamingMarkdownParser(on_element=on_element, keep_raw=keep_raw)
+
+
+if __name__ == "__main__":
+    print("Testing streaming_parser.py...\n")
+    
+    sample_output = """<|ref|>title<|/ref|><|det|>[[59, 53, 582, 105]]<|/det|>
+# 機密区域管理要領
+<|ref|>text<|/ref|><|det|>[[245, 133, 392, 151]]<|/det|>
+社外者の入退場時のフロー
+<|ref|>image<|/ref|><|det|>[[65, 154, 320, 565], [330, 154, 575, 565]]<|/det|>
+<|ref|>text<|/ref|><|det|>[[210, 574, 426, 593]]<|/det|>
+従業員による機密区域内撮影時のフロー"""
+    
+    # Test 1: Elements arrive while chunks stream in
+    print("Test 1: Stream Grounding Output (7-char chunks)")
+    print("-" * 60)
+    parser = StreamingGroundingParser(
+        on_element=lambda e: print(f"  emitted #{e.element_id} [{e.element_type}] at {e.bbox}")
+    )
+    for i in range(0, len(sample_output), 7):
+        parser.feed(sample_output[i:i + 7])
+    print("  -- close --")
+    parser.close()
+    streamed = parser.result()
+    
+    # Test 2: Same elements as the batch parser
+    print("\n" + "="*60)
+    print("Test 2: Compare With Batch Parser")
+    print("-" * 60)
+    batch = GroundingParser().parse(sample_output)
+    same = [
+        (e.element_type, e.bbox, e.content, e.metadata) for e in batch.elements
+    ] == [
+        (e.element_type, e.bbox, e.content, e.metadata) for e in streamed.elements
+    ]
+    print(f"Streamed: {streamed.get_element_count()}, batch: {batch.get_element_count()}, identical: {same}")
+    
+    # Test 3: Markdown streaming
+    print("\n" + "="*60)
+    print("Test 3: Stream Markdown Output")
+    print("-" * 60)
+    sample_markdown = "# Title\n\nIntro paragraph\nsecond line\n\n| a | b |\n| 1 | 2 |\n\n- one\n- two\n\n```\ncode\n```\nTail"
+    md_parser = StreamingMarkdownParser()
+    for i in range(0, len(sample_markdown), 5):
+        for element in md_parser.feed(sample_markdown[i:i + 5]):
+            print(f"  emitted #{element.element_id} [{element.element_type}]")
+    for element in md_parser.close():
+        print(f"  emitted #{element.element_id} [{element.element_type}] (at close)")
+    batch_md = MarkdownParser().parse(sample_markdown)
+    print(f"Batch types: {[e.element_type for e in batch_md.elements]}")
+    
+    print("\n✅ streaming_parser.py tests passed!")
@@ -0,0 +1,24 @@
+"""
+Postprocessors Package
+Document-level passes over the parsed elements of all pages.
+"""
+
+from .running_elements import (
+    RunningElementDetector,
+    is_running_element,
+    normalize_content,
+    RUNNING_HEADER,
+    RUNNING_FOOTER,
+)
+from .table_stitcher import TableStitcher, TableRows, is_continuation
+
+__all__ = [
+    'RunningElementDetector',
+    'is_running_element',
+    'normalize_content',
+    'RUNNING_HEADER',
+    'RUNNING_FOOTER',
+    'TableStitcher',
+    'TableRows',
+    'is_continuation',
+]
@@ -0,0 +1,258 @@
+"""
+Running Elements Module
+Detects headers and footers that repeat across the pages of a document.
+Elements are matched by normalized content plus coarse position on the page.
+"""
+
+import re
+from collections import defaultdict
+from typing import List, Dict, Optional, Sequence, Tuple
+import numpy as np
+
+from ..parsers import ParsedElement
+
+
+RUNNING_HEADER = "header"
+RUNNING_FOOTER = "footer"
+
+_DIGITS = re.compile(r'\d+')
+_SPACES = re.compile(r'\s+')
+
+
+def normalize_content(content: str) -> str:
+    """
+    Normalize element content for cross-page matching.
+    
+    Case and whitespace are folded and digit runs replaced with '#', so
+    "Page 3 of 10" and "page 4 of 10" compare equal.
+    
+    Args:
+        content: Element content
+    
+    Returns:
+        str: Normalized content
+    
+    Example:
+        >>> normalize_content("  Page 3 of  10 ")
+        'page # of #'
+    """
+    return _SPACES.sub(' ', _DIGITS.sub('#', content.lower())).strip()
+
+
+def is_running_element(element: ParsedElement) -> bool:
+    """True if element was flagged as a running header or footer"""
+    return bool(element.metadata and element.metadata.get('running'))
+
+
+class RunningElementDetector:
+    """
+    Flag elements repeated near the top or bottom of many pages.
+    
+    Each candidate element is keyed by (type, normalized content, coarse
+    position bucket). A key found on at least min_page_ratio of the pages
+    (and on at least min_pages pages) marks all its elements with
+    metadata['running'] = 'header' or 'footer'.
+    
+    Candidates are elements whose box lies in the top or bottom edge_zone
+    of the page. Elements without a bbox (markdown parser) are candidates
+    when they are among the first or last edge_elements of their page and
+    are keyed by content only.
+    
+    Example:
+        >>> detector = RunningElementDetector(min_page_ratio=0.5)
+        >>> stats = detector.detect([r.get_elements() for r in page_results], page_sizes)
+        >>> print(stats)
+        {'pages': 12, 'patterns': 2, 'headers': 12, 'footers': 12}
+    """
+    
+    def __init__(
+        self,
+        min_page_ratio: float = 0.5,
+        min_pages: int = 3,
+        edge_zone: float = 0.15,
+        position_grid: int = 10,
+        edge_elements: int = 1
+    ):
+        """
+        Initialize detector.
+        
+        Args:
+            min_page_ratio: Fraction of pages a pattern must appear on
+            min_pages: Minimum number of pages a pattern must appear on
+            edge_zone: Top/bottom fraction of the page searched for candidates
+            position_grid: Buckets per axis used to compare positions
+            edge_elements: Ungrounded elements considered at each end of a page
+        """
+        if not 0.0 < min_page_ratio <= 1.0:
+            raise ValueError("min_page_ratio must be in (0, 1]")
+        if min_pages < 2:
+            raise ValueError("min_pages must be at least 2")
+        if not 0.0 < edge_zone <= 0.5:
+            raise ValueError("edge_zone must be in (0, 0.5]")
+        if position_grid < 1:
+            raise ValueError("position_grid must be at least 1")
+        
+        self.min_page_ratio = min_page_ratio
+        self.min_pages = min_pages
+        self.edge_zone = edge_zone
+        self.position_grid = position_grid
+        self.edge_elements = edge_elements
+    
+    def detect(
+        self,
+        pages: Sequence[List[ParsedElement]],
+        page_sizes: Optional[Sequence[Optional[Tuple[int, int]]]] = None
+    ) -> Dict[str, int]:
+        """
+        Flag running headers and footers in place.
+        
+        Args:
+            pages: Elements of each page, bboxes in that page's pixels
+            page_sizes: (width, height) of each page; missing sizes fall
+                back to the extent of the page's boxes
+        
+        Returns:
+            Dict[str, int]: Stats with pages, patterns, headers and footers counts
+        """
+        stats = {'pages': len(pages), 'patterns': 0, 'headers': 0, 'footers': 0}
+        
+        for matches in self.find(pages, page_sizes):
+            stats['patterns'] += 1
+            for _, element, role in matches:
+                element.metadata = dict(element.metadata or {}, running=role)
+                stats['headers' if role == RUNNING_HEADER else 'footers'] += 1
+        
+        return stats
+    
+    def find(
+        self,
+        pages: Sequence[List[ParsedElement]],
+        page_sizes: Optional[Sequence[Optional[Tuple[int, int]]]] = None
+    ) -> List[List[Tuple[int, ParsedElement, str]]]:
+        """
+        Find running headers and footers without flagging them.
+        
+        Args:
+            pages: Elements of each page, bboxes in that page's pixels
+            page_sizes: (width, height) of each page
+        
+        Returns:
+            List of patterns, each a list of (page_index, element, role)
+        """
+        required = max(self.min_pages, int(np.ceil(self.min_page_ratio * len(pages))))
+        if len(pages) < required:
+            return []
+        
+        occurrences: Dict[tuple, List[Tuple[int, ParsedElement, str]]] = defaultdict(list)
+        for page_index, elements in enumerate(pages):
+            size = page_sizes[page_index] if page_sizes else None
+            for key, element, role in self._candidates(elements, size):
+                occurrences[key].append((page_index, element, role))
+        
+        return [
+            matches for matches in occurrences.values()
+            if len({page_index for page_index, _, _ in matches}) >= required
+        ]
+    
+    def _candidates(
+        self,
+        elements: List[ParsedElement],
+        page_size: Optional[Tuple[int, int]]
+    ) -> List[Tuple[tuple, ParsedElement, str]]:
+        """(key, element, role) for every header/footer candidate on one page"""
+        if not elements:
+            return []
+        
+        boxes = np.array([element.bbox for element in elements], dtype=np.float64)
+        grounded = boxes.any(axis=1)
+        
+        if page_size:
+            width, height = page_size
+        elif grounded.any():
+            width, height = boxes[grounded, 2].max(), boxes[grounded, 3].max()
+        else:
+            width = height = 0
+        
+        candidates = []
+        if grounded.any() and width > 0 and height > 0:
+            # Box centres as fractions of the page
+            centre_x = (boxes[:, 0] + boxes[:, 2]) / (2 * width)
+            centre_y = (boxes[:, 1] + boxes[:, 3]) / (2 * height)
+            in_header = grounded & (boxes[:, 3] <= self.edge_zone * height)
+            in_footer = grounded & (boxes[:, 1] >= (1 - self.edge_zone) * height)
+            bucket_x = np.minimum(centre_x * self.position_grid, self.position_grid - 1).astype(int)
+            bucket_y = np.minimum(centre_y * self.position_grid, self.position_grid - 1).astype(int)
+            
+            for index in np.flatnonzero(in_header | in_footer).tolist():
+                element = elements[index]
+                key = (
+                    element.element_type,
+                    normalize_content(element.content),
+                    int(bucket_x[index]),
+                    int(bucket_y[index])
+                )
+                candidates.append((key, element, RUNNING_HEADER if in_header[index] else RUNNING_FOOTER))
+        
+        # Ungrounded elements: position within the page's element list
+        ungrounded = np.flatnonzero(~grounded).tolist()
+        edge = self.edge_elements
+        for rank, index in enumerate(ungrounded):
+            if rank < edge:
+                role = RUNNING_HEADER
+            elif rank >= len(ungrounded) - edge:
+                role = RUNNING_FOOTER
+            else:
+                continue
+            element = elements[index]
+            key = (element.element_type, normalize_content(element.content), role)
+            candidates.append((key, element, role))
+        
+        return candidates
+
+
+if __name__ == "__main__":
+    print("Testing running_elements.py...\n")
+    
+    # Test 1: Normalization
+    print("Test 1: Normalize Content")
+    print("-" * 60)
+    print(f"'Page 3 of 10' -> '{normalize_content('Page 3 of 10')}'")
+    print(f"'DOC-2024-117  Rev.2' -> '{normalize_content('DOC-2024-117  Rev.2')}'")
+    
+    # Test 2: Grounded pages
+    print("\n" + "="*60)
+    print("Test 2: Grounded Headers/Footers")
+    print("-" * 60)
+    pages = []
+    for page in range(1, 6):
+        pages.append([
+            ParsedElement(1, "text", [100, 40, 900, 80], "ACME Corp. Safety Regulation"),
+            ParsedElement(2, "text", [100, 300, 900, 400], f"Body text of page {page}"),
+            ParsedElement(3, "text", [100, 400 + page * 5, 900, 450], "Note: keep doors closed"),
+            ParsedElement(4, "text", [400, 1350, 600, 1380], f"Page {page} of 5"),
+        ])
+    pages[2].pop(0)  # One page without header
+    stats = RunningElementDetector().detect(pages, [(1000, 1414)] * len(pages))
+    print(f"Stats: {stats}")
+    for element in pages[0]:
+        print(f"  #{element.element_id} running={element.metadata and element.metadata.get('running')}: {element.content}")
+    
+    # Test 3: Ungrounded (markdown parser) pages
+    print("\n" + "="*60)
+    print("Test 3: Ungrounded Elements")
+    print("-" * 60)
+    pages = [
+        [
+            ParsedElement(1, "text", [0, 0, 0, 0], "Manual v2"),
+            ParsedElement(2, "text", [0, 0, 0, 0], f"Section {page}"),
+            ParsedElement(3, "text", [0, 0, 0, 0], f"Body {page}"),
+            ParsedElement(4, "text", [0, 0, 0, 0], f"Body {page} continued"),
+            ParsedElement(5, "text", [0, 0, 0, 0], "Confidential"),
+        ]
+        for page in range(4)
+    ]
+    stats = RunningElementDetector().detect(pages)
+    print(f"Stats: {stats}")
+    print(f"Flagged: {[e.content for e in pages[0] if is_running_element(e)]}")
+    
+    print("\n✅ running_elements.py tests passed!")
@@ -0,0 +1,427 @@
+"""
+Table Stitcher Module
+Merges tables that continue over page breaks into one logical table.
+Continuations are matched by column count, position and a repeated header
+or a first row shaped like the data rows it continues.
+"""
+
+import re
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+import numpy as np
+
+from ..parsers import ParsedElement
+from .running_elements import normalize_content, is_running_element, RunningElementDetector
+
+
+_ROW = re.compile(r'<tr\b[^>]*>.*?</tr>', re.IGNORECASE | re.DOTALL)
+_CELL = re.compile(r'<t([dh])\b([^>]*)>(.*?)</t[dh]>', re.IGNORECASE | re.DOTALL)
+_COLSPAN = re.compile(r'colspan\s*=\s*["\']?(\d+)', re.IGNORECASE)
+_TAG = re.compile(r'<[^>]+>')
+_TABLE_END = re.compile(r'</table\s*>', re.IGNORECASE)
+_PIPE_SEPARATOR = re.compile(r'^\s*\|?\s*:?-{3,}:?\s*(\|\s*:?-{3,}:?\s*)*\|?\s*$')
+_NUMBER = re.compile(r'^[\d\s.,:/%()+\-−–~¥$€]+$')
+
+
+@dataclass
+class TableRows:
+    """
+    Rows of an HTML or markdown pipe table.
+    
+    Attributes:
+        kind: 'html' or 'markdown'
+        rows: Raw row strings (<tr>...</tr>, or pipe lines including the separator)
+        cells: Plain-text cells of each data/header row
+        column_count: Widest row, counting colspan
+    """
+    kind: str
+    rows: List[str]
+    cells: List[List[str]]
+    column_count: int
+    
+    @classmethod
+    def parse(cls, content: str) -> Optional['TableRows']:
+        """
+        Split table content into rows.
+        
+        Args:
+            content: Table element content
+        
+        Returns:
+            TableRows or None if content is not a recognisable table
+        """
+        if '<tr' in content.lower():
+            rows = _ROW.findall(content)
+            cells, widths = [], []
+            for row in rows:
+                row_cells = _CELL.findall(row)
+                cells.append([_TAG.sub(' ', text).strip() for _, _, text in row_cells])
+                widths.append(sum(
+                    int(match.group(1)) if match else 1
+                    for match in (_COLSPAN.search(attributes) for _, attributes, _ in row_cells)
+                ))
+            return cls('html', rows, cells, max(widths)) if rows and max(widths) else None
+        
+        lines = [line for line in content.strip().splitlines() if line.strip().startswith('|')]
+        if not lines:
+            return None
+        rows = [line for line in lines if not _PIPE_SEPARATOR.match(line)]
+        cells = [[cell.strip() for cell in row.strip().strip('|').split('|')] for row in rows]
+        # Only separator lines (e.g. truncated output) - no table to stitch
+        return cls('markdown', lines, cells, max(len(row) for row in cells)) if cells else None
+    
+    def header_text(self) -> str:
+        """Normalized text of the first row ('' when all its cells are empty)"""
+        return normalize_content(' | '.join(self.cells[0])) if self.cells and any(self.cells[0]) else ''
+
+    def has_header_row(self) -> bool:
+        """True if the first row is marked up as a header (<th> cells or a pipe separator)"""
+        if not self.rows:
+            return False
+        if self.kind == 'html':
+            return '<th' in self.rows[0].lower()
+        return len(self.rows) > 1 and bool(_PIPE_SEPARATOR.match(self.rows[1]))
+
+
+def _row_profile(cells: List[str]) -> List[str]:
+    """Kind of each cell: 'empty', 'number' or 'text'"""
+    return ['empty' if not cell else 'number' if _NUMBER.match(cell) else 'text' for cell in cells]
+
+
+def _rows_alike(first: List[str], second: List[str]) -> bool:
+    """
+    True if two rows have the same cells count and cell kinds.
+    
+    Empty cells match any kind, so a data row with blanks still matches
+    its neighbours.
+    
+    Example:
+        >>> _rows_alike(["3", "Washer", "12"], ["2", "Nut", ""])
+        True
+        >>> _rows_alike(["No.", "Item", "Value"], ["2", "Nut", "8"])
+        False
+    """
+    if len(first) != len(second):
+        return False
+    return all(
+        a == b or 'empty' in (a, b)
+        for a, b in zip(_row_profile(first), _row_profile(second))
+    )
+
+
+def is_continuation(element: ParsedElement) -> bool:
+    """True if element was stitched into a table on an earlier page"""
+    return bool(element.metadata and element.metadata.get('stitched_into'))
+
+
+class TableStitcher:
+    """
+    Merge tables split across consecutive pages.
+    
+    A table is continued on the next page when it is the lowest content
+    element of its page, the next page's first content element is a
+    table with the same column count, and either its first row repeats
+    the header (similarity at least header_similarity; the repeat is
+    dropped) or, unless require_header_match, its first row is not marked
+    up as a header and has the same cell kinds (number/text/empty) as the
+    last row it would follow.
+    
+    The first table of a chain gets the merged rows and
+    metadata['table_parts'] with page provenance; each continuation stays
+    on its page with metadata['stitched_into'] = {'page', 'element_id'}.
+    Running headers/footers are ignored when looking for the page's first
+    and last content: elements already flagged, plus those found by
+    running_detector (without flagging them), so a document-header table
+    repeated at the top of every page is never taken for a continuation.
+    
+    Example:
+        >>> stitcher = TableStitcher()
+        >>> stats = stitcher.stitch([(1, page1_elements), (2, page2_elements)])
+        >>> print(stats)
+        {'tables': 1, 'continuations': 1, 'headers_dropped': 1}
+    """
+    
+    def __init__(
+        self,
+        header_similarity: float = 0.8,
+        require_header_match: bool = False,
+        running_detector: Optional[RunningElementDetector] = None
+    ):
+        """
+        Initialize stitcher.
+        
+        Args:
+            header_similarity: First-row similarity at which the header repeats
+            require_header_match: Only stitch tables whose first rows match
+            running_detector: Finds running headers/footers to skip
+                (default: RunningElementDetector(min_pages=2))
+        """
+        if not 0.0 < header_similarity <= 1.0:
+            raise ValueError("header_similarity must be in (0, 1]")
+        
+        self.header_similarity = header_similarity
+        self.require_header_match = require_header_match
+        self.running_detector = running_detector or RunningElementDetector(min_pages=2)
+    
+    def stitch(
+        self,
+        pages: Sequence[Tuple[int, List[ParsedElement]]],
+        page_sizes: Optional[Sequence[Optional[Tuple[int, int]]]] = None
+    ) -> Dict[str, int]:
+        """
+        Stitch continuation tables in place.
+        
+        Args:
+            pages: (page_number, elements) for consecutive pages, in order
+            page_sizes: (width, height) of each page, for running element detection
+        
+        Returns:
+            Dict[str, int]: Stats with tables (chains), continuations and headers_dropped
+        """
+        stats = {'tables': 0, 'continuations': 0, 'headers_dropped': 0}
+        
+        running = {
+            id(element)
+            for matches in self.running_detector.find([elements for _, elements in pages], page_sizes)
+            for _, element, _ in matches
+        }
+        
+        # (head element, head page, head rows, cells of the last row appended so far)
+        # of the chain open at the last page's bottom
+        chain: Optional[Tuple[ParsedElement, int, TableRows, List[str]]] = None
+        previous_page = None
+        
+        for page_number, elements in pages:
+            content = [
+                element for element in elements
+                if not is_running_element(element) and id(element) not in running
+            ]
+            first, last = self._page_edges(content)
+            
+            if chain is not None and previous_page is not None and page_number == previous_page + 1:
+                continued = self._try_continue(chain, page_number, first, stats)
+                # A table that fills the whole page keeps the chain open
+                if continued is not None and first is last:
+                    chain = continued
+                    previous_page = page_number
+                    continue
+            
+            previous_page = page_number
+            chain = None
+            if last is not None and last.element_type == 'table':
+                rows = TableRows.parse(last.content)
+                if rows is not None:
+                    chain = (last, page_number, rows, rows.cells[-1])
+        
+        return stats
+    
+    def _try_continue(
+        self,
+        chain: Tuple[ParsedElement, int, TableRows, List[str]],
+        page_number: int,
+        first: Optional[ParsedElement],
+        stats: Dict[str, int]
+    ) -> Optional[Tuple[ParsedElement, int, TableRows, List[str]]]:
+        """Append first to the chain if it continues the table; the updated chain, or None"""
+        head, head_page, head_rows, last_row = chain
+        if first is None or first.element_type != 'table':
+            return None
+        
+        rows = TableRows.parse(first.content)
+        if rows is None or rows.kind != head_rows.kind or rows.column_count != head_rows.column_count:
+            return None
+        
+        # Empty first rows compare equal but are no repeated header
+        header = head_rows.header_text()
+        header_repeated = bool(header and rows.header_text()) and SequenceMatcher(
+            None, header, rows.header_text()
+        ).ratio() >= self.header_similarity
+        if not header_repeated:
+            # Without a repeated header, the first row must read as more data
+            if self.require_header_match or rows.has_header_row():
+                return None
+            if not _rows_alike(last_row, rows.cells[0]):
+                return None
+        
+        appended = rows.rows
+        data_cells = rows.cells[1:] if header_repeated else rows.cells
+        if header_repeated:
+            # Markdown pipe tables also repeat the separator line under the header
+            skip = 2 if rows.kind == 'markdown' and len(rows.rows) > 1 and _PIPE_SEPARATOR.match(rows.rows[1]) else 1
+            appended = rows.rows[skip:]
+            stats['headers_dropped'] += 1
+        
+        metadata = dict(head.metadata or {})
+        if 'table_parts' not in metadata:
+            metadata['table_parts'] = [self._part(head, head_page, len(head_rows.rows))]
+            stats['tables'] += 1
+        metadata['table_parts'].append(self._part(first, page_number, len(appended)))
+        head.metadata = metadata
+        head.content = self._append_rows(head.content, appended, head_rows.kind)
+        
+        first.metadata = dict(
+            first.metadata or {},
+            stitched_into={'page': head_page, 'element_id': head.element_id}
+        )
+        stats['continuations'] += 1
+        return head, head_page, head_rows, data_cells[-1] if data_cells else last_row
+    
+    def _page_edges(
+        self,
+        elements: List[ParsedElement]
+    ) -> Tuple[Optional[ParsedElement], Optional[ParsedElement]]:
+        """First and last content element of a page (by bbox when grounded)"""
+        if not elements:
+            return None, None
+        
+        boxes = np.array([element.bbox for element in elements], dtype=np.float64)
+        if not boxes.any(axis=1).all():
+            return elements[0], elements[-1]
+        return elements[int(boxes[:, 1].argmin())], elements[int(boxes[:, 3].argmax())]
+    
+    def _append_rows(self, content: str, rows: List[str], kind: str) -> str:
+        """Insert rows at the end of a table's content"""
+        if not rows:
+            return content
+        if kind == 'markdown':
+            return content.rstrip('\n') + '\n' + '\n'.join(rows)
+        
+        ends = list(_TABLE_END.finditer(content))
+        if not ends:
+            return content + ''.join(rows)
+        position = ends[-1].start()
+        # Stay inside a trailing </tbody>
+        body_end = content.lower().rfind('</tbody>', 0, position)
+        if body_end != -1 and not content[body_end + len('</tbody>'):position].strip():
+            position = body_end
+        return content[:position] + ''.join(rows) + content[position:]
+    
+    def _part(self, element: ParsedElement, page_number: int, row_count: int) -> Dict[str, Any]:
+        """Provenance record for one piece of a stitched table"""
+        return {
+            'page': page_number,
+            'element_id': element.element_id,
+            'bbox': list(element.bbox),
+            'rows': row_count
+        }
+
+
+if __name__ == "__main__":
+    print("Testing table_stitcher.py...\n")
+    
+    header = "<tr><td>No.</td><td>Item</td><td>Value</td></tr>"
+    
+    def html_table(*rows, with_header=True):
+        body = (header if with_header else "") + "".join(
+            f"<tr><td>{n}</td><td>{item}</td><td>{value}</td></tr>" for n, item, value in rows
+        )
+        return f"<table>{body}</table>"
+    
+    # Test 1: Row parsing
+    print("Test 1: Parse Rows")
+    print("-" * 60)
+    rows = TableRows.parse('<table><tr><td colspan="2">A</td><td>B</td></tr><tr><td>1</td><td>2</td><td>3</td></tr></table>')
+    print(f"HTML: {rows.kind}, {len(rows.rows)} rows, {rows.column_count} columns")
+    rows = TableRows.parse("| a | b |\n|---|---|\n| 1 | 2 |")
+    print(f"Markdown: {rows.kind}, {len(rows.cells)} rows, {rows.column_count} columns")
+    print(f"Separator only: {TableRows.parse('|---|---|')}")
+    
+    # Test 2: Three-page table with repeated header
+    print("\n" + "="*60)
+    print("Test 2: Stitch Across Pages")
+    print("-" * 60)
+    pages = [
+        (1, [
+            ParsedElement(1, "title", [100, 50, 900, 100], "Parts List"),
+            ParsedElement(2, "table", [100, 150, 900, 1380], html_table((1, "Bolt", 4), (2, "Nut", 8))),
+            ParsedElement(3, "text", [400, 1390, 600, 1410], "Page 1", metadata={'running': 'footer'}),
+        ]),
+        (2, [
+            ParsedElement(1, "table", [100, 60, 900, 1380], html_table((3, "Washer", 12))),
+        ]),
+        (3, [
+            ParsedElement(1, "table", [100, 60, 900, 400], html_table((4, "Screw", 6), with_header=False)),
+            ParsedElement(2, "text", [100, 450, 900, 500], "End of list"),
+        ]),
+    ]
+    stats = TableStitcher().stitch(pages)
+    print(f"Stats: {stats}")
+    head = pages[0][1][1]
+    print(f"Rows: {len(TableRows.parse(head.content).rows)}")
+    print(f"Parts: {[(p['page'], p['rows']) for p in head.metadata['table_parts']]}")
+    print(f"Continuations: {[is_continuation(e) for _, page in pages[1:] for e in page]}")
+    
+    # Test 3: Different tables are left alone
+    print("\n" + "="*60)
+    print("Test 3: Column Mismatch")
+    print("-" * 60)
+    pages = [
+        (1, [ParsedElement(1, "table", [100, 150, 900, 1380], html_table((1, "Bolt", 4)))]),
+        (2, [ParsedElement(1, "table", [100, 60, 900, 400], "<table><tr><td>X</td><td>Y</td></tr></table>")]),
+    ]
+    print(f"Stats: {TableStitcher().stitch(pages)}")
+    
+    # Test 4: Row shapes are compared with the last row appended so far
+    print("\n" + "="*60)
+    print("Test 4: Three-Page Chain")
+    print("-" * 60)
+    pages = [
+        (1, [ParsedElement(1, "table", [100, 150, 900, 1380], html_table(("A", "Bolt", "x")))]),
+        (2, [ParsedElement(1, "table", [100, 60, 900, 1380], html_table(("B", "Nut", "y"), (1, "Washer", 3), with_header=False))]),
+        (3, [ParsedElement(1, "table", [100, 60, 900, 400], html_table((2, "Screw", 6), with_header=False))]),
+    ]
+    stats = TableStitcher().stitch(pages)
+    print(f"Stats: {stats}")
+    assert stats['continuations'] == 2
+    
+    # Empty first rows are not a repeated header (no row dropped)
+    empty_row = "<tr><td></td><td></td><td></td></tr>"
+    pages = [
+        (1, [ParsedElement(1, "table", [100, 150, 900, 1380], f"<table>{empty_row}<tr><td>1</td><td>Bolt</td><td>4</td></tr></table>")]),
+        (2, [ParsedElement(1, "table", [100, 60, 900, 400], f"<table>{empty_row}<tr><td>2</td><td>Nut</td><td>8</td></tr></table>")]),
+    ]
+    stats = TableStitcher().stitch(pages)
+    print(f"Empty first rows: {stats}, rows {len(TableRows.parse(pages[0][1][0].content).rows)}")
+    assert stats['headers_dropped'] == 0 and len(TableRows.parse(pages[0][1][0].content).rows) == 4
+    
+    # Test 5: A document-header table at the top of each page is not a continuation
+    print("\n" + "="*60)
+    print("Test 5: Repeated Document Header")
+    print("-" * 60)
+    
+    def doc_header(page):
+        return (
+            "<table><tr><td>下野部工場 機密区域管理要領</td><td>付図1</td>"
+            f"<td>分類番号</td><td>ページ {page}/4</td></tr></table>"
+        )
+    
+    def data_table(*rows):
+        return "<table>" + "".join(
+            "<tr>" + "".join(f"<td>{cell}</td>" for cell in row) + "</tr>" for row in rows
+        ) + "</table>"
+    
+    pages = [
+        (1, [
+            ParsedElement(1, "table", [59, 53, 582, 105], doc_header(1)),
+            ParsedElement(2, "table", [59, 300, 582, 980], data_table(("区分", "担当", "期限", "備考"), ("A", "総務", "月次", "—"))),
+        ]),
+        (2, [
+            ParsedElement(1, "table", [59, 53, 582, 105], doc_header(2)),
+            ParsedElement(2, "sub_title", [59, 300, 582, 340], "2. 入室手順"),
+        ]),
+    ]
+    stats = TableStitcher().stitch(pages, [(640, 1000)] * 2)
+    print(f"Stats: {stats}")
+    assert stats['continuations'] == 0
+    
+    # Without running detection the header table is still no data row
+    pages = [
+        (1, [ParsedElement(1, "table", [59, 300, 582, 980], data_table(("A", "総務", "3", "4")))]),
+        (2, [ParsedElement(1, "table", [59, 53, 582, 105], doc_header(2))]),
+    ]
+    stats = TableStitcher().stitch(pages)
+    print(f"Header-like first row: {stats}")
+    assert stats['continuations'] == 0
+    
+    print("\n✅ table_stitcher.py tests passed!")
@@ -4,9 +4,21 @@ Handles PDF conversion and image preprocessing.
 """
 
 from .pdf_processor import PDFProcessor
-from .image_processor import ImageProcessor
+from .image_processor import ImageProcessor, ImageTile, PageOrientation
+from .payload_encoder import PayloadEncoder, PayloadSettings, EncodedPayload
+from .array_preprocessor import ArrayPreprocessor, benchmark_against_pil, otsu_threshold
+from .coordinate_transform import CoordinateTransform
 
 __all__ = [
     'PDFProcessor',
     'ImageProcessor',
+    'ImageTile',
+    'PageOrientation',
+    'PayloadEncoder',
+    'PayloadSettings',
+    'EncodedPayload',
+    'ArrayPreprocessor',
+    'benchmark_against_pil',
+    'otsu_threshold',
+    'CoordinateTransform',
 ]
\ No newline at end of file
@@ -0,0 +1,502 @@
+"""
+Array Preprocessor Module
+Vectorized page preprocessing on a single decoded uint8 buffer.
+Uses OpenCV when available, with NumPy/PIL fallbacks for every stage.
+"""
+
+from pathlib import Path
+from typing import Optional, Tuple, Dict, Any
+from PIL import Image
+import numpy as np
+import time
+
+try:
+    import cv2
+    CV2_AVAILABLE = True
+except ImportError:
+    CV2_AVAILABLE = False
+
+
+def load_array(image_path: str, grayscale: bool = False) -> np.ndarray:
+    """
+    Decode an image file once into a uint8 array.
+    
+    Args:
+        image_path: Path to image file
+        grayscale: Decode as single-channel grayscale
+    
+    Returns:
+        np.ndarray: HxW (grayscale) or HxWx3 (RGB) uint8 array
+    """
+    image_path = Path(image_path)
+    
+    if not image_path.exists():
+        raise FileNotFoundError(f"Image not found: {image_path}")
+    
+    if CV2_AVAILABLE:
+        flag = cv2.IMREAD_GRAYSCALE if grayscale else cv2.IMREAD_COLOR
+        array = cv2.imread(str(image_path), flag)
+        if array is not None:
+            return array if grayscale else cv2.cvtColor(array, cv2.COLOR_BGR2RGB)
+    
+    with Image.open(image_path) as img:
+        return np.asarray(img.convert('L' if grayscale else 'RGB'))
+
+
+def save_array(array: np.ndarray, output_path: str) -> str:
+    """
+    Encode a uint8 array to a PNG file.
+    
+    Args:
+        array: HxW or HxWx3 (RGB) uint8 array
+        output_path: Path to save image
+    
+    Returns:
+        str: Path to saved image
+    """
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    
+    if CV2_AVAILABLE:
+        bgr = cv2.cvtColor(array, cv2.COLOR_RGB2BGR) if array.ndim == 3 else array
+        cv2.imwrite(str(output_path), bgr)
+    else:
+        Image.fromarray(array).save(output_path, format='PNG')
+    
+    return str(output_path)
+
+
+def to_grayscale(array: np.ndarray) -> np.ndarray:
+    """Convert an RGB array to grayscale (no-op for grayscale input)"""
+    if array.ndim == 2:
+        return array
+    if CV2_AVAILABLE:
+        return cv2.cvtColor(array, cv2.COLOR_RGB2GRAY)
+    weights = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+    return (array @ weights).round().astype(np.uint8)
+
+
+def resize_area(array: np.ndarray, size: Tuple[int, int]) -> np.ndarray:
+    """
+    Resize with area averaging (no ringing on downscaled text).
+    
+    Args:
+        array: uint8 image array
+        size: Target (width, height)
+    
+    Returns:
+        np.ndarray: Resized array
+    """
+    if (array.shape[1], array.shape[0]) == tuple(size):
+        return array
+    if CV2_AVAILABLE:
+        return cv2.resize(array, size, interpolation=cv2.INTER_AREA)
+    return np.asarray(Image.fromarray(array).resize(size, Image.BOX))
+
+
+def normalize_contrast(
+    array: np.ndarray,
+    low_percentile: float = 1.0,
+    high_percentile: float = 99.0
+) -> np.ndarray:
+    """
+    Stretch gray levels so the given percentiles map to 0 and 255.
+    
+    Percentiles come from a 256-bin histogram and the stretch is applied
+    as a lookup table, so the cost is one pass over the buffer.
+    
+    Args:
+        array: uint8 image array
+        low_percentile: Percentile mapped to black
+        high_percentile: Percentile mapped to white
+    
+    Returns:
+        np.ndarray: Contrast-normalized array
+    """
+    gray = to_grayscale(array)
+    cdf = np.cumsum(np.bincount(gray.ravel(), minlength=256))
+    total = cdf[-1]
+    low = int(np.searchsorted(cdf, total * low_percentile / 100.0))
+    high = int(np.searchsorted(cdf, total * high_percentile / 100.0))
+    
+    if high <= low:
+        return array
+    
+    levels = np.arange(256, dtype=np.float32)
+    lut = np.clip((levels - low) * 255.0 / (high - low), 0, 255).astype(np.uint8)
+    
+    if CV2_AVAILABLE:
+        return cv2.LUT(array, lut)
+    return lut[array]
+
+
+def otsu_threshold(histogram: list) -> int:
+    """
+    Compute Otsu's threshold from a 256-bin grayscale histogram.
+    
+    Args:
+        histogram: 256 pixel counts (PIL Image.histogram() of an L image,
+            or np.bincount of a uint8 array)
+    
+    Returns:
+        int: Threshold separating ink from background
+    
+    Example:
+        >>> otsu_threshold(Image.open("page.png").convert('L').histogram())
+        142
+    """
+    total = sum(histogram)
+    if total == 0:
+        return 127
+    
+    weighted_total = sum(i * count for i, count in enumerate(histogram))
+    
+    background_weight = 0
+    background_sum = 0
+    best_threshold = 127
+    best_variance = -1.0
+    
+    for level, count in enumerate(histogram):
+        background_weight += count
+        if background_weight == 0:
+            continue
+        foreground_weight = total - background_weight
+        if foreground_weight == 0:
+            break
+        
+        background_sum += level * count
+        mean_background = background_sum / background_weight
+        mean_foreground = (weighted_total - background_sum) / foreground_weight
+        
+        variance = background_weight * foreground_weight * (mean_background - mean_foreground) ** 2
+        if variance > best_variance:
+            best_variance = variance
+            best_threshold = level
+    
+    return best_threshold
+
+
+def binarize(array: np.ndarray) -> np.ndarray:
+    """
+    Otsu binarization to a 0/255 grayscale array.
+    
+    Args:
+        array: uint8 image array
+    
+    Returns:
+        np.ndarray: HxW uint8 array with values 0 (ink) or 255 (paper)
+    """
+    gray = to_grayscale(array)
+    if CV2_AVAILABLE:
+        _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+        return binary
+    threshold = otsu_threshold(np.bincount(gray.ravel(), minlength=256).tolist())
+    return np.where(gray > threshold, 255, 0).astype(np.uint8)
+
+
+def estimate_skew_angle(
+    array: np.ndarray,
+    max_angle: float = 5.0,
+    analysis_size: int = 1024
+) -> float:
+    """
+    Estimate page skew from horizontal projection profiles.
+    
+    Ink pixels of a downsampled copy are projected onto rows for a range of
+    candidate angles; text lines produce the sharpest profile (highest sum
+    of squared bin counts) when the angle matches the skew. A coarse 0.5°
+    search is refined at 0.1°.
+    
+    Args:
+        array: uint8 image array
+        max_angle: Largest skew (degrees) searched in each direction
+        analysis_size: Longest side of the downsampled analysis image
+    
+    Returns:
+        float: Counter-clockwise skew of the content in degrees
+            (rotate by the negative of this to straighten)
+    
+    Example:
+        >>> page = load_array("scan.png", grayscale=True)
+        >>> estimate_skew_angle(page)
+        1.7
+    """
+    gray = to_grayscale(array)
+    height, width = gray.shape
+    scale = min(1.0, analysis_size / max(height, width))
+    if scale < 1.0:
+        gray = resize_area(gray, (max(1, int(width * scale)), max(1, int(height * scale))))
+    
+    # Too little ink (blank or near-blank page) gives no reliable profile
+    ys, xs = np.nonzero(binarize(gray) == 0)
+    if xs.size < 1000:
+        return 0.0
+    
+    xs = xs.astype(np.float32) - gray.shape[1] / 2
+    ys = ys.astype(np.float32)
+    
+    def _best(angles: np.ndarray) -> float:
+        radians = np.deg2rad(angles)
+        scores = []
+        for sin, cos in zip(np.sin(radians), np.cos(radians)):
+            rows = np.round(ys * cos + xs * sin).astype(np.int64)
+            counts = np.bincount(rows - rows.min())
+            scores.append(np.dot(counts, counts))
+        # Among equally sharp profiles prefer the smallest correction
+        scores = np.array(scores)
+        tied = angles[scores == scores.max()]
+        return float(tied[np.argmin(np.abs(tied))])
+    
+    coarse = _best(np.arange(-max_angle, max_angle + 0.25, 0.5))
+    fine = _best(np.arange(coarse - 0.5, coarse + 0.55, 0.1))
+    return round(fine, 2) or 0.0
+
+
+def rotate(array: np.ndarray, angle: float) -> np.ndarray:
+    """
+    Rotate an image counter-clockwise about its centre, keeping its size.
+    
+    Args:
+        array: uint8 image array
+        angle: Rotation in degrees (counter-clockwise)
+    
+    Returns:
+        np.ndarray: Rotated array, uncovered corners filled white
+    """
+    if angle == 0:
+        return array
+    
+    height, width = array.shape[:2]
+    if CV2_AVAILABLE:
+        matrix = cv2.getRotationMatrix2D((width / 2, height / 2), angle, 1.0)
+        fill = 255 if array.ndim == 2 else (255, 255, 255)
+        return cv2.warpAffine(
+            array, matrix, (width, height),
+            flags=cv2.INTER_LINEAR,
+            borderMode=cv2.BORDER_CONSTANT,
+            borderValue=fill
+        )
+    
+    fill = 255 if array.ndim == 2 else (255, 255, 255)
+    return np.asarray(Image.fromarray(array).rotate(angle, Image.BILINEAR, fillcolor=fill))
+
+
+class ArrayPreprocessor:
+    """
+    Page preprocessing pipeline over one decoded uint8 buffer.
+    
+    Stages (each optional): deskew -> area resize -> contrast
+    normalization -> binarization. The image is decoded once and encoded
+    once; every stage hands its array straight to the next. Deskew runs
+    before the (possibly non-uniform) resize so the angle is measured on
+    the page's own aspect ratio; the returned skew_angle must be undone
+    when mapping coordinates back (see PageOrientation.skew).
+    """
+    
+    def __init__(
+        self,
+        target_size: Optional[Tuple[int, int]] = (1024, 1024),
+        normalize: bool = False,
+        deskew: bool = False,
+        binarize: bool = False,
+        max_skew: float = 5.0
+    ):
+        """
+        Initialize array preprocessor.
+        
+        Args:
+            target_size: Output (width, height) (None = keep size)
+            normalize: Apply percentile contrast stretch
+            deskew: Estimate and correct small skew angles
+            binarize: Convert to black/white with Otsu threshold
+            max_skew: Largest skew (degrees) corrected by deskew
+        
+        Example:
+            >>> preprocessor = ArrayPreprocessor((1024, 1024), normalize=True)
+            >>> stats = preprocessor.run("page_001.png", "page_001_ocr.png")
+            >>> print(stats['timings'])
+        """
+        self.target_size = tuple(target_size) if target_size else None
+        self.normalize = normalize
+        self.deskew = deskew
+        self.binarize = binarize
+        self.max_skew = max_skew
+    
+    def process(self, array: np.ndarray) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """
+        Run the configured stages on a decoded image.
+        
+        Args:
+            array: uint8 image array
+        
+        Returns:
+            Tuple[np.ndarray, Dict[str, Any]]: (processed array, stage info
+            with 'skew_angle' and per-stage 'timings' in seconds)
+        """
+        timings = {}
+        skew_angle = 0.0
+        
+        if self.deskew:
+            start = time.perf_counter()
+            skew_angle = estimate_skew_angle(array, max_angle=self.max_skew)
+            array = rotate(array, -skew_angle)
+            timings['deskew'] = time.perf_counter() - start
+        
+        if self.target_size:
+            start = time.perf_counter()
+            array = resize_area(array, self.target_size)
+            timings['resize'] = time.perf_counter() - start
+        
+        if self.normalize:
+            start = time.perf_counter()
+            array = normalize_contrast(array)
+            timings['normalize'] = time.perf_counter() - start
+        
+        if self.binarize:
+            start = time.perf_counter()
+            array = binarize(array)
+            timings['binarize'] = time.perf_counter() - start
+        
+        return array, {'skew_angle': skew_angle, 'timings': timings}
+    
+    def run(self, image_path: str, output_path: str) -> Dict[str, Any]:
+        """
+        Decode, process and save an image.
+        
+        Args:
+            image_path: Path to input image
+            output_path: Path to save processed PNG
+        
+        Returns:
+            dict: output_path, source_size, size, skew_angle and timings
+        """
+        start = time.perf_counter()
+        array = load_array(image_path, grayscale=self.binarize)
+        decode_time = time.perf_counter() - start
+        source_size = (array.shape[1], array.shape[0])
+        
+        array, info = self.process(array)
+        
+        start = time.perf_counter()
+        save_array(array, output_path)
+        info['timings'] = {'decode': decode_time, **info['timings'], 'encode': time.perf_counter() - start}
+        
+        return {
+            'output_path': str(output_path),
+            'source_size': source_size,
+            'size': (array.shape[1], array.shape[0]),
+            **info
+        }
+
+
+def benchmark_against_pil(
+    image_path: str,
+    output_dir: str,
+    target_size: Tuple[int, int] = (1024, 1024),
+    repeats: int = 3
+) -> Dict[str, float]:
+    """
+    Time the array pipeline against the PIL path it replaces.
+    
+    The PIL path mirrors the previous behaviour: open, LANCZOS resize,
+    ImageEnhance contrast, save PNG. The array path decodes once, area
+    resizes, normalizes contrast and saves.
+    
+    Args:
+        image_path: Page image to process
+        output_dir: Directory for the output images
+        target_size: Output (width, height)
+        repeats: Runs per path (best time is reported)
+    
+    Returns:
+        dict: pil_seconds, array_seconds and speedup
+    """
+    from PIL import ImageEnhance
+    
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    
+    def _pil_path():
+        with Image.open(image_path) as img:
+            resized = img.convert('RGB').resize(target_size, Image.LANCZOS)
+            resized = ImageEnhance.Contrast(resized).enhance(1.5)
+            resized.save(output_dir / "pil.png", format='PNG')
+    
+    preprocessor = ArrayPreprocessor(target_size, normalize=True)
+    
+    def _array_path():
+        preprocessor.run(image_path, str(output_dir / "array.png"))
+    
+    def _best_time(func) -> float:
+        times = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - start)
+        return min(times)
+    
+    pil_seconds = _best_time(_pil_path)
+    array_seconds = _best_time(_array_path)
+    
+    return {
+        'pil_seconds': pil_seconds,
+        'array_seconds': array_seconds,
+        'speedup': pil_seconds / array_seconds if array_seconds else 0.0
+    }
+
+
+if __name__ == "__main__":
+    print("Testing array_preprocessor.py...\n")
+    
+    import tempfile
+    from PIL import ImageDraw
+    
+    print(f"OpenCV available: {CV2_AVAILABLE}")
+    
+    # Test 1: Create skewed 300-DPI test page
+    print("\n" + "="*60)
+    print("Test 1: Create Test Page")
+    print("-" * 60)
+    temp_dir = Path(tempfile.mkdtemp())
+    test_image = temp_dir / "page.png"
+    
+    page = Image.new('RGB', (2480, 3508), color=(235, 235, 235))
+    draw = ImageDraw.Draw(page)
+    for row in range(60):
+        y = 300 + row * 48
+        draw.rectangle((250, y, 2200, y + 18), fill=(70, 70, 70))
+    page = page.rotate(2.0, Image.BILINEAR, fillcolor=(235, 235, 235))
+    page.save(test_image)
+    print(f"Created test page: {test_image} (rotated 2.0°)")
+    
+    # Test 2: Skew estimation
+    print("\n" + "="*60)
+    print("Test 2: Estimate Skew")
+    print("-" * 60)
+    angle = estimate_skew_angle(load_array(str(test_image), grayscale=True))
+    print(f"Estimated skew: {angle}°")
+    
+    # Test 3: Full pipeline
+    print("\n" + "="*60)
+    print("Test 3: Pipeline")
+    print("-" * 60)
+    preprocessor = ArrayPreprocessor((1024, 1024), normalize=True, deskew=True, binarize=True)
+    stats = preprocessor.run(str(test_image), str(temp_dir / "page_ocr.png"))
+    print(f"Size: {stats['source_size']} -> {stats['size']}, skew corrected: {stats['skew_angle']}°")
+    for stage, seconds in stats['timings'].items():
+        print(f"  {stage:10s} {seconds * 1000:7.1f} ms")
+    
+    # Test 4: Benchmark against PIL path
+    print("\n" + "="*60)
+    print("Test 4: Benchmark vs PIL")
+    print("-" * 60)
+    result = benchmark_against_pil(str(test_image), str(temp_dir / "bench"))
+    print(f"PIL (LANCZOS + enhance): {result['pil_seconds'] * 1000:.1f} ms")
+    print(f"Array (area + LUT):      {result['array_seconds'] * 1000:.1f} ms")
+    print(f"Speedup: {result['speedup']:.2f}x")
+    
+    # Cleanup
+    import shutil
+    shutil.rmtree(temp_dir)
+    
+    print("\n✅ array_preprocessor.py tests passed!")
@@ -0,0 +1,281 @@
+"""
+Coordinate Transform Module
+Maps element bounding boxes from model space onto original page pixels.
+All bboxes of a page are transformed in one NumPy operation.
+"""
+
+from dataclasses import dataclass
+from itertools import compress
+from typing import Optional, Tuple, List, Dict, Any
+import numpy as np
+
+from .image_processor import PageOrientation
+
+
+@dataclass
+class CoordinateTransform:
+    """
+    Transform from model output coordinates to original-render pixels.
+    
+    Composes three stages:
+    1. Model space -> model image pixels: normalized coordinates in
+       [0, coordinate_range] are scaled to model_size (skipped when the
+       model reports pixel coordinates, coordinate_range=None)
+    2. Model image pixels -> upright page pixels: scaled from model_size
+       to the region the image covers (whole page, crop box or tile box)
+       and offset by the region origin
+    3. Upright page -> original render: orientation correction undone
+    
+    Attributes:
+        model_size: (width, height) of the image sent to the model
+        region: (x1, y1, x2, y2) area of the upright page covered by that image
+        coordinate_range: Largest model coordinate (999 for DeepSeek), or None
+        orientation: Orientation correction applied before OCR, or None
+        page_size: (width, height) of the original render; results are clipped to it
+    
+    Example:
+        >>> transform = CoordinateTransform(
+        ...     model_size=(1024, 1024),
+        ...     region=(0, 0, 2480, 3508),
+        ...     coordinate_range=999
+        ... )
+        >>> transform.apply([[0, 0, 999, 999]]).tolist()
+        [[0, 0, 2480, 3508]]
+    """
+    model_size: Tuple[int, int]
+    region: Tuple[int, int, int, int]
+    coordinate_range: Optional[int] = None
+    orientation: Optional[PageOrientation] = None
+    page_size: Optional[Tuple[int, int]] = None
+    
+    def get_scale(self) -> Tuple[float, float]:
+        """
+        Combined scale from model coordinates to upright page pixels.
+        
+        Returns:
+            Tuple[float, float]: (scale_x, scale_y)
+        """
+        x1, y1, x2, y2 = self.region
+        if self.coordinate_range:
+            units_x = units_y = self.coordinate_range
+        else:
+            units_x, units_y = self.model_size
+        return (x2 - x1) / units_x, (y2 - y1) / units_y
+    
+    def is_identity(self) -> bool:
+        """True if bboxes are already in original-render pixels"""
+        return (
+            self.get_scale() == (1.0, 1.0)
+            and self.region[:2] == (0, 0)
+            and self.orientation is None
+        )
+    
+    def apply(self, bboxes) -> np.ndarray:
+        """
+        Transform bboxes from model space to original-render pixels.
+        
+        Args:
+            bboxes: Array-like of shape (n, 4) with [x1, y1, x2, y2] rows
+        
+        Returns:
+            np.ndarray: int32 array of shape (n, 4)
+        """
+        boxes = np.asarray(bboxes, dtype=np.float64).reshape(-1, 4)
+        scale_x, scale_y = self.get_scale()
+        offset_x, offset_y = self.region[:2]
+        
+        mapped = boxes * (scale_x, scale_y, scale_x, scale_y) + (offset_x, offset_y, offset_x, offset_y)
+        
+        if self.orientation is not None:
+            mapped = _undo_orientation(mapped, self.orientation)
+        else:
+            mapped = np.rint(mapped)
+        
+        if self.page_size is not None:
+            width, height = self.page_size
+            np.clip(mapped, 0, (width, height, width, height), out=mapped)
+        
+        return mapped.astype(np.int32)
+    
+    def apply_to_elements(self, elements: List[Any]) -> int:
+        """
+        Transform element bboxes in place.
+        
+        Elements with an all-zero bbox (synthetic boxes from the markdown
+        parser) are left untouched.
+        
+        Args:
+            elements: ParsedElement objects
+        
+        Returns:
+            int: Number of elements transformed
+        """
+        if not elements:
+            return 0
+        
+        boxes = np.array([element.bbox for element in elements], dtype=np.float64)
+        grounded = boxes.any(axis=1)
+        mapped = self.apply(boxes[grounded]).tolist()
+        
+        for element, bbox in zip(compress(elements, grounded), mapped):
+            element.bbox = bbox
+        
+        return len(mapped)
+    
+    def apply_to_table(self, table) -> int:
+        """
+        Transform the bbox column of an ElementTable in place.
+        
+        Args:
+            table: ElementTable
+        
+        Returns:
+            int: Number of rows transformed
+        """
+        grounded = table.bboxes.any(axis=1)
+        table.bboxes[grounded] = self.apply(table.bboxes[grounded])
+        return int(grounded.sum())
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for metadata"""
+        scale_x, scale_y = self.get_scale()
+        return {
+            'model_size': list(self.model_size),
+            'region': list(self.region),
+            'coordinate_range': self.coordinate_range,
+            'scale': [scale_x, scale_y],
+            'orientation': self.orientation.to_dict() if self.orientation else None,
+            'page_size': list(self.page_size) if self.page_size else None
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'CoordinateTransform':
+        """
+        Rebuild a transform saved with to_dict().
+        
+        Args:
+            data: Dictionary from to_dict()
+        
+        Returns:
+            CoordinateTransform: Restored transform
+        """
+        orientation = data.get('orientation')
+        if orientation:
+            orientation = PageOrientation(
+                rotation=orientation['rotation'],
+                skew=orientation['skew'],
+                confidence=orientation['confidence'],
+                source_size=tuple(orientation['source_size'])
+            )
+        return cls(
+            model_size=tuple(data['model_size']),
+            region=tuple(data['region']),
+            coordinate_range=data.get('coordinate_range'),
+            orientation=orientation or None,
+            page_size=tuple(data['page_size']) if data.get('page_size') else None
+        )
+
+
+def _undo_orientation(boxes: np.ndarray, orientation: PageOrientation) -> np.ndarray:
+    """
+    Vectorized PageOrientation.to_source for an (n, 4) float array.
+    
+    Rotates all four corners of every box back through the deskew and
+    quarter-turn, then takes the enclosing box clamped to the source page.
+    """
+    width, height = orientation.source_size
+    upright_width, upright_height = orientation.get_upright_size()
+    cx, cy = upright_width / 2, upright_height / 2
+    cos = np.cos(np.radians(orientation.skew))
+    sin = np.sin(np.radians(orientation.skew))
+    
+    # Corners as (n, 4): x1y1, x2y1, x1y2, x2y2
+    xs = boxes[:, [0, 2, 0, 2]]
+    ys = boxes[:, [1, 1, 3, 3]]
+    
+    # Undo deskew (rotate back counter-clockwise about the centre)
+    dx, dy = xs - cx, ys - cy
+    xs, ys = cos * dx + sin * dy + cx, -sin * dx + cos * dy + cy
+    
+    # Undo quarter-turn
+    if orientation.rotation == 90:
+        xs, ys = ys, height - xs
+    elif orientation.rotation == 180:
+        xs, ys = width - xs, height - ys
+    elif orientation.rotation == 270:
+        xs, ys = width - ys, xs
+    
+    return np.stack([
+        np.maximum(0, np.floor(xs.min(axis=1))),
+        np.maximum(0, np.floor(ys.min(axis=1))),
+        np.minimum(width, np.ceil(xs.max(axis=1))),
+        np.minimum(height, np.ceil(ys.max(axis=1)))
+    ], axis=1)
+
+
+if __name__ == "__main__":
+    print("Testing coordinate_transform.py...\n")
+    
+    import time
+    
+    # Test 1: Normalized coordinates onto a full page
+    print("Test 1: Normalized -> Page Pixels")
+    print("-" * 60)
+    transform = CoordinateTransform(
+        model_size=(1024, 1024),
+        region=(0, 0, 2480, 3508),
+        coordinate_range=999,
+        page_size=(2480, 3508)
+    )
+    print(f"Scale: {transform.get_scale()}")
+    print(f"[0, 0, 999, 999] -> {transform.apply([[0, 0, 999, 999]]).tolist()[0]}")
+    print(f"[500, 500, 600, 550] -> {transform.apply([[500, 500, 600, 550]]).tolist()[0]}")
+    
+    # Test 2: Crop offset
+    print("\n" + "="*60)
+    print("Test 2: Crop Offset")
+    print("-" * 60)
+    cropped = CoordinateTransform(model_size=(1024, 1024), region=(200, 300, 2248, 3372))
+    print(f"[0, 0, 1024, 1024] -> {cropped.apply([[0, 0, 1024, 1024]]).tolist()[0]}")
+    
+    # Test 3: Orientation matches PageOrientation.to_source
+    print("\n" + "="*60)
+    print("Test 3: Orientation")
+    print("-" * 60)
+    rng = np.random.default_rng(0)
+    for rotation in (0, 90, 180, 270):
+        orientation = PageOrientation(rotation=rotation, skew=1.5, source_size=(3508, 2480))
+        upright_width, upright_height = orientation.get_upright_size()
+        corners = rng.integers(0, min(upright_width, upright_height) // 2, size=(200, 2))
+        boxes = np.hstack([corners, corners + 200])
+        oriented = CoordinateTransform(
+            model_size=(upright_width, upright_height),
+            region=(0, 0, upright_width, upright_height),
+            orientation=orientation
+        )
+        expected = [orientation.to_source(box) for box in boxes.tolist()]
+        print(f"Rotation {rotation:3d}: matches to_source: {oriented.apply(boxes).tolist() == expected}")
+    
+    # Test 4: Round trip through metadata
+    print("\n" + "="*60)
+    print("Test 4: Serialization")
+    print("-" * 60)
+    restored = CoordinateTransform.from_dict(oriented.to_dict())
+    print(f"Round trip equal: {restored == oriented}")
+    
+    # Test 5: Vectorized vs per-element
+    print("\n" + "="*60)
+    print("Test 5: Throughput")
+    print("-" * 60)
+    boxes = rng.integers(0, 900, size=(50000, 2))
+    boxes = np.hstack([boxes, boxes + 50])
+    start_time = time.perf_counter()
+    transform.apply(boxes)
+    vector_time = time.perf_counter() - start_time
+    scale_x, scale_y = transform.get_scale()
+    start_time = time.perf_counter()
+    [[round(b[0] * scale_x), round(b[1] * scale_y), round(b[2] * scale_x), round(b[3] * scale_y)] for b in boxes.tolist()]
+    loop_time = time.perf_counter() - start_time
+    print(f"50k bboxes: vectorized {vector_time * 1000:.1f} ms, per-element loop {loop_time * 1000:.1f} ms")
+    
+    print("\n✅ coordinate_transform.py tests passed!")
@@ -5,10 +5,137 @@ Includes resizing, format conversion, and optional enhancements.
 """
 
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Optional, Tuple, List
+from dataclasses import dataclass
 from PIL import Image, ImageEnhance
+import numpy as np
+import math
 import io
 
+from .array_preprocessor import (
+    otsu_threshold,
+    load_array,
+    save_array,
+    resize_area,
+    binarize,
+    rotate,
+    estimate_skew_angle
+)
+
+
+@dataclass
+class ImageTile:
+    """
+    A rectangular tile cut from a larger page image.
+    
+    Attributes:
+        index: Position of the tile in row-major order
+        row: Tile row in the grid
+        col: Tile column in the grid
+        x_offset: Left edge of the tile in page pixels
+        y_offset: Top edge of the tile in page pixels
+        width: Tile width in pixels
+        height: Tile height in pixels
+        image_path: Path to the saved tile image
+    """
+    index: int
+    row: int
+    col: int
+    x_offset: int
+    y_offset: int
+    width: int
+    height: int
+    image_path: Optional[str] = None
+    
+    def get_box(self) -> Tuple[int, int, int, int]:
+        """Get tile region as (x1, y1, x2, y2) in page pixels"""
+        return (
+            self.x_offset,
+            self.y_offset,
+            self.x_offset + self.width,
+            self.y_offset + self.height
+        )
+
+
+@dataclass
+class PageOrientation:
+    """
+    Rotation and skew detected on a page, and applied to make it upright.
+    
+    Attributes:
+        rotation: Clockwise quarter-turn applied to the page (0, 90, 180, 270)
+        skew: Counter-clockwise skew (degrees) removed after the quarter-turn
+        confidence: Strength of the orientation evidence (0-1)
+        source_size: (width, height) of the original page image
+    """
+    rotation: int = 0
+    skew: float = 0.0
+    confidence: float = 0.0
+    source_size: Tuple[int, int] = (0, 0)
+    
+    def is_identity(self) -> bool:
+        """True if no correction is applied"""
+        return self.rotation == 0 and self.skew == 0.0
+    
+    def get_upright_size(self) -> Tuple[int, int]:
+        """Size of the corrected image (quarter-turns swap width and height)"""
+        width, height = self.source_size
+        return (height, width) if self.rotation in (90, 270) else (width, height)
+    
+    def to_source(self, bbox: List[int]) -> List[int]:
+        """
+        Map a bbox on the corrected image back onto the original page.
+        
+        Args:
+            bbox: [x1, y1, x2, y2] in corrected-image pixels
+        
+        Returns:
+            List[int]: Enclosing [x1, y1, x2, y2] in original-page pixels
+        
+        Example:
+            >>> orientation = PageOrientation(rotation=90, source_size=(3508, 2480))
+            >>> orientation.to_source([100, 200, 300, 250])
+            [200, 2180, 250, 2380]
+        """
+        width, height = self.source_size
+        upright_width, upright_height = self.get_upright_size()
+        cx, cy = upright_width / 2, upright_height / 2
+        cos = math.cos(math.radians(self.skew))
+        sin = math.sin(math.radians(self.skew))
+        
+        xs, ys = [], []
+        for x, y in ((bbox[0], bbox[1]), (bbox[2], bbox[1]), (bbox[0], bbox[3]), (bbox[2], bbox[3])):
+            # Undo deskew (rotate back counter-clockwise about the centre)
+            dx, dy = x - cx, y - cy
+            x, y = cos * dx + sin * dy + cx, -sin * dx + cos * dy + cy
+            
+            # Undo quarter-turn
+            if self.rotation == 90:
+                x, y = y, height - x
+            elif self.rotation == 180:
+                x, y = width - x, height - y
+            elif self.rotation == 270:
+                x, y = width - y, x
+            
+            xs.append(x)
+            ys.append(y)
+        
+        return [
+            max(0, int(math.floor(min(xs)))),
+            max(0, int(math.floor(min(ys)))),
+            min(width, int(math.ceil(max(xs)))),
+            min(height, int(math.ceil(max(ys))))
+        ]
+    
+    def to_dict(self) -> dict:
+        """Convert to dictionary for metadata"""
+        return {
+            'rotation': self.rotation,
+            'skew': self.skew,
+            'confidence': self.confidence,
+            'source_size': list(self.source_size)
+        }
+
 
 class ImageProcessor:
     """
@@ -60,28 +187,18 @@ class ImageProcessor:
         if not image_path.exists():
             raise FileNotFoundError(f"Image not found: {image_path}")
         
-        # Load image
-        img = Image.open(image_path)
-        
-        # Apply processing
-        img = self._preprocess(img)
-        
-
-        ## code rabbit 
+        # Load and process image (decoded once)
         with Image.open(image_path) as img:
-            #apply processing
-            processed_img = self._preprocess(img) 
-
+            processed_img = self._preprocess(img)
+            
             # Determine output path
             if output_path is None:
                 output_path = image_path
             else:
                 output_path = Path(output_path)
                 output_path.parent.mkdir(parents=True, exist_ok=True)
-
+            
             processed_img.save(output_path, format='PNG')
-        # # Save processed image
-        # img.save(output_path, format='PNG')
         
         return str(output_path)
     
@@ -279,6 +396,430 @@ class ImageProcessor:
         
         return str(output_path)
     
+    def needs_tiling(self, image_path: str, min_dimension: int) -> bool:
+        """
+        Check if an image is large enough to be processed as tiles.
+        
+        Args:
+            image_path: Path to image file
+            min_dimension: Longest side (pixels) above which tiling is used
+            
+        Returns:
+            bool: True if the image should be tiled
+            
+        Example:
+            >>> processor = ImageProcessor()
+            >>> processor.needs_tiling("a3_drawing.png", min_dimension=2048)
+            True
+        """
+        with Image.open(image_path) as img:
+            return max(img.size) > min_dimension
+    
+    @staticmethod
+    def compute_tile_grid(
+        width: int,
+        height: int,
+        tile_size: int = 1024,
+        overlap: int = 128
+    ) -> List[Tuple[int, int, int, int]]:
+        """
+        Compute overlapping tile regions covering an image.
+        
+        Uses the fewest tiles per axis that keep at least `overlap` pixels
+        shared between neighbours, then spreads them evenly so the first and
+        last tiles sit flush with the image edges.
+        
+        Args:
+            width: Image width in pixels
+            height: Image height in pixels
+            tile_size: Tile edge length in pixels
+            overlap: Overlap between neighbouring tiles in pixels
+            
+        Returns:
+            List[Tuple[int, int, int, int]]: (x, y, w, h) per tile, row-major
+            
+        Example:
+            >>> ImageProcessor.compute_tile_grid(2000, 1000, 1024, 128)
+            [(0, 0, 1024, 1000), (488, 0, 1024, 1000), (976, 0, 1024, 1000)]
+        """
+        if overlap >= tile_size:
+            raise ValueError("overlap must be smaller than tile_size")
+        
+        def _starts(length: int) -> List[int]:
+            if length <= tile_size:
+                return [0]
+            stride = tile_size - overlap
+            count = -(-(length - overlap) // stride)  # ceil division
+            span = length - tile_size
+            return [round(i * span / (count - 1)) for i in range(count)]
+        
+        grid = []
+        for y in _starts(height):
+            for x in _starts(width):
+                grid.append((x, y, min(tile_size, width), min(tile_size, height)))
+        
+        return grid
+    
+    def split_into_tiles(
+        self,
+        image_path: str,
+        output_dir: str,
+        tile_size: int = 1024,
+        overlap: int = 128
+    ) -> List[ImageTile]:
+        """
+        Split an image into overlapping tiles at native resolution.
+        
+        Args:
+            image_path: Path to input image
+            output_dir: Directory to save tile images
+            tile_size: Tile edge length in pixels
+            overlap: Overlap between neighbouring tiles in pixels
+            
+        Returns:
+            List[ImageTile]: Tiles with their page offsets and saved paths
+            
+        Example:
+            >>> processor = ImageProcessor()
+            >>> tiles = processor.split_into_tiles("a3_page.png", "temp/tiles")
+            >>> print(len(tiles), tiles[1].image_path)
+            20 'temp/tiles/a3_page_tile_00_01.png'
+        """
+        image_path = Path(image_path)
+        
+        if not image_path.exists():
+            raise FileNotFoundError(f"Image not found: {image_path}")
+        
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        
+        tiles = []
+        with Image.open(image_path) as img:
+            if self.convert_to_rgb and img.mode != 'RGB':
+                img = img.convert('RGB')
+            
+            grid = self.compute_tile_grid(img.width, img.height, tile_size, overlap)
+            xs = sorted({x for x, _, _, _ in grid})
+            ys = sorted({y for _, y, _, _ in grid})
+            
+            for index, (x, y, w, h) in enumerate(grid):
+                row, col = ys.index(y), xs.index(x)
+                tile_path = output_dir / f"{image_path.stem}_tile_{row:02d}_{col:02d}.png"
+                img.crop((x, y, x + w, y + h)).save(tile_path, format='PNG')
+                
+                tiles.append(ImageTile(
+                    index=index,
+                    row=row,
+                    col=col,
+                    x_offset=x,
+                    y_offset=y,
+                    width=w,
+                    height=h,
+                    image_path=str(tile_path)
+                ))
+        
+        return tiles
+    
+    def detect_content_bounds(
+        self,
+        image_path: str,
+        max_ink_level: int = 200,
+        edge_margin: float = 0.08,
+        analysis_size: int = 1024
+    ) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Find the bounding box of the ink on a page.
+        
+        Works on a downsampled grayscale copy: pixels darker than the Otsu
+        threshold (capped at `max_ink_level`) count as ink, and row/column ink
+        profiles give the content extent. Solid blobs lying entirely within
+        `edge_margin` of a border (punch holes, scanner shadows) are ignored.
+        
+        Args:
+            image_path: Path to image file
+            max_ink_level: Brightest gray level (0-255) still treated as ink
+            edge_margin: Border band (fraction of width/height) checked for blobs
+            analysis_size: Longest side of the downsampled analysis image
+        
+        Returns:
+            Optional[Tuple[int, int, int, int]]: (x1, y1, x2, y2) in image
+            pixels, or None if the page has no ink
+        
+        Example:
+            >>> processor = ImageProcessor()
+            >>> processor.detect_content_bounds("scan_page_001.png")
+            (212, 180, 2301, 3244)
+        """
+        with Image.open(image_path) as img:
+            width, height = img.size
+            gray = img.convert('L')
+            factor = max(1, max(width, height) // analysis_size)
+            if factor > 1:
+                gray = gray.reduce(factor)
+        
+        threshold = min(otsu_threshold(gray.histogram()), max_ink_level)
+        ink = np.asarray(gray) < threshold
+        
+        x_span = self._content_span(ink, axis=0, edge_margin=edge_margin)
+        y_span = self._content_span(ink, axis=1, edge_margin=edge_margin)
+        if x_span is None or y_span is None:
+            return None
+        
+        # Scale analysis coordinates back to image pixels
+        scale_x = width / ink.shape[1]
+        scale_y = height / ink.shape[0]
+        return (
+            int(x_span[0] * scale_x),
+            int(y_span[0] * scale_y),
+            min(width, int(np.ceil(x_span[1] * scale_x))),
+            min(height, int(np.ceil(y_span[1] * scale_y)))
+        )
+    
+    @staticmethod
+    def _content_span(
+        ink: np.ndarray,
+        axis: int,
+        edge_margin: float,
+        min_pixels: int = 2,
+        solid_density: float = 0.6
+    ) -> Optional[Tuple[int, int]]:
+        """
+        Content extent along one axis of an ink mask.
+        
+        Args:
+            ink: Boolean ink mask (rows x columns)
+            axis: 0 for the horizontal extent, 1 for the vertical extent
+            edge_margin: Border band (fraction of length) checked for blobs
+            min_pixels: Ink pixels needed for a row/column to count as content
+            solid_density: Fill ratio above which an edge run is a blob, not text
+        
+        Returns:
+            Optional[Tuple[int, int]]: (start, end) indices, end exclusive
+        """
+        profile = ink.sum(axis=axis)
+        active = np.flatnonzero(profile >= min_pixels)
+        if active.size == 0:
+            return None
+        
+        # Split active positions into runs separated by blank gaps
+        breaks = np.flatnonzero(np.diff(active) > 1)
+        starts = np.concatenate(([active[0]], active[breaks + 1]))
+        ends = np.concatenate((active[breaks], [active[-1]])) + 1
+        
+        length = profile.size
+        edge = edge_margin * length
+        keep = np.ones(starts.size, dtype=bool)
+        
+        for i, (start, end) in enumerate(zip(starts, ends)):
+            if end > edge and start < length - edge:
+                continue
+            # Fill ratio of the run over the perpendicular lines it touches
+            strip = ink[:, start:end] if axis == 0 else ink[start:end, :]
+            touched = np.count_nonzero(strip.any(axis=1 - axis))
+            density = strip.sum() / (touched * (end - start)) if touched else 0.0
+            keep[i] = density < solid_density
+        
+        if not keep.any():
+            return None
+        
+        return int(starts[keep][0]), int(ends[keep][-1])
+    
+    def crop_to_content(
+        self,
+        image_path: str,
+        output_path: Optional[str] = None,
+        padding: int = 16,
+        min_savings: float = 0.05
+    ) -> Tuple[str, Tuple[int, int, int, int]]:
+        """
+        Crop an image to its ink bounding box plus padding.
+        
+        Args:
+            image_path: Path to input image
+            output_path: Path to save cropped image (None = '{stem}_crop.png')
+            padding: Pixels of margin kept around the content
+            min_savings: Minimum fraction of area removed for a crop to be saved
+        
+        Returns:
+            Tuple[str, Tuple[int, int, int, int]]: (path, crop box). If nothing
+            worth cropping was found the original path and full-image box are
+            returned.
+        
+        Example:
+            >>> processor = ImageProcessor()
+            >>> path, box = processor.crop_to_content("page_001.png")
+            >>> print(path, box)
+            'page_001_crop.png' (196, 164, 2317, 3260)
+        """
+        image_path = Path(image_path)
+        
+        if not image_path.exists():
+            raise FileNotFoundError(f"Image not found: {image_path}")
+        
+        with Image.open(image_path) as img:
+            width, height = img.size
+            full_box = (0, 0, width, height)
+            
+            bounds = self.detect_content_bounds(str(image_path))
+            if bounds is None:
+                return str(image_path), full_box
+            
+            box = (
+                max(0, bounds[0] - padding),
+                max(0, bounds[1] - padding),
+                min(width, bounds[2] + padding),
+                min(height, bounds[3] + padding)
+            )
+            
+            kept_area = (box[2] - box[0]) * (box[3] - box[1])
+            if kept_area > (1.0 - min_savings) * width * height:
+                return str(image_path), full_box
+            
+            if output_path is None:
+                output_path = image_path.parent / f"{image_path.stem}_crop.png"
+            else:
+                output_path = Path(output_path)
+                output_path.parent.mkdir(parents=True, exist_ok=True)
+            
+            img.crop(box).save(output_path, format='PNG')
+        
+        return str(output_path), box
+    
+    def detect_orientation(
+        self,
+        image_path: str,
+        max_skew: float = 5.0,
+        analysis_size: int = 1536,
+        upside_down: bool = False,
+        flip_margin: float = 0.3
+    ) -> PageOrientation:
+        """
+        Detect quarter-turn rotation and small skew of a text page.
+        
+        Works on a downsampled grayscale copy:
+        - Sideways pages: text lines make the row ink profile much sharper
+          than the column profile; the reverse means a 90° turn.
+        - Skew: projection-profile search (see estimate_skew_angle).
+        - Upside-down pages (opt-in, Latin script only): in upright Latin
+          text ascenders outnumber descenders, so each line has more ink
+          above its x-height band than below it. CJK and vertical text
+          have no such asymmetry (upright Japanese pages often score
+          strongly "upside down"), so leave this off for those documents.
+          Without it, sideways pages are always turned 90° clockwise, since
+          telling 90° from 270° needs the same test.
+        
+        Args:
+            image_path: Path to image file
+            max_skew: Largest skew (degrees) searched in each direction
+            analysis_size: Longest side of the downsampled analysis image
+            upside_down: Also test for 180° (Latin-script pages only)
+            flip_margin: Ascender/descender imbalance required to flip (0-1)
+        
+        Returns:
+            PageOrientation: Detected correction (identity if unsure)
+        
+        Example:
+            >>> processor = ImageProcessor()
+            >>> orientation = processor.detect_orientation("scan_upside_down.png", upside_down=True)
+            >>> print(orientation.rotation, orientation.skew)
+            180 0.4
+        """
+        gray = load_array(image_path, grayscale=True)
+        height, width = gray.shape
+        orientation = PageOrientation(source_size=(width, height))
+        
+        scale = min(1.0, analysis_size / max(width, height))
+        small = resize_area(gray, (max(1, int(width * scale)), max(1, int(height * scale))))
+        ink = binarize(small) == 0
+        if np.count_nonzero(ink) < 1000:
+            return orientation
+        
+        # Sideways: deskewed row profile sharper after a quarter-turn.
+        # Skew is unchanged by a further 180° turn.
+        candidates = []
+        for rotation in (0, 90):
+            turned = np.ascontiguousarray(np.rot90(small, -rotation // 90))
+            skew = estimate_skew_angle(turned, max_angle=max_skew)
+            straight = rotate(turned, -skew)
+            sharpness = _profile_sharpness((binarize(straight) == 0).sum(axis=1))
+            candidates.append((sharpness, rotation, skew, straight))
+        
+        upright_sharpness, rotation, skew, small = candidates[0]
+        if candidates[1][0] > 1.15 * upright_sharpness:
+            _, rotation, skew, small = candidates[1]
+        orientation.rotation = rotation
+        orientation.skew = skew
+        
+        if not upside_down:
+            return orientation
+        
+        # Upside down: clearly more ink below the x-height band than above it
+        balance = _ascender_balance(binarize(small) == 0)
+        orientation.confidence = round(min(1.0, abs(balance) * 2), 2)
+        if balance < -flip_margin:
+            orientation.rotation = (orientation.rotation + 180) % 360
+        
+        return orientation
+    
+    def correct_orientation(
+        self,
+        image_path: str,
+        output_path: Optional[str] = None,
+        max_skew: float = 5.0,
+        min_skew: float = 0.2,
+        rotations: bool = True,
+        upside_down: bool = False
+    ) -> Tuple[str, PageOrientation]:
+        """
+        Rotate and deskew a page so its text is upright.
+        
+        Args:
+            image_path: Path to input image
+            output_path: Path to save corrected image (None = '{stem}_upright.png')
+            max_skew: Largest skew (degrees) corrected
+            min_skew: Skew below this (degrees) is left alone
+            rotations: Also detect quarter-turns (False = deskew only)
+            upside_down: Also test for 180° (Latin-script pages only, see detect_orientation)
+        
+        Returns:
+            Tuple[str, PageOrientation]: (path, applied correction). If the
+            page is already upright the original path is returned.
+        
+        Example:
+            >>> processor = ImageProcessor()
+            >>> path, orientation = processor.correct_orientation("scan.png")
+            >>> bbox_on_scan = orientation.to_source([120, 80, 640, 130])
+        """
+        image_path = Path(image_path)
+        
+        if not image_path.exists():
+            raise FileNotFoundError(f"Image not found: {image_path}")
+        
+        if rotations:
+            orientation = self.detect_orientation(str(image_path), max_skew=max_skew, upside_down=upside_down)
+        else:
+            # Measured on the full page (estimate_skew_angle downsamples uniformly)
+            page = load_array(str(image_path), grayscale=True)
+            orientation = PageOrientation(
+                skew=estimate_skew_angle(page, max_angle=max_skew),
+                source_size=(page.shape[1], page.shape[0])
+            )
+        if abs(orientation.skew) < min_skew:
+            orientation.skew = 0.0
+        
+        if orientation.is_identity():
+            return str(image_path), orientation
+        
+        page = load_array(str(image_path))
+        if orientation.rotation:
+            page = np.ascontiguousarray(np.rot90(page, -orientation.rotation // 90))
+        page = rotate(page, -orientation.skew)
+        
+        if output_path is None:
+            output_path = image_path.parent / f"{image_path.stem}_upright.png"
+        
+        return save_array(page, str(output_path)), orientation
+    
     def validate_image(self, image_path: str) -> Tuple[bool, Optional[str]]:
         """
         Validate if file is a valid image.
@@ -318,6 +859,44 @@ class ImageProcessor:
             return False, f"Invalid image: {str(e)}"
 
 
+def _profile_sharpness(profile: np.ndarray) -> float:
+    """Squared coefficient of variation of an ink profile"""
+    mean = profile.mean()
+    return float(profile.var() / (mean * mean)) if mean else 0.0
+
+
+def _ascender_balance(ink: np.ndarray) -> float:
+    """
+    Ink above vs below the x-height band, summed over text lines.
+    
+    Args:
+        ink: Boolean ink mask of a deskewed page
+    
+    Returns:
+        float: (above - below) / (above + below); positive for upright text
+    """
+    profile = ink.sum(axis=1)
+    active = np.flatnonzero(profile > 0)
+    if active.size == 0:
+        return 0.0
+    
+    breaks = np.flatnonzero(np.diff(active) > 1)
+    starts = np.concatenate(([active[0]], active[breaks + 1]))
+    ends = np.concatenate((active[breaks], [active[-1]])) + 1
+    
+    above = below = 0
+    for start, end in zip(starts, ends):
+        if end - start < 4:
+            continue
+        line = profile[start:end]
+        core = np.flatnonzero(line >= 0.5 * line.max())
+        above += int(line[:core[0]].sum())
+        below += int(line[core[-1] + 1:].sum())
+    
+    total = above + below
+    return (above - below) / total if total else 0.0
+
+
 if __name__ == "__main__":
     print("Testing image_processor.py...\n")
     
@@ -377,6 +956,50 @@ if __name__ == "__main__":
     print(f"Valid: {is_valid}")
     print(f"Error: {error}")
     
+    # Test 7: Tiling
+    print("\n" + "="*60)
+    print("Test 7: Split Into Tiles")
+    print("-" * 60)
+    big_image = temp_dir / "big.png"
+    Image.new('RGB', (3000, 2000), color='white').save(big_image)
+    print(f"Needs tiling: {processor.needs_tiling(str(big_image), 2048)}")
+    tiles = processor.split_into_tiles(str(big_image), str(temp_dir / "tiles"), 1024, 128)
+    print(f"Tiles: {len(tiles)}")
+    for tile in tiles[:3]:
+        print(f"  [{tile.row},{tile.col}] box={tile.get_box()}")
+    
+    # Test 8: Content cropping
+    print("\n" + "="*60)
+    print("Test 8: Crop To Content")
+    print("-" * 60)
+    from PIL import ImageDraw
+    scan_image = temp_dir / "scan.png"
+    scan = Image.new('RGB', (2480, 3508), color='white')
+    draw = ImageDraw.Draw(scan)
+    draw.rectangle((300, 400, 2100, 3000), outline='black', width=6)
+    for hole_y in (800, 1754, 2708):  # Punch holes near the left edge
+        draw.ellipse((60, hole_y - 40, 140, hole_y + 40), fill='black')
+    scan.save(scan_image)
+    print(f"Content bounds: {processor.detect_content_bounds(str(scan_image))}")
+    cropped, box = processor.crop_to_content(str(scan_image), padding=16)
+    print(f"Crop box: {box} -> {Path(cropped).name}")
+    
+    # Test 9: Orientation and skew
+    print("\n" + "="*60)
+    print("Test 9: Detect Orientation")
+    print("-" * 60)
+    from PIL import ImageFont
+    text_page = Image.new('L', (2480, 3508), color=255)
+    draw = ImageDraw.Draw(text_page)
+    font = ImageFont.load_default(size=36)
+    for row in range(50):
+        draw.text((250, 300 + row * 58), "Typical body text with ascenders and descenders " * 2, fill=0, font=font)
+    rotated_image = temp_dir / "rotated.png"
+    text_page.rotate(1.5, Image.BILINEAR, fillcolor=255).rotate(90, expand=True).save(rotated_image)
+    upright, orientation = processor.correct_orientation(str(rotated_image), upside_down=True)
+    print(f"Rotation: {orientation.rotation}°, skew: {orientation.skew}° -> {Path(upright).name}")
+    print(f"First line box on scan: {orientation.to_source([250, 300, 2200, 340])}")
+    
     # Cleanup
     import shutil
     shutil.rmtree(temp_dir)
@@ -0,0 +1,334 @@
+"""
+Payload Encoder Module
+Encodes page images into compact request payloads for vision models.
+Supports PNG/JPEG/WebP, RGB/grayscale/bilevel colorspaces and quality tiers.
+"""
+
+from pathlib import Path
+from typing import Optional, Dict, Any, Union
+from dataclasses import dataclass
+from PIL import Image
+import io
+import time
+
+from .array_preprocessor import otsu_threshold
+
+
+# Supported payload settings
+PAYLOAD_FORMATS = ("PNG", "JPEG", "WEBP")
+PAYLOAD_COLORSPACES = ("rgb", "grayscale", "bilevel")
+
+# Named quality tiers for lossy formats
+QUALITY_TIERS: Dict[str, int] = {
+    "max": 95,
+    "high": 90,
+    "medium": 75,
+    "low": 60,
+}
+
+
+@dataclass
+class PayloadSettings:
+    """
+    How an image is encoded before being sent to the model.
+    
+    Attributes:
+        format: Image format (PNG, JPEG, WEBP)
+        colorspace: rgb, grayscale, or bilevel (1-bit, text-only scans)
+        quality: Lossy quality 1-100 or a tier name (max, high, medium, low)
+    """
+    format: str = "PNG"
+    colorspace: str = "rgb"
+    quality: Union[int, str] = "high"
+    
+    def __post_init__(self):
+        """Normalize and validate settings"""
+        self.format = self.format.upper()
+        if self.format == "JPG":
+            self.format = "JPEG"
+        self.colorspace = self.colorspace.lower()
+        
+        if self.format not in PAYLOAD_FORMATS:
+            raise ValueError(
+                f"Invalid payload format: {self.format}. "
+                f"Must be one of: {list(PAYLOAD_FORMATS)}"
+            )
+        
+        if self.colorspace not in PAYLOAD_COLORSPACES:
+            raise ValueError(
+                f"Invalid payload colorspace: {self.colorspace}. "
+                f"Must be one of: {list(PAYLOAD_COLORSPACES)}"
+            )
+        
+        if isinstance(self.quality, str) and self.quality not in QUALITY_TIERS:
+            raise ValueError(
+                f"Invalid quality tier: {self.quality}. "
+                f"Must be one of: {list(QUALITY_TIERS)}"
+            )
+        
+        if isinstance(self.quality, int) and not 1 <= self.quality <= 100:
+            raise ValueError(f"quality must be between 1 and 100, got {self.quality}")
+    
+    def get_quality(self) -> int:
+        """Resolve quality tier to a numeric quality"""
+        if isinstance(self.quality, str):
+            return QUALITY_TIERS[self.quality]
+        return self.quality
+    
+    def is_lossless(self) -> bool:
+        """True when the format keeps every pixel of the chosen colorspace"""
+        return self.format == "PNG"
+
+
+@dataclass
+class EncodedPayload:
+    """
+    Encoded image bytes plus the stats needed to compare settings.
+    
+    Attributes:
+        data: Encoded image bytes (sent to the model)
+        format: Image format used
+        colorspace: Colorspace used
+        quality: Numeric quality (None for lossless formats)
+        width: Image width
+        height: Image height
+        byte_size: Size of encoded bytes
+        source_bytes: Size of the source image file
+        encode_time: Seconds spent encoding
+        passthrough: True if source bytes were sent unchanged
+    """
+    data: bytes
+    format: str
+    colorspace: str
+    quality: Optional[int]
+    width: int
+    height: int
+    byte_size: int
+    source_bytes: int
+    encode_time: float
+    passthrough: bool = False
+    
+    def get_compression_ratio(self) -> float:
+        """Source size divided by encoded size"""
+        return self.source_bytes / self.byte_size if self.byte_size else 0.0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert to dictionary for metadata (without image bytes).
+        
+        Returns:
+            dict: Payload statistics
+        """
+        return {
+            'format': self.format,
+            'colorspace': self.colorspace,
+            'quality': self.quality,
+            'width': self.width,
+            'height': self.height,
+            'byte_size': self.byte_size,
+            'base64_size': 4 * ((self.byte_size + 2) // 3),
+            'source_bytes': self.source_bytes,
+            'encode_time': self.encode_time,
+            'passthrough': self.passthrough
+        }
+
+
+class PayloadEncoder:
+    """
+    Encodes images into request payloads.
+    
+    Vision model APIs (e.g. Ollama) base64-encode every image, adding ~33%
+    on top of the file size. Grayscale, bilevel and lossy encodings shrink
+    the payload before that overhead is applied.
+    """
+    
+    def __init__(self, settings: Optional[PayloadSettings] = None):
+        """
+        Initialize payload encoder.
+        
+        Args:
+            settings: Payload settings (None = lossless RGB PNG)
+        
+        Example:
+            >>> encoder = PayloadEncoder(PayloadSettings("JPEG", "grayscale", "medium"))
+            >>> payload = encoder.encode("page_001_ocr.png")
+            >>> print(payload.byte_size)
+            84213
+        """
+        self.settings = settings or PayloadSettings()
+    
+    def encode(self, image_path: str) -> EncodedPayload:
+        """
+        Encode an image file with the configured settings.
+        
+        Lossless RGB PNG sources are passed through without re-encoding.
+        
+        Args:
+            image_path: Path to image file
+        
+        Returns:
+            EncodedPayload: Encoded bytes and statistics
+        """
+        image_path = Path(image_path)
+        
+        if not image_path.exists():
+            raise FileNotFoundError(f"Image not found: {image_path}")
+        
+        start_time = time.time()
+        source_bytes = image_path.stat().st_size
+        
+        with Image.open(image_path) as img:
+            width, height = img.size
+            
+            # Already in the requested form - send as-is
+            if self._can_passthrough(img):
+                data = image_path.read_bytes()
+                return self._build_payload(
+                    data, width, height, source_bytes, start_time, passthrough=True
+                )
+            
+            converted = self._convert_colorspace(img)
+            data = self._encode_image(converted)
+        
+        return self._build_payload(data, width, height, source_bytes, start_time)
+    
+    def _can_passthrough(self, img: Image.Image) -> bool:
+        """Check if source bytes already match the requested encoding"""
+        if img.format != "PNG" or self.settings.format != "PNG":
+            return False
+        
+        expected_modes = {
+            "rgb": ("RGB",),
+            "grayscale": ("L",),
+            "bilevel": ("1",),
+        }
+        return img.mode in expected_modes[self.settings.colorspace]
+    
+    def _convert_colorspace(self, img: Image.Image) -> Image.Image:
+        """
+        Convert image to the configured colorspace.
+        
+        Args:
+            img: PIL Image
+        
+        Returns:
+            Image.Image: Converted image
+        """
+        colorspace = self.settings.colorspace
+        
+        if colorspace == "rgb":
+            return img.convert("RGB") if img.mode != "RGB" else img
+        
+        gray = img.convert("L") if img.mode != "L" else img
+        
+        if colorspace == "grayscale":
+            return gray
+        
+        # Bilevel: global Otsu threshold (no dithering, keeps glyph edges clean)
+        threshold = otsu_threshold(gray.histogram())
+        bilevel = gray.point(lambda value: 255 if value > threshold else 0, mode="1")
+        
+        # JPEG/WebP have no 1-bit mode
+        if self.settings.format != "PNG":
+            return bilevel.convert("L")
+        return bilevel
+    
+    def _encode_image(self, img: Image.Image) -> bytes:
+        """
+        Encode image to bytes in the configured format.
+        
+        Args:
+            img: PIL Image in target colorspace
+        
+        Returns:
+            bytes: Encoded image
+        """
+        buffer = io.BytesIO()
+        fmt = self.settings.format
+        
+        if fmt == "PNG":
+            img.save(buffer, format="PNG", optimize=False)
+        elif fmt == "JPEG":
+            img.save(buffer, format="JPEG", quality=self.settings.get_quality(), optimize=True)
+        else:
+            img.save(buffer, format="WEBP", quality=self.settings.get_quality(), method=4)
+        
+        return buffer.getvalue()
+    
+    def _build_payload(
+        self,
+        data: bytes,
+        width: int,
+        height: int,
+        source_bytes: int,
+        start_time: float,
+        passthrough: bool = False
+    ) -> EncodedPayload:
+        """Create payload record"""
+        return EncodedPayload(
+            data=data,
+            format=self.settings.format,
+            colorspace=self.settings.colorspace,
+            quality=None if self.settings.is_lossless() else self.settings.get_quality(),
+            width=width,
+            height=height,
+            byte_size=len(data),
+            source_bytes=source_bytes,
+            encode_time=time.time() - start_time,
+            passthrough=passthrough
+        )
+
+
+if __name__ == "__main__":
+    print("Testing payload_encoder.py...\n")
+    
+    import tempfile
+    from PIL import ImageDraw
+    
+    # Test 1: Create test page
+    print("Test 1: Create Test Page")
+    print("-" * 60)
+    temp_dir = Path(tempfile.mkdtemp())
+    test_image = temp_dir / "page.png"
+    
+    img = Image.new('RGB', (1024, 1024), color='white')
+    draw = ImageDraw.Draw(img)
+    for row in range(40):
+        draw.text((40, 20 + row * 24), "Sample document text line " * 3, fill='black')
+    img.save(test_image)
+    print(f"Created test image: {test_image} ({test_image.stat().st_size} bytes)")
+    
+    # Test 2: Compare encodings
+    print("\n" + "="*60)
+    print("Test 2: Compare Encodings")
+    print("-" * 60)
+    candidates = [
+        PayloadSettings("PNG", "rgb"),
+        PayloadSettings("PNG", "grayscale"),
+        PayloadSettings("PNG", "bilevel"),
+        PayloadSettings("JPEG", "grayscale", "high"),
+        PayloadSettings("WEBP", "grayscale", "medium"),
+    ]
+    for settings in candidates:
+        payload = PayloadEncoder(settings).encode(str(test_image))
+        print(
+            f"{settings.format:5s} {settings.colorspace:9s} "
+            f"q={str(payload.quality):4s} {payload.byte_size:8d} bytes "
+            f"({payload.encode_time * 1000:.1f} ms, passthrough={payload.passthrough})"
+        )
+    
+    # Test 3: Invalid settings
+    print("\n" + "="*60)
+    print("Test 3: Invalid Settings")
+    print("-" * 60)
+    try:
+        PayloadSettings("TIFF")
+        print("✗ Should have failed validation")
+    except ValueError as e:
+        print(f"✓ Validation caught error: {e}")
+    
+    # Cleanup
+    import shutil
+    shutil.rmtree(temp_dir)
+    
+    print("\n✅ payload_encoder.py tests passed!")
@@ -5,8 +5,10 @@ Supports multi-page PDFs and page extraction.
 """
 
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import List, Optional, Tuple, Iterator
+from queue import Queue
 import tempfile
+import threading
 
 try:
     import fitz  # PyMuPDF
@@ -151,21 +153,36 @@ class PDFProcessor:
         
         # Convert each page
         for page_num in range(start_page, end_page):
-            page = doc[page_num]
-            
-            # Render page to image
-            zoom = self.dpi / 72  # PyMuPDF uses 72 DPI base
-            mat = fitz.Matrix(zoom, zoom)
-            pix = page.get_pixmap(matrix=mat)
-            
-            # Save image
-            output_path = Path(output_dir) / f"page_{page_num + 1:03d}.png"
-            pix.save(str(output_path))
-            image_paths.append(str(output_path))
+            image_paths.append(self._render_page_pymupdf(doc, page_num, output_dir))
         
         doc.close()
         return image_paths
     
+    def _render_page_pymupdf(self, doc, page_num: int, output_dir: str) -> str:
+        """
+        Render one page of an open PyMuPDF document to PNG.
+        
+        Args:
+            doc: Open fitz document
+            page_num: Page index (0-indexed)
+            output_dir: Directory to save the image
+            
+        Returns:
+            str: Path to rendered image
+        """
+        page = doc[page_num]
+        
+        # Render page to image
+        zoom = self.dpi / 72  # PyMuPDF uses 72 DPI base
+        mat = fitz.Matrix(zoom, zoom)
+        pix = page.get_pixmap(matrix=mat)
+        
+        # Save image
+        output_path = Path(output_dir) / f"page_{page_num + 1:03d}.png"
+        pix.save(str(output_path))
+        
+        return str(output_path)
+    
     def _pdf_to_images_pdf2image(
         self,
         pdf_path: Path,
@@ -202,6 +219,176 @@ class PDFProcessor:
         
         return image_paths
     
+    def iter_pages(
+        self,
+        pdf_path: str,
+        output_dir: Optional[str] = None,
+        page_range: Optional[Tuple[int, int]] = None,
+        lookahead: int = 2,
+        chunk_size: int = 4
+    ) -> Iterator[Tuple[int, str]]:
+        """
+        Lazily render PDF pages to images.
+        
+        Pages are rendered on demand by a background thread that stays at
+        most `lookahead` pages ahead of the consumer, so huge PDFs never
+        have every page on disk or in memory before OCR starts. With
+        pdf2image, pages are converted in `first_page`/`last_page` chunks of
+        `chunk_size` pages instead of loading the whole document.
+        
+        Args:
+            pdf_path: Path to PDF file
+            output_dir: Directory to save images (None = temp dir)
+            page_range: Optional (start, end) page numbers (1-indexed)
+            lookahead: Pages rendered ahead of the consumer (0 = render inline)
+            chunk_size: Pages per pdf2image conversion call
+            
+        Yields:
+            Tuple[int, str]: (page_number, image_path), page numbers 1-indexed
+            
+        Example:
+            >>> processor = PDFProcessor()
+            >>> for page_number, image_path in processor.iter_pages("big.pdf", "out/pages"):
+            ...     run_ocr(image_path)
+        """
+        pdf_path = Path(pdf_path)
+        
+        if not pdf_path.exists():
+            raise FileNotFoundError(f"PDF not found: {pdf_path}")
+        
+        # Create output directory
+        if output_dir is None:
+            output_dir = tempfile.mkdtemp(prefix="pdf_pages_")
+        else:
+            Path(output_dir).mkdir(parents=True, exist_ok=True)
+        
+        first_page, last_page = self._resolve_page_range(str(pdf_path), page_range)
+        
+        # Pick rendering backend
+        if self.use_pymupdf and PYMUPDF_AVAILABLE:
+            renderer = self._iter_pages_pymupdf(pdf_path, output_dir, first_page, last_page)
+        elif PDF2IMAGE_AVAILABLE:
+            renderer = self._iter_pages_pdf2image(
+                pdf_path, output_dir, first_page, last_page, max(1, chunk_size)
+            )
+        else:
+            raise RuntimeError("No PDF library available")
+        
+        if lookahead <= 0:
+            yield from renderer
+        else:
+            yield from self._prefetch(renderer, lookahead)
+    
+    def _resolve_page_range(
+        self,
+        pdf_path: str,
+        page_range: Optional[Tuple[int, int]]
+    ) -> Tuple[int, int]:
+        """Clamp an optional (start, end) range to the document (1-indexed, inclusive)"""
+        page_count = self.get_page_count(pdf_path)
+        
+        if not page_range:
+            return 1, page_count
+        
+        return max(1, page_range[0]), min(page_count, page_range[1])
+    
+    def _iter_pages_pymupdf(
+        self,
+        pdf_path: Path,
+        output_dir: str,
+        first_page: int,
+        last_page: int
+    ) -> Iterator[Tuple[int, str]]:
+        """Render pages one at a time using PyMuPDF"""
+        doc = fitz.open(str(pdf_path))
+        try:
+            for page_num in range(first_page - 1, last_page):
+                yield page_num + 1, self._render_page_pymupdf(doc, page_num, output_dir)
+        finally:
+            doc.close()
+    
+    def _iter_pages_pdf2image(
+        self,
+        pdf_path: Path,
+        output_dir: str,
+        first_page: int,
+        last_page: int,
+        chunk_size: int
+    ) -> Iterator[Tuple[int, str]]:
+        """Render pages in bounded chunks using pdf2image"""
+        for chunk_start in range(first_page, last_page + 1, chunk_size):
+            chunk_end = min(last_page, chunk_start + chunk_size - 1)
+            
+            images = convert_from_path(
+                str(pdf_path),
+                dpi=self.dpi,
+                first_page=chunk_start,
+                last_page=chunk_end
+            )
+            
+            for offset, image in enumerate(images):
+                page_num = chunk_start + offset
+                output_path = Path(output_dir) / f"page_{page_num:03d}.png"
+                image.save(str(output_path), 'PNG')
+                image.close()
+                yield page_num, str(output_path)
+            
+            # Release the chunk before converting the next one
+            del images
+    
+    @staticmethod
+    def _prefetch(
+        renderer: Iterator[Tuple[int, str]],
+        lookahead: int
+    ) -> Iterator[Tuple[int, str]]:
+        """
+        Run a page renderer in a background thread, at most `lookahead` pages ahead.
+        
+        The producer takes a slot before rendering each page and the
+        consumer frees it when it receives the page, so no more than
+        `lookahead` rendered pages wait beyond the one being consumed. The
+        producer stops early if the consumer abandons the generator.
+        """
+        pages: Queue = Queue()
+        slots = threading.Semaphore(lookahead)
+        stop = threading.Event()
+        done = object()
+        
+        def acquire() -> bool:
+            while not stop.is_set():
+                if slots.acquire(timeout=0.1):
+                    return True
+            return False
+        
+        def produce():
+            try:
+                while acquire():
+                    item = next(renderer, done)
+                    if item is done:
+                        break
+                    pages.put(item)
+            except Exception as e:
+                pages.put(e)
+            finally:
+                renderer.close()
+                pages.put(done)
+        
+        worker = threading.Thread(target=produce, name="pdf-page-renderer", daemon=True)
+        worker.start()
+        
+        try:
+            while True:
+                item = pages.get()
+                if item is done:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                slots.release()
+                yield item
+        finally:
+            stop.set()
+            worker.join()
+    
     def extract_single_page(
         self,
         pdf_path: str,
@@ -308,5 +495,8 @@ if __name__ == "__main__":
         print('  processor = PDFProcessor()')
         print('  images = processor.pdf_to_images("your_file.pdf", "output_dir")')
         print('  print(f"Converted {len(images)} pages")')
+        print('\nTo render huge PDFs lazily, run:')
+        print('  for page_number, image in processor.iter_pages("big.pdf", "output_dir"):')
+        print('      ...')
     
     print("\n✅ pdf_processor.py tests passed!")
\ No newline at end of file
@@ -5,8 +5,71 @@ Manages output directory creation and file saving.
 
 from .directory_builder import DirectoryBuilder
 from .output_manager import OutputManager
+from .background_writer import BackgroundWriter, WriteError
+from .document_store import DocumentStore
+from .combined_writer import CombinedWriter
+from .blob_store import BlobStore
+from .storage_governor import StorageGovernor, StorageBudgetError, classify_path
+from .columnar_export import (
+    ColumnarAppender,
+    document_columns,
+    export_corpus,
+    list_columnar_formats,
+    PYARROW_AVAILABLE,
+)
+from .compression import (
+    Codec,
+    GzipCodec,
+    ZstdCodec,
+    get_codec,
+    codec_for_path,
+    find_artifact,
+    read_artifact,
+    list_codecs,
+    ZSTD_AVAILABLE,
+)
+from .serializers import (
+    Serializer,
+    JsonSerializer,
+    MsgpackSerializer,
+    get_serializer,
+    serializer_for_path,
+    list_serializers,
+    ORJSON_AVAILABLE,
+    MSGPACK_AVAILABLE,
+)
 
 __all__ = [
     'DirectoryBuilder',
     'OutputManager',
+    'BackgroundWriter',
+    'WriteError',
+    'DocumentStore',
+    'CombinedWriter',
+    'BlobStore',
+    'StorageGovernor',
+    'StorageBudgetError',
+    'classify_path',
+    'ColumnarAppender',
+    'document_columns',
+    'export_corpus',
+    'list_columnar_formats',
+    'PYARROW_AVAILABLE',
+    'Codec',
+    'GzipCodec',
+    'ZstdCodec',
+    'get_codec',
+    'codec_for_path',
+    'find_artifact',
+    'read_artifact',
+    'list_codecs',
+    'ZSTD_AVAILABLE',
+    'Serializer',
+    'JsonSerializer',
+    'MsgpackSerializer',
+    'get_serializer',
+    'serializer_for_path',
+    'list_serializers',
+    'ORJSON_AVAILABLE',
+    'MSGPACK_AVAILABLE',
 ]
\ No newline at end of file
@@ -0,0 +1,191 @@
+"""
+Background Writer Module
+Runs output writes on a worker thread behind a bounded queue.
+Lets extraction continue while the previous page is persisted.
+"""
+
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Dict, Any
+import queue
+import threading
+import time
+
+
+@dataclass
+class WriteError:
+    """
+    A write that failed on the background thread.
+    
+    Attributes:
+        label: Description of the write (e.g. "page 3")
+        error: Exception raised by the write
+    """
+    label: str
+    error: Exception
+    
+    def __str__(self) -> str:
+        return f"{self.label}: {type(self.error).__name__}: {self.error}"
+
+
+class BackgroundWriter:
+    """
+    Single worker thread that executes write tasks in submission order.
+    
+    submit() returns as soon as the task is queued; it blocks only when
+    max_pending tasks are already waiting, which bounds the memory held
+    by unwritten results. Exceptions raised by tasks are collected and
+    returned by flush()/close() instead of being lost on the thread.
+    
+    Writes are file I/O, which releases the GIL, so a thread is enough;
+    tasks share the caller's objects and must not be mutated until flushed.
+    
+    Example:
+        >>> writer = BackgroundWriter(max_pending=4)
+        >>> writer.submit(save_page, result, page_dir, label="page 1")
+        >>> errors = writer.flush()  # Wait for all queued writes
+        >>> writer.close()
+    """
+    
+    def __init__(self, max_pending: int = 8, name: str = "output-writer"):
+        """
+        Initialize writer (the thread starts on first submit).
+        
+        Args:
+            max_pending: Queued tasks before submit() blocks
+            name: Worker thread name
+        """
+        if max_pending < 1:
+            raise ValueError("max_pending must be at least 1")
+        
+        self.max_pending = max_pending
+        self.name = name
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._errors: List[WriteError] = []
+        self._closed = False
+        self.stats: Dict[str, Any] = {'submitted': 0, 'written': 0, 'failed': 0, 'blocked_time': 0.0}
+    
+    def submit(self, func: Callable, *args, label: Optional[str] = None, **kwargs):
+        """
+        Queue a write task.
+        
+        Args:
+            func: Callable performing the write
+            *args: Positional arguments for func
+            label: Description used in error reports (defaults to func name)
+            **kwargs: Keyword arguments for func
+        
+        Raises:
+            RuntimeError: If the writer was closed
+        """
+        if self._closed:
+            raise RuntimeError("BackgroundWriter is closed")
+        self._ensure_started()
+        
+        start_time = time.perf_counter()
+        self._queue.put((label or getattr(func, '__name__', 'write'), func, args, kwargs))
+        self.stats['blocked_time'] += time.perf_counter() - start_time
+        self.stats['submitted'] += 1
+    
+    def flush(self) -> List[WriteError]:
+        """
+        Wait until every queued task has run.
+        
+        Returns:
+            List[WriteError]: Failures since the previous flush
+        """
+        if self._thread is not None:
+            self._queue.join()
+        
+        with self._lock:
+            errors, self._errors = self._errors, []
+        return errors
+    
+    def close(self) -> List[WriteError]:
+        """
+        Flush and stop the worker thread.
+        
+        Returns:
+            List[WriteError]: Failures since the previous flush
+        """
+        errors = self.flush()
+        if self._thread is not None and not self._closed:
+            self._queue.put(None)
+            self._thread.join()
+        self._closed = True
+        return errors
+    
+    def pending(self) -> int:
+        """Number of tasks queued but not yet finished (approximate)"""
+        return self._queue.unfinished_tasks
+    
+    def _ensure_started(self):
+        """Start the worker thread if needed"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+    
+    def _run(self):
+        """Worker loop: run tasks until the None sentinel"""
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                label, func, args, kwargs = item
+                try:
+                    func(*args, **kwargs)
+                except Exception as e:
+                    with self._lock:
+                        self._errors.append(WriteError(label, e))
+                    self.stats['failed'] += 1
+                else:
+                    self.stats['written'] += 1
+            finally:
+                self._queue.task_done()
+    
+    def __enter__(self) -> 'BackgroundWriter':
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+if __name__ == "__main__":
+    print("Testing background_writer.py...\n")
+    
+    import tempfile
+    from pathlib import Path
+    
+    temp_dir = Path(tempfile.mkdtemp())
+    
+    def slow_write(path: Path, text: str):
+        time.sleep(0.02)
+        path.write_text(text, encoding='utf-8')
+    
+    # Test 1: Writes overlap with the caller
+    print("Test 1: Asynchronous Writes")
+    print("-" * 60)
+    with BackgroundWriter(max_pending=4) as writer:
+        start_time = time.perf_counter()
+        for i in range(10):
+            writer.submit(slow_write, temp_dir / f"file_{i}.txt", f"content {i}", label=f"file {i}")
+        submit_time = time.perf_counter() - start_time
+        errors = writer.flush()
+        total_time = time.perf_counter() - start_time
+    print(f"Submitted 10 writes in {submit_time * 1000:.0f} ms, flushed after {total_time * 1000:.0f} ms")
+    print(f"Stats: {writer.stats['written']} written, blocked {writer.stats['blocked_time'] * 1000:.0f} ms")
+    print(f"Files: {len(list(temp_dir.glob('file_*.txt')))}, errors: {errors}")
+    
+    # Test 2: Failures are reported on flush
+    print("\n" + "="*60)
+    print("Test 2: Error Reporting")
+    print("-" * 60)
+    writer = BackgroundWriter()
+    writer.submit(slow_write, temp_dir / "missing" / "file.txt", "x", label="page 7")
+    writer.submit(slow_write, temp_dir / "ok.txt", "x", label="page 8")
+    for error in writer.close():
+        print(f"✓ Caught: {error}")
+    
+    print("\n✅ background_writer.py tests passed!")
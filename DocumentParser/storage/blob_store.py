@@ -0,0 +1,201 @@
+"""
+Blob Store Module
+Content-addressed storage for page images shared by all documents of a run.
+Each distinct image is stored once; page folders hardlink to it or list it in a manifest.
+"""
+
+from pathlib import Path
+from typing import Dict, Optional, Set, Union
+import hashlib
+import os
+import shutil
+import threading
+import uuid
+
+
+class BlobStore:
+    """
+    Directory of files named by the SHA-256 of their content.
+    
+    Blobs live at <root>/<first 2 hex digits>/<digest><extension>.
+    put() stores a file once no matter how many pages or documents add
+    it; link() materializes a blob at a page path as a hardlink (no extra
+    space), falling back to a copy where hardlinks are unsupported
+    (e.g. across filesystems).
+    
+    Example:
+        >>> blobs = BlobStore("output/blobs")
+        >>> digest = blobs.put("output/manual/temp_pages/page_001.png", move=True)
+        >>> blobs.link(digest, "output/manual/pages/page_001/page_001_original.png")
+        'hardlink'
+        >>> blobs.path(digest)
+        PosixPath('output/blobs/3f/3f9a...c1.png')
+    """
+    
+    def __init__(self, root: Union[str, Path]):
+        """
+        Initialize store.
+        
+        Args:
+            root: Blob directory (created if missing)
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.stats = {'stored': 0, 'deduplicated': 0, 'bytes_saved': 0, 'hardlinks': 0, 'copies': 0}
+    
+    @staticmethod
+    def hash_file(path: Union[str, Path], chunk_size: int = 1 << 20) -> str:
+        """SHA-256 hex digest of a file, read in chunks"""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+    
+    def path(self, digest: str, extension: str = ".png") -> Path:
+        """Location of a blob (whether or not it exists)"""
+        return self.root / digest[:2] / f"{digest}{extension}"
+    
+    def put(self, source: Union[str, Path], move: bool = False) -> str:
+        """
+        Add a file to the store.
+        
+        Args:
+            source: File to add
+            move: Remove source afterwards (it is renamed into the store when new)
+        
+        Returns:
+            str: Content digest (the file extension is kept on the blob)
+        """
+        source = Path(source)
+        digest = self.hash_file(source)
+        target = self.path(digest, source.suffix)
+        
+        with self._lock:
+            if target.exists():
+                self.stats['deduplicated'] += 1
+                self.stats['bytes_saved'] += target.stat().st_size
+                if move:
+                    source.unlink()
+                return digest
+            
+            target.parent.mkdir(parents=True, exist_ok=True)
+            # Write under a temporary name so a crash never leaves a partial blob
+            temporary = target.with_name(f".{uuid.uuid4().hex}.tmp")
+            try:
+                if move:
+                    shutil.move(str(source), str(temporary))
+                else:
+                    shutil.copyfile(source, temporary)
+                os.replace(temporary, target)
+            finally:
+                if temporary.exists():
+                    temporary.unlink()
+            self.stats['stored'] += 1
+        
+        return digest
+    
+    def link(self, digest: str, destination: Union[str, Path], extension: str = ".png") -> str:
+        """
+        Materialize a blob at destination.
+        
+        Args:
+            digest: Blob digest from put()
+            destination: File path to create (replaced if present)
+            extension: Blob file extension
+        
+        Returns:
+            str: "hardlink" or "copy"
+        
+        Raises:
+            FileNotFoundError: If the blob does not exist
+        """
+        blob = self.path(digest, extension)
+        if not blob.exists():
+            raise FileNotFoundError(f"Blob not found: {digest}")
+        
+        destination = Path(destination)
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        if destination.exists():
+            destination.unlink()
+        
+        try:
+            os.link(blob, destination)
+            self.stats['hardlinks'] += 1
+            return "hardlink"
+        except OSError:
+            shutil.copyfile(blob, destination)
+            self.stats['copies'] += 1
+            return "copy"
+    
+    def exists(self, digest: str, extension: str = ".png") -> bool:
+        return self.path(digest, extension).exists()
+    
+    def size(self) -> int:
+        """Total bytes stored"""
+        return sum(path.stat().st_size for path in self.root.rglob('*') if path.is_file())
+    
+    def collect_garbage(self, referenced: Optional[Set[str]] = None) -> Dict[str, int]:
+        """
+        Remove blobs nothing refers to any more.
+        
+        A blob is kept if its digest is in referenced, or if it still has
+        hardlinks outside the store.
+        
+        Args:
+            referenced: Digests listed in manifests (None = rely on link counts only)
+        
+        Returns:
+            Dict[str, int]: Removed blob count and bytes
+        """
+        referenced = referenced or set()
+        removed = {'blobs': 0, 'bytes': 0}
+        with self._lock:
+            for blob in self.root.glob('*/*'):
+                if not blob.is_file() or blob.name.startswith('.'):
+                    continue
+                status = blob.stat()
+                if blob.stem in referenced or status.st_nlink > 1:
+                    continue
+                blob.unlink()
+                removed['blobs'] += 1
+                removed['bytes'] += status.st_size
+        return removed
+
+
+if __name__ == "__main__":
+    print("Testing blob_store.py...\n")
+    
+    import tempfile
+    
+    temp_dir = Path(tempfile.mkdtemp())
+    blobs = BlobStore(temp_dir / "blobs")
+    
+    # Test 1: Same page image from two documents
+    print("Test 1: Deduplicate")
+    print("-" * 60)
+    image = os.urandom(200_000)
+    for document in ["manual_v1", "manual_v2"]:
+        render = temp_dir / document / "temp_pages" / "page_001.png"
+        render.parent.mkdir(parents=True)
+        render.write_bytes(image)
+        digest = blobs.put(render, move=True)
+        how = blobs.link(digest, temp_dir / document / "pages" / "page_001" / "page_001_original.png")
+        print(f"{document}: {digest[:12]}... via {how}, render left: {render.exists()}")
+    print(f"Stats: {blobs.stats}")
+    print(f"Blob bytes: {blobs.size()} for 2 page files")
+    
+    # Test 2: Garbage collection
+    print("\n" + "="*60)
+    print("Test 2: Collect Garbage")
+    print("-" * 60)
+    orphan = temp_dir / "orphan.png"
+    orphan.write_bytes(b"unused")
+    blobs.put(orphan)
+    print(f"Removed: {blobs.collect_garbage()}")
+    shutil.rmtree(temp_dir / "manual_v1")
+    shutil.rmtree(temp_dir / "manual_v2")
+    print(f"After deleting both documents: {blobs.collect_garbage()}")
+    
+    print("\n✅ blob_store.py tests passed!")
@@ -0,0 +1,495 @@
+"""
+Columnar Export Module
+Writes elements and page statistics of many documents to partitioned Parquet/Arrow files.
+One row per element and one per page, so corpus-wide questions become a single query.
+"""
+
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Union
+from urllib.parse import quote
+import shutil
+import numpy as np
+
+from ..parsers import ElementTable
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+    import pyarrow.feather as feather
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+COLUMNAR_FORMATS = {"parquet": ".parquet", "arrow": ".arrow"}
+
+# Column name -> Arrow type name (see _arrow_schema)
+ELEMENT_COLUMNS = {
+    'document': "string",
+    'input_file': "string",
+    'model': "string",
+    'page_number': "int32",
+    'element_id': "int32",
+    'element_type': "dictionary",
+    'x1': "int32",
+    'y1': "int32",
+    'x2': "int32",
+    'y2': "int32",
+    'content_length': "int32",
+    'confidence': "float32",
+}
+
+PAGE_COLUMNS = {
+    'document': "string",
+    'input_file': "string",
+    'model': "string",
+    'page_number': "int32",
+    'success': "bool",
+    'element_count': "int32",
+    'table_count': "int32",
+    'image_count': "int32",
+    'text_count': "int32",
+    'content_length': "int64",
+    'raw_output_length': "int64",
+    'processing_time': "float64",
+    'document_processing_time': "float64",
+}
+
+
+def document_columns(result) -> Dict[str, Dict[str, Any]]:
+    """
+    Element and page rows of a document as column arrays.
+    
+    Pages are read once each, so lazily loaded results stay lazy.
+    
+    Args:
+        result: DocumentResult (fresh or from DocumentResult.load)
+    
+    Returns:
+        Dict[str, Dict[str, Any]]: {'elements': columns, 'pages': columns},
+            each a column name -> list or NumPy array mapping
+    
+    Example:
+        >>> columns = document_columns(result)
+        >>> columns['pages']['table_count']
+        [0, 2, 1]
+    """
+    document = Path(result.output_dir).name if result.output_dir else Path(result.input_file).stem
+    tables = []
+    models = []
+    pages = {name: [] for name in PAGE_COLUMNS}
+    
+    for page_result in result.page_results:
+        extraction = page_result.extraction_result
+        table = ElementTable.from_elements(
+            extraction.get_elements(), page_number=page_result.page_number
+        )
+        counts = table.count_by_type()
+        tables.append(table)
+        models.append((extraction.model_name, len(table)))
+        
+        pages['model'].append(extraction.model_name)
+        pages['page_number'].append(page_result.page_number)
+        pages['success'].append(extraction.success)
+        pages['element_count'].append(len(table))
+        pages['table_count'].append(counts.get('table', 0))
+        pages['image_count'].append(counts.get('image', 0))
+        pages['text_count'].append(counts.get('text', 0))
+        pages['content_length'].append(len(table.content_buffer))
+        pages['raw_output_length'].append(len(extraction.raw_output or ""))
+        pages['processing_time'].append(extraction.processing_time)
+    
+    page_count = len(pages['page_number'])
+    pages['document'] = [document] * page_count
+    pages['input_file'] = [result.input_file] * page_count
+    pages['document_processing_time'] = [result.total_processing_time] * page_count
+    
+    elements_table = ElementTable.concatenate(tables)
+    element_count = len(elements_table)
+    elements = {
+        'document': [document] * element_count,
+        'input_file': [result.input_file] * element_count,
+        'model': [model for model, count in models for _ in range(count)],
+        'page_number': elements_table.page_numbers,
+        'element_id': elements_table.element_ids,
+        # Type codes and names become an Arrow dictionary column
+        'element_type': (elements_table.type_codes, elements_table.type_names),
+        'x1': elements_table.bboxes[:, 0],
+        'y1': elements_table.bboxes[:, 1],
+        'x2': elements_table.bboxes[:, 2],
+        'y2': elements_table.bboxes[:, 3],
+        'content_length': elements_table.content_lengths().astype(np.int32),
+        'confidence': elements_table.confidences,
+    }
+    return {'elements': elements, 'pages': pages}
+
+
+class ColumnarAppender:
+    """
+    Incremental writer of the elements and pages datasets.
+    
+    Each appended document becomes one file per dataset and model,
+    partitioned Hive-style by model (the model column is stored in the
+    directory name, not in the files):
+        
+        analytics/
+          elements/model=deepseek-ocr%3A3b/<document>.parquet
+          pages/model=deepseek-ocr%3A3b/<document>.parquet
+    
+    Files are named after the document output folder, so processing a
+    document again replaces its rows instead of duplicating them, and a
+    crashed batch keeps every document finished before the crash. Read
+    the datasets with pyarrow.dataset (partitioning="hive"), DuckDB,
+    Spark or pandas; for large corpora, export_corpus() writes fewer,
+    larger files.
+    
+    Example:
+        >>> appender = ColumnarAppender("output/analytics")
+        >>> for file_path in files:
+        ...     appender.append_document(processor.process_document(file_path))
+        >>> import pyarrow.dataset as ds
+        >>> pages = ds.dataset("output/analytics/pages", partitioning="hive").to_table()
+    """
+    
+    def __init__(self, root: Union[str, Path], file_format: str = "parquet", compression: str = "zstd"):
+        """
+        Initialize appender.
+        
+        Args:
+            root: Dataset directory (elements/ and pages/ are created below it)
+            file_format: "parquet" or "arrow" (Arrow IPC / Feather v2)
+            compression: Parquet/Arrow compression ("zstd", "lz4", "snappy" or "none")
+        
+        Raises:
+            ValueError: If file_format is unknown
+            ImportError: If pyarrow is not installed
+        """
+        if file_format not in COLUMNAR_FORMATS:
+            raise ValueError(f"Unknown columnar format: {file_format}. Must be one of: {list(COLUMNAR_FORMATS)}")
+        if not PYARROW_AVAILABLE:
+            raise ImportError("Columnar export requires pyarrow. Install: pip install pyarrow")
+        
+        self.root = Path(root)
+        self.file_format = file_format
+        self.compression = compression
+        self.schemas = {'elements': _arrow_schema(ELEMENT_COLUMNS), 'pages': _arrow_schema(PAGE_COLUMNS)}
+        self.stats = {'documents': 0, 'elements': 0, 'pages': 0}
+    
+    def append_document(self, result) -> List[Path]:
+        """
+        Write (or replace) a document's element and page rows.
+        
+        Args:
+            result: DocumentResult
+        
+        Returns:
+            List[Path]: Files written
+        """
+        columns = document_columns(result)
+        document = columns['pages']['document'][0] if columns['pages']['document'] else None
+        if document is None:
+            return []
+        
+        written = []
+        for dataset, dataset_columns in columns.items():
+            table = _to_arrow(dataset_columns, self.schemas[dataset])
+            # Drop the document's files from earlier runs (possibly under another model)
+            for stale in (self.root / dataset).glob(f"model=*/{_file_stem(document)}.*"):
+                stale.unlink()
+            for model in sorted(set(dataset_columns['model'])):
+                written.append(self._write_partition(table, dataset, model, _file_stem(document)))
+            self.stats[dataset] += len(table)
+        self.stats['documents'] += 1
+        return written
+    
+    def write_table(self, dataset: str, columns: Dict[str, Any], name: str) -> List[Path]:
+        """
+        Write arbitrary rows of a dataset, split into model partitions.
+        
+        Args:
+            dataset: "elements" or "pages"
+            columns: Column arrays as returned by document_columns()
+            name: File name stem within each partition
+        
+        Returns:
+            List[Path]: Files written
+        """
+        table = _to_arrow(columns, self.schemas[dataset])
+        written = [self._write_partition(table, dataset, model, name) for model in sorted(set(columns['model']))]
+        self.stats[dataset] += len(table)
+        return written
+    
+    def partition_dir(self, dataset: str, model: str) -> Path:
+        """Directory of a model partition (the value is URI-encoded, as Hive partitioning expects)"""
+        return self.root / dataset / f"model={quote(model or 'unknown', safe='')}"
+    
+    def _write_partition(self, table: 'pa.Table', dataset: str, model: str, name: str) -> Path:
+        """Write the rows of one model; the model column lives in the directory name only"""
+        part = table.filter(pc.equal(table['model'], model))
+        part = part.remove_column(part.schema.get_field_index('model'))
+        path = self.partition_dir(dataset, model) / (name + COLUMNAR_FORMATS[self.file_format])
+        self._write(part, path)
+        return path
+    
+    def _write(self, table: 'pa.Table', path: Path):
+        """Write a table to a temporary file and rename it into place"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_name(f".{path.name}.tmp")
+        compression = None if self.compression == "none" else self.compression
+        if self.file_format == "parquet":
+            pq.write_table(table, temporary, compression=compression or "none")
+        else:
+            feather.write_feather(table, temporary, compression=compression or "uncompressed")
+        temporary.replace(path)
+
+
+def export_corpus(
+    output_base_dir: Union[str, Path],
+    destination: Optional[Union[str, Path]] = None,
+    file_format: str = "parquet",
+    output_config=None,
+    rows_per_file: int = 1_000_000
+) -> Dict[str, int]:
+    """
+    Export every document under an output directory in one pass.
+    
+    Documents are reopened lazily (DocumentResult.load), so memory stays
+    bounded by one page plus the rows waiting to be written. Rows are
+    written in files of about rows_per_file rows per partition.
+    
+    The export is built in a staging folder and then replaces the
+    elements/ and pages/ datasets under destination, including the
+    per-document files ColumnarAppender wrote there during runs, so no
+    document is counted twice.
+    
+    Args:
+        output_base_dir: Directory holding document output folders
+        destination: Dataset directory (None = <output_base_dir>/<columnar_subfolder>)
+        file_format: "parquet" or "arrow"
+        output_config: Output configuration of the runs (None = defaults)
+        rows_per_file: Element rows buffered before a file is written
+    
+    Returns:
+        Dict[str, int]: Documents, elements and pages exported, and documents skipped
+    
+    Example:
+        >>> export_corpus("output")
+        {'documents': 12034, 'elements': 4810233, 'pages': 251877, 'skipped': 3}
+    """
+    from ..config import get_default_output_config
+    from ..extractors.result_loader import load_document_result
+    
+    config = output_config or get_default_output_config()
+    output_base_dir = Path(output_base_dir)
+    destination = Path(destination) if destination else output_base_dir / config.columnar_subfolder
+    staging = destination / ".export"
+    if staging.exists():
+        shutil.rmtree(staging)
+    appender = ColumnarAppender(staging, file_format=file_format)
+    
+    pending: Dict[str, List[Dict[str, Any]]] = {'elements': [], 'pages': []}
+    pending_rows = 0
+    part = 0
+    skipped = 0
+    documents = 0
+    excluded = {destination.resolve(), (output_base_dir / config.blob_subfolder).resolve()}
+    
+    def flush():
+        nonlocal part, pending_rows
+        for dataset, chunks in pending.items():
+            if chunks:
+                appender.write_table(dataset, _concat_columns(chunks), f"part-{part:05d}")
+        pending['elements'], pending['pages'] = [], []
+        pending_rows = 0
+        part += 1
+    
+    for document_dir in sorted(path for path in output_base_dir.iterdir() if path.is_dir()):
+        if document_dir.resolve() in excluded:
+            continue
+        try:
+            result = load_document_result(document_dir, lazy=True, output_config=config)
+        except FileNotFoundError:
+            skipped += 1
+            continue
+        try:
+            columns = document_columns(result)
+        finally:
+            result.close()
+        
+        pending['elements'].append(columns['elements'])
+        pending['pages'].append(columns['pages'])
+        pending_rows += len(columns['elements']['document'])
+        documents += 1
+        if pending_rows >= rows_per_file:
+            flush()
+    
+    flush()
+    
+    # Swap the finished export in for the existing datasets
+    for dataset in appender.schemas:
+        target = destination / dataset
+        if target.exists():
+            shutil.rmtree(target)
+        if (staging / dataset).exists():
+            (staging / dataset).replace(target)
+    shutil.rmtree(staging, ignore_errors=True)
+    
+    print(f"  ✓ Exported {documents} documents to {destination}")
+    return {
+        'documents': documents,
+        'elements': appender.stats['elements'],
+        'pages': appender.stats['pages'],
+        'skipped': skipped
+    }
+
+
+def list_columnar_formats() -> Dict[str, bool]:
+    """Formats and whether each can be written here"""
+    return {name: PYARROW_AVAILABLE for name in COLUMNAR_FORMATS}
+
+
+def _file_stem(document: str) -> str:
+    return quote(document, safe='')
+
+
+def _concat_columns(chunks: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Concatenate column dicts of several documents"""
+    columns = {}
+    for name in chunks[0]:
+        values = [chunk[name] for chunk in chunks]
+        if isinstance(values[0], tuple):
+            # Dictionary column: re-intern codes into a shared vocabulary
+            names: Dict[str, int] = {}
+            codes = [
+                np.array([names.setdefault(type_name, len(names)) for type_name in type_names], dtype=np.int16)[type_codes]
+                if len(type_codes) else np.asarray(type_codes, dtype=np.int16)
+                for type_codes, type_names in values
+            ]
+            columns[name] = (np.concatenate(codes), list(names))
+        elif isinstance(values[0], np.ndarray):
+            columns[name] = np.concatenate(values)
+        else:
+            columns[name] = [value for chunk in values for value in chunk]
+    return columns
+
+
+def _arrow_schema(columns: Dict[str, str]) -> 'pa.Schema':
+    types = {
+        "string": pa.string(),
+        "dictionary": pa.dictionary(pa.int16(), pa.string()),
+        "int32": pa.int32(),
+        "int64": pa.int64(),
+        "float32": pa.float32(),
+        "float64": pa.float64(),
+        "bool": pa.bool_(),
+    }
+    return pa.schema([(name, types[type_name]) for name, type_name in columns.items()])
+
+
+def _to_arrow(columns: Dict[str, Any], schema: 'pa.Schema') -> 'pa.Table':
+    """Arrow table from document_columns() output"""
+    arrays = []
+    for field in schema:
+        values = columns[field.name]
+        if isinstance(values, tuple):
+            type_codes, type_names = values
+            arrays.append(pa.DictionaryArray.from_arrays(
+                pa.array(type_codes, type=pa.int16()), pa.array(type_names, type=pa.string())
+            ))
+        elif field.type == pa.float32():
+            # NaN confidence means "no confidence"
+            values = np.asarray(values, dtype=np.float32)
+            arrays.append(pa.array(values, type=field.type, mask=np.isnan(values)))
+        else:
+            arrays.append(pa.array(values, type=field.type))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+if __name__ == "__main__":
+    print("Testing columnar_export.py...\n")
+    
+    from types import SimpleNamespace
+    from ..parsers import ParsedElement
+    
+    def page(number: int, types: List[str]):
+        elements = [
+            ParsedElement(element_id=i + 1, element_type=element_type, bbox=[10, 20 * i, 500, 20 * i + 15], content=f"{element_type} {i}")
+            for i, element_type in enumerate(types)
+        ]
+        extraction = SimpleNamespace(
+            get_elements=lambda: elements, model_name="deepseek-ocr:3b",
+            success=True, raw_output="x" * 100, processing_time=1.5
+        )
+        return SimpleNamespace(page_number=number, extraction_result=extraction)
+    
+    result = SimpleNamespace(
+        input_file="manual.pdf", output_dir="output/manual", total_processing_time=3.0,
+        page_results=[page(1, ["title", "text", "text"]), page(2, ["table", "text"])]
+    )
+    
+    # Test 1: Rows
+    print("Test 1: Document Columns")
+    print("-" * 60)
+    columns = document_columns(result)
+    print(f"Pages: {columns['pages']['page_number']}, tables: {columns['pages']['table_count']}")
+    type_codes, type_names = columns['elements']['element_type']
+    print(f"Elements: {len(columns['elements']['document'])}, types: {[type_names[code] for code in type_codes]}")
+    print(f"Content lengths: {columns['elements']['content_length'].tolist()}")
+    merged = _concat_columns([columns['elements'], columns['elements']])
+    print(f"Two documents: {len(merged['model'])} rows, vocabulary {merged['element_type'][1]}")
+    
+    # Test 2: Files
+    print("\n" + "="*60)
+    print("Test 2: Append")
+    print("-" * 60)
+    if PYARROW_AVAILABLE:
+        import tempfile
+        import pyarrow.dataset as ds
+        root = Path(tempfile.mkdtemp())
+        appender = ColumnarAppender(root)
+        appender.append_document(result)
+        appender.append_document(result)  # Replaces, does not duplicate
+        pages = ds.dataset(root / "pages", partitioning="hive").to_table()
+        print(f"Page rows: {pages.num_rows}, stats: {appender.stats}")
+        assert pages.num_rows == 2
+    else:
+        print("Skipped (pyarrow not installed)")
+    
+    # Test 3: Corpus export over datasets appended during runs
+    print("\n" + "="*60)
+    print("Test 3: Export Corpus")
+    print("-" * 60)
+    if PYARROW_AVAILABLE:
+        from .serializers import JsonSerializer
+        from ..extractors.result_loader import load_document_result
+        
+        base_dir = Path(tempfile.mkdtemp())
+        serializer = JsonSerializer()
+        for name in ("manual", "report"):
+            page_dir = base_dir / name / "pages" / "page_001"
+            page_dir.mkdir(parents=True)
+            serializer.dump({
+                'success': True,
+                'parser_type': 'grounding_parser',
+                'element_count': 3,
+                'elements': [
+                    {'id': i + 1, 'type': 'text', 'bbox': [10, 20 * i, 500, 20 * i + 15], 'content': f"line {i}"}
+                    for i in range(3)
+                ],
+                'extraction_metadata': {'model': 'deepseek-ocr:3b', 'processing_time': 1.5}
+            }, page_dir / "grounding.json")
+            serializer.dump({'input_file': f"{name}.pdf", 'page_count': 1}, base_dir / name / "metadata.json")
+            # What columnar_export does after each document of a run
+            ColumnarAppender(base_dir / "analytics").append_document(load_document_result(base_dir / name))
+        
+        for attempt in (1, 2):
+            stats = export_corpus(base_dir)
+            elements = ds.dataset(base_dir / "analytics" / "elements", partitioning="hive").to_table()
+            pages = ds.dataset(base_dir / "analytics" / "pages", partitioning="hive").to_table()
+            print(f"Export {attempt}: {stats}, element rows {elements.num_rows}, page rows {pages.num_rows}")
+            assert (elements.num_rows, pages.num_rows) == (6, 2)
+    else:
+        print("Skipped (pyarrow not installed)")
+    
+    print("\n✅ columnar_export.py tests passed!")
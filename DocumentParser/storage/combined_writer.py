@@ -0,0 +1,241 @@
+"""
+Combined Writer Module
+Streams the combined markdown/JSON document to disk one page at a time.
+Pages are appended in page order; early arrivals wait in a small buffer.
+"""
+
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Sequence, Tuple, Union
+import io
+import textwrap
+
+from .serializers import Serializer, get_serializer
+from .compression import Codec, get_codec
+
+
+class CombinedWriter:
+    """
+    Incremental writer for full_document.md and full_document.json.
+    
+    The files are opened and their headers written on construction;
+    add_page() appends a page as soon as every earlier page has been
+    added, so only out-of-order pages are held in memory. finalize()
+    writes any pages still waiting (gaps are skipped), closes the JSON
+    document and the files. The markdown file is usable at any point;
+    the JSON file is well-formed once finalized.
+    
+    The JSON layout is identical to dumping {'pages': [...]} in one call
+    with the same serializer. Binary serializers (msgpack) need the page
+    count up front, so their pages are kept and written by finalize().
+    With a compression codec both files are compressed as they stream
+    (full_document.md.gz etc.).
+    
+    Example:
+        >>> writer = CombinedWriter("output/manual/combined", serializer=get_serializer("json"))
+        >>> writer.add_page(2, markdown=page2_md, data=page2_dict)  # Buffered
+        >>> writer.add_page(1, markdown=page1_md, data=page1_dict)  # Writes pages 1 and 2
+        >>> writer.finalize()
+        {'pages': 2, 'max_buffered': 1, 'skipped': []}
+    """
+    
+    def __init__(
+        self,
+        combined_dir: Union[str, Path],
+        formats: Sequence[str] = ("markdown", "json"),
+        serializer: Optional[Serializer] = None,
+        first_page: int = 1,
+        stem: str = "full_document",
+        codec: Optional[Codec] = None
+    ):
+        """
+        Open the combined files.
+        
+        Args:
+            combined_dir: Directory receiving the combined files
+            formats: "markdown" and/or "json"
+            serializer: Serializer for the JSON document (None = compact JSON)
+            first_page: Page number written first
+            stem: File name stem
+            codec: Compression codec (None = uncompressed)
+        """
+        self.combined_dir = Path(combined_dir)
+        self.combined_dir.mkdir(parents=True, exist_ok=True)
+        self.serializer = serializer or get_serializer("json")
+        self.codec = codec or get_codec("none")
+        self.next_page = first_page
+        self.stats: Dict[str, Any] = {'pages': 0, 'max_buffered': 0, 'skipped': []}
+        self._buffer: Dict[int, Tuple[Optional[str], Optional[Dict[str, Any]]]] = {}
+        self._binary_pages: List[Dict[str, Any]] = []
+        self._json_items = 0
+        self._finalized = False
+        
+        self.markdown_file = None
+        if "markdown" in formats:
+            self.markdown_file = io.TextIOWrapper(
+                self.codec.open(self.codec.path(self.combined_dir / f"{stem}.md"), 'wb'), encoding='utf-8'
+            )
+        
+        self.json_path = None
+        self.json_file = None
+        if "json" in formats:
+            self.json_path = self.codec.path(self.combined_dir / self.serializer.filename(stem))
+            if not self.serializer.binary:
+                self.json_file = self.codec.open(self.json_path, 'wb')
+                self.json_file.write(self._json_header())
+                self.json_file.flush()
+    
+    def add_page(
+        self,
+        page_number: int,
+        markdown: Optional[str] = None,
+        data: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Append a page, or buffer it until earlier pages arrive.
+        
+        Args:
+            page_number: Page number
+            markdown: Page markdown chunk
+            data: Page entry of the combined JSON
+        
+        Raises:
+            ValueError: If the page was already written or the writer finalized
+        """
+        if self._finalized:
+            raise ValueError("CombinedWriter is finalized")
+        if page_number < self.next_page or page_number in self._buffer:
+            raise ValueError(f"Page {page_number} was already added")
+        
+        self._buffer[page_number] = (markdown, data)
+        while self.next_page in self._buffer:
+            self._write_page(*self._buffer.pop(self.next_page))
+            self.next_page += 1
+        self._flush_files()
+        self.stats['max_buffered'] = max(self.stats['max_buffered'], len(self._buffer))
+    
+    def finalize(self) -> Dict[str, Any]:
+        """
+        Write buffered pages, close the JSON document and the files.
+        
+        Returns:
+            Dict[str, Any]: Stats with pages written, max_buffered and skipped page numbers
+        """
+        if self._finalized:
+            return self.stats
+        self._finalized = True
+        
+        # Pages after a gap (a page that never arrived) are written in order
+        if self._buffer:
+            last_page = max(self._buffer)
+            self.stats['skipped'] = [
+                page for page in range(self.next_page, last_page) if page not in self._buffer
+            ]
+            for page_number in sorted(self._buffer):
+                self._write_page(*self._buffer.pop(page_number))
+        
+        if self.markdown_file is not None:
+            self.markdown_file.close()
+        if self.json_file is not None:
+            self.json_file.write(self._json_footer())
+            self.json_file.close()
+        elif self.json_path is not None:
+            self.codec.write_bytes(self.json_path, self.serializer.dumps({'pages': self._binary_pages}))
+            self._binary_pages = []
+        
+        return self.stats
+    
+    def _write_page(self, markdown: Optional[str], data: Optional[Dict[str, Any]]):
+        """Append one page to the open files"""
+        if self.markdown_file is not None and markdown is not None:
+            self.markdown_file.write(markdown)
+        
+        if self.json_path is not None and data is not None:
+            if self.json_file is None:
+                self._binary_pages.append(data)
+            else:
+                separator = self._json_separator() if self._json_items else b""
+                self.json_file.write(separator + self._json_item(data))
+                self._json_items += 1
+        
+        self.stats['pages'] += 1
+    
+    def _flush_files(self):
+        """Push written pages to disk so partial output survives a crash"""
+        for file in (self.markdown_file, self.json_file):
+            if file is not None:
+                file.flush()
+    
+    # ========== JSON framing ==========
+    # Matches the serializer's own output for {'pages': [page, ...]}
+    
+    def _indent(self) -> int:
+        return getattr(self.serializer, 'indent', None) or 0
+    
+    def _json_header(self) -> bytes:
+        indent = self._indent()
+        if not indent:
+            return b'{"pages":['
+        return ('{\n' + ' ' * indent + '"pages": [\n').encode('utf-8')
+    
+    def _json_separator(self) -> bytes:
+        return b',\n' if self._indent() else b','
+    
+    def _json_item(self, data: Dict[str, Any]) -> bytes:
+        payload = self.serializer.dumps(data)
+        indent = self._indent()
+        if not indent:
+            return payload
+        return textwrap.indent(payload.decode('utf-8'), ' ' * (2 * indent)).encode('utf-8')
+    
+    def _json_footer(self) -> bytes:
+        indent = self._indent()
+        if not indent:
+            return b']}'
+        return ('\n' + ' ' * indent + ']\n}').encode('utf-8')
+    
+    def __enter__(self) -> 'CombinedWriter':
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.finalize()
+
+
+if __name__ == "__main__":
+    print("Testing combined_writer.py...\n")
+    
+    import tempfile
+    
+    temp_dir = Path(tempfile.mkdtemp())
+    pages = {
+        page: {'page_number': page, 'elements': {'element_count': 1, 'elements': [{'id': 1, 'content': f"page {page}"}]}}
+        for page in range(1, 6)
+    }
+    
+    # Test 1: Output matches a one-shot dump
+    print("Test 1: Streamed vs One-Shot")
+    print("-" * 60)
+    for name in ["json", "json-pretty"]:
+        serializer = get_serializer(name)
+        with CombinedWriter(temp_dir / name, serializer=serializer) as writer:
+            for page in [2, 1, 3, 5, 4]:
+                writer.add_page(page, markdown=f"# Page {page}\n", data=pages[page])
+        streamed = (temp_dir / name / "full_document.json").read_bytes()
+        expected = serializer.dumps({'pages': [pages[page] for page in range(1, 6)]})
+        print(f"{name:12s} identical: {streamed == expected}, stats: {writer.stats}")
+    print(f"Markdown: {(temp_dir / 'json' / 'full_document.md').read_text().split()}")
+    
+    # Test 2: Partial output while pages are missing
+    print("\n" + "="*60)
+    print("Test 2: Gaps")
+    print("-" * 60)
+    writer = CombinedWriter(temp_dir / "gap", formats=["json"])
+    writer.add_page(1, data=pages[1])
+    writer.add_page(3, data=pages[3])
+    print(f"Before finalize: {(temp_dir / 'gap' / 'full_document.json').read_bytes()[:40]}...")
+    print(f"Stats: {writer.finalize()}")
+    try:
+        writer.add_page(2, data=pages[2])
+    except ValueError as e:
+        print(f"✓ Caught: {e}")
+    
+    print("\n✅ combined_writer.py tests passed!")
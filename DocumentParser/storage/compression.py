@@ -0,0 +1,259 @@
+"""
+Compression Module
+Transparent per-artifact compression of output files (gzip, or zstd when installed).
+Compressed files keep their name plus the codec extension, e.g. grounding.json.zst.
+"""
+
+from pathlib import Path
+from typing import Dict, Optional, Union
+import gzip
+import io
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+
+# Artifacts whose codec can be chosen in OutputConfig.compression
+COMPRESSIBLE_ARTIFACTS = ["raw_output", "grounding_json", "markdown", "combined"]
+
+
+class Codec:
+    """
+    Compression codec for whole files and streams.
+    
+    The base class is the identity codec ("none").
+    
+    Attributes:
+        name: Registry name
+        extension: Suffix appended to compressed file names ("" for none)
+        level: Compression level
+    """
+    
+    name = "none"
+    extension = ""
+    default_level = 0
+    
+    def __init__(self, level: Optional[int] = None):
+        """
+        Initialize codec.
+        
+        Args:
+            level: Compression level (None = codec default)
+        """
+        self.level = self.default_level if level is None else level
+    
+    def compress(self, data: bytes) -> bytes:
+        return data
+    
+    def decompress(self, data: bytes) -> bytes:
+        return data
+    
+    def open(self, path: Union[str, Path], mode: str = 'rb'):
+        """
+        Open a (compressed) binary stream.
+        
+        Args:
+            path: File path including the codec extension
+            mode: 'rb' or 'wb'
+        
+        Returns:
+            Binary file object; wrap in io.TextIOWrapper for text
+        """
+        return open(path, mode)
+    
+    def path(self, path: Union[str, Path]) -> Path:
+        """File path with this codec's extension appended"""
+        path = Path(path)
+        return path.with_name(path.name + self.extension) if self.extension else path
+    
+    def write_bytes(self, path: Union[str, Path], data: bytes) -> Path:
+        """
+        Compress data into path (the codec extension is not added here).
+        
+        Returns:
+            Path: The written file
+        """
+        path = Path(path)
+        path.write_bytes(self.compress(data))
+        return path
+    
+    def read_bytes(self, path: Union[str, Path]) -> bytes:
+        """Read and decompress a file"""
+        return self.decompress(Path(path).read_bytes())
+
+
+class GzipCodec(Codec):
+    """gzip (stdlib), levels 1-9"""
+    
+    name = "gzip"
+    extension = ".gz"
+    default_level = 6
+    
+    def compress(self, data: bytes) -> bytes:
+        # mtime=0 keeps identical content byte-identical across runs
+        return gzip.compress(data, compresslevel=self.level, mtime=0)
+    
+    def decompress(self, data: bytes) -> bytes:
+        return gzip.decompress(data)
+    
+    def open(self, path: Union[str, Path], mode: str = 'rb'):
+        if 'w' in mode:
+            return gzip.GzipFile(filename=str(path), mode=mode, compresslevel=self.level, mtime=0)
+        return gzip.open(path, mode)
+
+
+class ZstdCodec(Codec):
+    """Zstandard (requires the zstandard package), levels 1-22"""
+    
+    name = "zstd"
+    extension = ".zst"
+    default_level = 3
+    
+    def __init__(self, level: Optional[int] = None):
+        """Initialize codec"""
+        if not ZSTD_AVAILABLE:
+            raise ImportError("zstd compression requires zstandard. Install: pip install zstandard")
+        super().__init__(level)
+    
+    def compress(self, data: bytes) -> bytes:
+        return zstandard.ZstdCompressor(level=self.level).compress(data)
+    
+    def decompress(self, data: bytes) -> bytes:
+        # Streamed frames carry no content size, so decode through a reader
+        with zstandard.ZstdDecompressor().stream_reader(io.BytesIO(data)) as reader:
+            return reader.read()
+    
+    def open(self, path: Union[str, Path], mode: str = 'rb'):
+        if 'w' in mode:
+            return zstandard.ZstdCompressor(level=self.level).stream_writer(open(path, 'wb'))
+        return zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'))
+
+
+CODECS = {
+    "none": Codec,
+    "gzip": GzipCodec,
+    "zstd": ZstdCodec,
+}
+
+
+def get_codec(name: str = "none", level: Optional[int] = None) -> Codec:
+    """
+    Create a codec by name.
+    
+    Args:
+        name: "none", "gzip" or "zstd"
+        level: Compression level (None = codec default)
+    
+    Returns:
+        Codec: New codec instance
+    
+    Raises:
+        ValueError: If name is unknown
+        ImportError: If the codec's package is not installed
+    
+    Example:
+        >>> codec = get_codec("gzip", level=9)
+        >>> codec.write_bytes(codec.path("raw_output.txt"), raw.encode('utf-8'))
+        PosixPath('raw_output.txt.gz')
+    """
+    if name not in CODECS:
+        raise ValueError(f"Unknown compression codec: {name}. Must be one of: {list(CODECS)}")
+    return CODECS[name](level)
+
+
+def codec_for_path(path: Union[str, Path]) -> Codec:
+    """Codec matching a file's extension (none if uncompressed)"""
+    suffix = Path(path).suffix
+    for codec_class in CODECS.values():
+        if codec_class.extension and codec_class.extension == suffix:
+            return codec_class()
+    return Codec()
+
+
+def find_artifact(path: Union[str, Path], preferred: Optional[str] = None) -> Optional[Path]:
+    """
+    Locate a possibly compressed file.
+    
+    Args:
+        path: Uncompressed file path (e.g. page_dir / "grounding.json")
+        preferred: Codec recorded for the artifact, tried first
+    
+    Returns:
+        Path of the existing variant, or None
+    """
+    path = Path(path)
+    names = [preferred] if preferred in CODECS else []
+    names += [name for name in CODECS if name != preferred]
+    for name in names:
+        candidate = path.with_name(path.name + CODECS[name].extension)
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def read_artifact(path: Union[str, Path]) -> bytes:
+    """Read a file, decompressing according to its extension"""
+    return codec_for_path(path).read_bytes(path)
+
+
+def list_codecs() -> Dict[str, bool]:
+    """Codec names and whether each can be used here"""
+    return {"none": True, "gzip": True, "zstd": ZSTD_AVAILABLE}
+
+
+if __name__ == "__main__":
+    print("Testing compression.py...\n")
+    
+    import json
+    import tempfile
+    import time
+    
+    temp_dir = Path(tempfile.mkdtemp())
+    raw = "".join(
+        f"<|ref|>text<|/ref|><|det|>[[{i}, {i * 2}, {i + 400}, {i * 2 + 30}]]<|/det|>\nLine {i} of the manual text\n"
+        for i in range(2000)
+    ).encode('utf-8')
+    grounding = json.dumps({'elements': [{'id': i, 'type': 'text', 'bbox': [i, i, i + 400, i + 30], 'content': f"Line {i}"} for i in range(2000)]}).encode('utf-8')
+    
+    # Test 1: Ratios and round trip
+    print("Test 1: Compress Artifacts")
+    print("-" * 60)
+    for name, available in list_codecs().items():
+        if not available:
+            print(f"{name:5s} skipped (not installed)")
+            continue
+        codec = get_codec(name)
+        for label, data in [("raw", raw), ("grounding", grounding)]:
+            start_time = time.perf_counter()
+            path = codec.write_bytes(codec.path(temp_dir / f"{label}.dat"), data)
+            elapsed = time.perf_counter() - start_time
+            restored = read_artifact(path)
+            print(
+                f"{name:5s} {label:10s} {len(data) // 1024:5d} KB -> {path.stat().st_size // 1024:4d} KB "
+                f"({len(data) / path.stat().st_size:4.1f}x) in {elapsed * 1000:5.1f} ms, equal: {restored == data}"
+            )
+    
+    # Test 2: Streaming writes
+    print("\n" + "="*60)
+    print("Test 2: Stream")
+    print("-" * 60)
+    codec = get_codec("gzip")
+    with io.TextIOWrapper(codec.open(codec.path(temp_dir / "stream.md"), 'wb'), encoding='utf-8') as f:
+        for page in range(1, 4):
+            f.write(f"# Page {page}\n")
+    found = find_artifact(temp_dir / "stream.md")
+    print(f"Found: {found.name}, content: {read_artifact(found).decode('utf-8').split()}")
+    
+    # Test 3: Validation
+    print("\n" + "="*60)
+    print("Test 3: Validation")
+    print("-" * 60)
+    try:
+        get_codec("lzma")
+    except ValueError as e:
+        print(f"✓ Caught: {e}")
+    
+    print("\n✅ compression.py tests passed!")
@@ -0,0 +1,336 @@
+"""
+Document Store Module
+Single-file SQLite container for page outputs of one document or a whole batch.
+Replaces the per-page folder tree; export_folder() recreates it on demand.
+"""
+
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Union
+import json
+import sqlite3
+import threading
+import time
+
+from .serializers import JsonSerializer
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    doc_key TEXT PRIMARY KEY,
+    input_file TEXT,
+    metadata TEXT,
+    updated REAL
+);
+CREATE TABLE IF NOT EXISTS pages (
+    doc_key TEXT NOT NULL,
+    page_number INTEGER NOT NULL,
+    raw_output TEXT,
+    grounding TEXT,
+    markdown TEXT,
+    PRIMARY KEY (doc_key, page_number)
+);
+CREATE TABLE IF NOT EXISTS artifacts (
+    doc_key TEXT NOT NULL,
+    page_number INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (doc_key, page_number, name)
+);
+"""
+
+
+class DocumentStore:
+    """
+    Indexed single-file store for per-page outputs.
+    
+    Each document is identified by a key (its output folder name), each
+    page by (key, page_number). Pages hold the raw output, grounding JSON
+    and markdown; page files such as annotated images are kept as named
+    binary artifacts. All reads are random access by primary key.
+    
+    Safe to share between the extraction thread and a BackgroundWriter.
+    
+    Example:
+        >>> store = DocumentStore("output/manual/results.sqlite")
+        >>> store.put_page("manual", 1, raw_output=raw, grounding=data, markdown=md)
+        >>> store.get_page("manual", 1)['grounding']['element_count']
+        12
+        >>> store.export_folder("manual", "exported/manual")
+    """
+    
+    def __init__(self, path: Union[str, Path], mmap_size: int = 0):
+        """
+        Open (or create) a store.
+        
+        Args:
+            path: SQLite file path
+            mmap_size: Bytes of the file SQLite may read through a memory
+                map (0 = regular reads); useful for read-mostly access
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._json = JsonSerializer()
+        self._lock = threading.RLock()
+        self._connection = sqlite3.connect(str(self.path), check_same_thread=False)
+        # Default rollback journal: WAL needs shared memory, which network filesystems lack
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        if mmap_size:
+            self._connection.execute(f"PRAGMA mmap_size={int(mmap_size)}")
+        self._connection.executescript(_SCHEMA)
+        self._connection.commit()
+    
+    # ========== Writing ==========
+    
+    def put_page(
+        self,
+        doc_key: str,
+        page_number: int,
+        raw_output: Optional[str] = None,
+        grounding: Optional[Dict[str, Any]] = None,
+        markdown: Optional[str] = None
+    ):
+        """
+        Insert or replace the outputs of one page.
+        
+        Args:
+            doc_key: Document key
+            page_number: Page number
+            raw_output: Raw model output
+            grounding: Grounding data (stored as compact JSON)
+            markdown: Page markdown
+        """
+        grounding_text = self._json.dumps(grounding).decode('utf-8') if grounding is not None else None
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?)",
+                (doc_key, page_number, raw_output, grounding_text, markdown)
+            )
+            self._connection.commit()
+    
+    def put_artifact(self, doc_key: str, page_number: int, name: str, data: Union[bytes, str, Path]):
+        """
+        Insert or replace a binary page artifact.
+        
+        Args:
+            doc_key: Document key
+            page_number: Page number
+            name: Artifact file name (e.g. "page_001_annotated.png")
+            data: Bytes, or path of a file to read
+        """
+        if not isinstance(data, bytes):
+            data = Path(data).read_bytes()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO artifacts VALUES (?, ?, ?, ?)",
+                (doc_key, page_number, name, sqlite3.Binary(data))
+            )
+            self._connection.commit()
+    
+    def put_document(self, doc_key: str, input_file: str, metadata: Optional[Dict[str, Any]] = None):
+        """
+        Insert or replace document-level information.
+        
+        Args:
+            doc_key: Document key
+            input_file: Source document path
+            metadata: Document metadata
+        """
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO documents VALUES (?, ?, ?, ?)",
+                (doc_key, input_file, self._json.dumps(metadata).decode('utf-8'), time.time())
+            )
+            self._connection.commit()
+    
+    # ========== Reading ==========
+    
+    def get_page(self, doc_key: str, page_number: int) -> Optional[Dict[str, Any]]:
+        """
+        Read the outputs of one page.
+        
+        Args:
+            doc_key: Document key
+            page_number: Page number
+        
+        Returns:
+            dict with raw_output, grounding (parsed) and markdown, or None
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT raw_output, grounding, markdown FROM pages WHERE doc_key = ? AND page_number = ?",
+                (doc_key, page_number)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            'page_number': page_number,
+            'raw_output': row[0],
+            'grounding': self._json.loads(row[1]) if row[1] is not None else None,
+            'markdown': row[2]
+        }
+    
+    def get_artifact(self, doc_key: str, page_number: int, name: str) -> Optional[bytes]:
+        """Read a binary page artifact (None if missing)"""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT data FROM artifacts WHERE doc_key = ? AND page_number = ? AND name = ?",
+                (doc_key, page_number, name)
+            ).fetchone()
+        return bytes(row[0]) if row else None
+    
+    def get_document(self, doc_key: str) -> Optional[Dict[str, Any]]:
+        """Read document-level information (None if missing)"""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT input_file, metadata FROM documents WHERE doc_key = ?", (doc_key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {'doc_key': doc_key, 'input_file': row[0], 'metadata': self._json.loads(row[1]) if row[1] else None}
+    
+    def list_documents(self) -> List[str]:
+        """Keys of all documents with pages or document info"""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT doc_key FROM documents UNION SELECT DISTINCT doc_key FROM pages ORDER BY 1"
+            ).fetchall()
+        return [row[0] for row in rows]
+    
+    def list_pages(self, doc_key: str) -> List[int]:
+        """Page numbers stored for a document, ascending"""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT page_number FROM pages WHERE doc_key = ? ORDER BY page_number", (doc_key,)
+            ).fetchall()
+        return [row[0] for row in rows]
+    
+    def list_artifacts(self, doc_key: str, page_number: int) -> List[str]:
+        """Artifact names stored for a page"""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT name FROM artifacts WHERE doc_key = ? AND page_number = ? ORDER BY name",
+                (doc_key, page_number)
+            ).fetchall()
+        return [row[0] for row in rows]
+    
+    # ========== Export ==========
+    
+    def export_folder(
+        self,
+        doc_key: str,
+        document_dir: Union[str, Path],
+        pages_subfolder: str = "pages",
+        page_naming_format: str = "page_{num:03d}",
+        metadata_filename: str = "metadata.json"
+    ) -> str:
+        """
+        Recreate the per-page folder layout of a stored document.
+        
+        Args:
+            doc_key: Document key
+            document_dir: Target document directory
+            pages_subfolder: Name of pages subfolder
+            page_naming_format: Page folder/markdown naming format
+            metadata_filename: Metadata file name
+        
+        Returns:
+            str: Path to the exported document directory
+        """
+        document_dir = Path(document_dir)
+        
+        for page_number in self.list_pages(doc_key):
+            page_name = page_naming_format.format(num=page_number)
+            page_dir = document_dir / pages_subfolder / page_name
+            page_dir.mkdir(parents=True, exist_ok=True)
+            page = self.get_page(doc_key, page_number)
+            
+            if page['raw_output'] is not None:
+                (page_dir / "raw_output.txt").write_text(page['raw_output'], encoding='utf-8')
+            if page['grounding'] is not None:
+                with open(page_dir / "grounding.json", 'w', encoding='utf-8') as f:
+                    json.dump(page['grounding'], f, indent=2, ensure_ascii=False)
+            if page['markdown'] is not None:
+                (page_dir / f"{page_name}.md").write_text(page['markdown'], encoding='utf-8')
+            
+            for name in self.list_artifacts(doc_key, page_number):
+                (page_dir / name).write_bytes(self.get_artifact(doc_key, page_number, name))
+        
+        document = self.get_document(doc_key)
+        if document and document['metadata'] is not None:
+            document_dir.mkdir(parents=True, exist_ok=True)
+            with open(document_dir / metadata_filename, 'w', encoding='utf-8') as f:
+                json.dump(document['metadata'], f, indent=2, ensure_ascii=False)
+        
+        print(f"✓ Exported {doc_key} to {document_dir}")
+        return str(document_dir)
+    
+    def export_all(self, output_base_dir: Union[str, Path], **layout) -> List[str]:
+        """
+        Export every stored document with export_folder().
+        
+        Args:
+            output_base_dir: Directory receiving one folder per document
+            **layout: Naming options passed to export_folder()
+        
+        Returns:
+            List[str]: Exported document directories
+        """
+        return [
+            self.export_folder(doc_key, Path(output_base_dir) / doc_key, **layout)
+            for doc_key in self.list_documents()
+        ]
+    
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._connection.close()
+    
+    def __enter__(self) -> 'DocumentStore':
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+if __name__ == "__main__":
+    print("Testing document_store.py...\n")
+    
+    import tempfile
+    
+    temp_dir = Path(tempfile.mkdtemp())
+    
+    # Test 1: Write a 300-page document
+    print("Test 1: Write Pages")
+    print("-" * 60)
+    store = DocumentStore(temp_dir / "results.sqlite")
+    start_time = time.perf_counter()
+    for page in range(1, 301):
+        store.put_page(
+            "manual", page,
+            raw_output=f"<|ref|>text<|/ref|><|det|>[[0, 0, 10, 10]]<|/det|>\npage {page}",
+            grounding={'element_count': 1, 'elements': [{'id': 1, 'content': f"page {page}"}]},
+            markdown=f"page {page}\n"
+        )
+    store.put_artifact("manual", 1, "page_001_annotated.png", b"\x89PNG fake")
+    store.put_document("manual", "manual.pdf", {'page_count': 300})
+    elapsed = time.perf_counter() - start_time
+    print(f"300 pages in {elapsed * 1000:.0f} ms, 1 file: {store.path.stat().st_size // 1024} KB")
+    
+    # Test 2: Random access
+    print("\n" + "="*60)
+    print("Test 2: Random Access")
+    print("-" * 60)
+    page = store.get_page("manual", 217)
+    print(f"Page 217 markdown: {page['markdown'].strip()}")
+    print(f"Documents: {store.list_documents()}, pages: {len(store.list_pages('manual'))}")
+    print(f"Artifacts on page 1: {store.list_artifacts('manual', 1)}")
+    
+    # Test 3: Export to folders
+    print("\n" + "="*60)
+    print("Test 3: Export Folder Layout")
+    print("-" * 60)
+    export_dir = Path(store.export_folder("manual", temp_dir / "export" / "manual"))
+    print(f"Files: {sorted(p.name for p in (export_dir / 'pages' / 'page_001').iterdir())}")
+    store.close()
+    
+    print("\n✅ document_store.py tests passed!")
@@ -4,12 +4,19 @@ Manages saving extraction results to various output formats.
 Handles raw output, JSON, markdown, and metadata files.
 """
 
+import os
 from pathlib import Path
-from typing import Optional, Dict, Any
-import json
+from typing import Optional, Dict, Any, List
 
 from ..config import OutputConfig
 from ..extractors.base_extractor import ExtractionResult
+from .background_writer import BackgroundWriter, WriteError
+from .document_store import DocumentStore
+from .serializers import get_serializer
+from .compression import get_codec, COMPRESSIBLE_ARTIFACTS
+from .blob_store import BlobStore
+from .storage_governor import StorageGovernor
+from .columnar_export import ColumnarAppender
 
 
 class OutputManager:
@@ -21,6 +28,24 @@ class OutputManager:
     - Grounding JSON (parsed elements)
     - Markdown conversion
     - Metadata files
+    
+    With output_config.async_writes, page outputs are written by a
+    BackgroundWriter; call flush() before mutating saved results and to
+    collect write failures.
+    
+    With output_config.storage_backend = "sqlite", page outputs go into a
+    DocumentStore opened by begin_document() instead of per-page files.
+    
+    With output_config.dedupe_images, page images go into a BlobStore
+    shared by all documents; add_page_image() records them in the
+    document's images.json manifest.
+    
+    With output_config.storage_budgets_mb or min_free_disk_mb, a
+    StorageGovernor watches output_base_dir; call governor.check() before
+    new work (it evicts reproducible files or raises StorageBudgetError).
+    
+    With output_config.columnar_export, save_columnar() adds each finished
+    document's elements and page statistics to Parquet/Arrow datasets.
     """
     
     def __init__(self, output_config: OutputConfig):
@@ -36,6 +61,70 @@ class OutputManager:
             >>> manager = OutputManager(config)
         """
         self.config = output_config
+        self.writer: Optional[BackgroundWriter] = None
+        if output_config.async_writes:
+            self.writer = BackgroundWriter(max_pending=output_config.write_queue_size)
+        self.store: Optional[DocumentStore] = None
+        self.document_key: Optional[str] = None
+        self.document_dir: Optional[Path] = None
+        self.serializer = get_serializer(output_config.serializer)
+        # Metadata stays readable JSON when page data is binary
+        self.metadata_serializer = get_serializer("json") if self.serializer.binary else self.serializer
+        # Codec per artifact (metadata is never compressed so loaders can read it)
+        self.codecs = {
+            artifact: get_codec(
+                output_config.compression.get(artifact, "none"),
+                output_config.compression_level.get(artifact)
+            )
+            for artifact in COMPRESSIBLE_ARTIFACTS
+        }
+        self.blobs: Optional[BlobStore] = None
+        if output_config.dedupe_images:
+            self.blobs = BlobStore(Path(output_config.output_base_dir) / output_config.blob_subfolder)
+        # Page number -> {file name: blob path relative to the blob store}
+        self.image_manifest: Dict[int, Dict[str, str]] = {}
+        self.governor: Optional[StorageGovernor] = None
+        if output_config.storage_budgets_mb or output_config.min_free_disk_mb:
+            self.governor = StorageGovernor(
+                output_config.output_base_dir,
+                budgets={category: mb * 1024 * 1024 for category, mb in output_config.storage_budgets_mb.items()},
+                min_free_bytes=output_config.min_free_disk_mb * 1024 * 1024,
+                blob_subfolder=output_config.blob_subfolder
+            )
+        self.columnar: Optional[ColumnarAppender] = None
+        if output_config.columnar_export:
+            self.columnar = ColumnarAppender(
+                Path(output_config.output_base_dir) / output_config.columnar_subfolder,
+                file_format=output_config.columnar_format
+            )
+    
+    def begin_document(self, document_dir: str):
+        """
+        Select the document that following page results belong to.
+        
+        Opens the SQLite store for the sqlite backend (one per document, or
+        one shared file under output_base_dir with store_scope="batch").
+        
+        Args:
+            document_dir: Document output directory
+        """
+        self.image_manifest = {}
+        self.document_dir = Path(document_dir)
+        if self.config.storage_backend != "sqlite":
+            return
+        
+        self.flush()
+        document_dir = Path(document_dir)
+        if self.config.store_scope == "batch":
+            store_path = Path(self.config.output_base_dir) / self.config.store_filename
+        else:
+            store_path = document_dir / self.config.store_filename
+        
+        if self.store is None or self.store.path != store_path:
+            if self.store is not None:
+                self.store.close()
+            self.store = DocumentStore(store_path)
+        self.document_key = document_dir.name
     
     def save_page_result(
         self,
@@ -54,6 +143,194 @@ class OutputManager:
         Example:
             >>> manager.save_page_result(extraction_result, 1, "output/doc/pages/page_001")
         """
+        write = self._store_page if self.store is not None else self._write_page
+        self.write(write, result, page_number, page_dir, label=f"page {page_number}")
+    
+    def save_page_files(self, page_number: int, page_dir: str):
+        """
+        Move files left in a page directory (annotations) into the store.
+        
+        The emptied page directory is removed. No-op for the folders backend.
+        
+        Args:
+            page_number: Page number
+            page_dir: Page output directory
+        """
+        if self.store is None:
+            return
+        self.write(self._store_page_files, page_number, page_dir, label=f"page {page_number} files")
+    
+    def write(self, func, *args, label: Optional[str] = None, **kwargs):
+        """
+        Run a write task on the background writer, or now for synchronous writes.
+        
+        Args:
+            func: Callable performing the write
+            *args: Positional arguments for func
+            label: Description used in error reports
+            **kwargs: Keyword arguments for func
+        """
+        if self.writer is not None:
+            self.writer.submit(func, *args, label=label, **kwargs)
+        else:
+            func(*args, **kwargs)
+    
+    def add_page_image(
+        self,
+        page_number: int,
+        source: str,
+        name: str = "page_image",
+        page_dir: Optional[str] = None,
+        move: bool = False
+    ) -> str:
+        """
+        Store a page image once in the blob store.
+        
+        The image is listed in the manifest under name; with page_dir and
+        image_links = "hardlink" it is also linked into the page directory
+        as name. The blob is protected from storage governor eviction until
+        release_page_images().
+        
+        Args:
+            page_number: Page number
+            source: Image file
+            name: Manifest entry (and file name in page_dir)
+            page_dir: Page directory to link the image into (None = manifest only)
+            move: Consume source (for renders the run created)
+        
+        Returns:
+            str: Path of the stored blob
+        """
+        source = Path(source)
+        digest = self.blobs.put(source, move=move)
+        blob = self.blobs.path(digest, source.suffix)
+        self.image_manifest.setdefault(page_number, {})[name] = str(blob.relative_to(self.blobs.root))
+        if self.governor is not None:
+            self.governor.protect(blob)
+        
+        if page_dir is not None and self.config.image_links == "hardlink":
+            self.blobs.link(digest, Path(page_dir) / name, source.suffix)
+        return str(blob)
+    
+    def release_page_images(self):
+        """Let the storage governor evict the blobs of the current document again"""
+        if self.governor is None or self.blobs is None:
+            return
+        for images in self.image_manifest.values():
+            for blob in images.values():
+                self.governor.release(self.blobs.root / blob)
+    
+    def save_image_manifest(self, document_dir: str) -> Optional[str]:
+        """
+        Write images.json listing the blobs of the document's pages.
+        
+        Args:
+            document_dir: Document output directory
+        
+        Returns:
+            Optional[str]: Manifest path (None without dedupe_images)
+        """
+        if self.blobs is None:
+            return None
+        manifest = {
+            'blob_dir': self._relative_path(self.blobs.root, document_dir),
+            'pages': {str(page): images for page, images in sorted(self.image_manifest.items())}
+        }
+        return str(self.metadata_serializer.dump(manifest, Path(document_dir) / "images.json"))
+    
+    def save_columnar(self, result) -> List[str]:
+        """
+        Add a finished document to the columnar datasets (no-op unless columnar_export).
+        
+        Export failures are reported but do not fail the document.
+        
+        Args:
+            result: DocumentResult
+        
+        Returns:
+            List[str]: Files written
+        """
+        if self.columnar is None:
+            return []
+        try:
+            return [str(path) for path in self.columnar.append_document(result)]
+        except Exception as e:
+            print(f"  ⚠ Warning: Could not export {result.input_file} to {self.columnar.root}: {e}")
+            return []
+    
+    def get_storage_info(self) -> Dict[str, Any]:
+        """Backend, store file and document key for document metadata"""
+        info = {
+            'backend': self.config.storage_backend,
+            'serializer': self.serializer.name,
+            'compression': {artifact: codec.name for artifact, codec in self.codecs.items()},
+            'store_file': self._relative_path(self.store.path) if self.store is not None else None,
+            'document_key': self.document_key
+        }
+        if self.blobs is not None:
+            info['images'] = {
+                'blob_dir': self._relative_path(self.blobs.root),
+                'manifest': "images.json",
+                'links': self.config.image_links
+            }
+        if self.governor is not None:
+            info['budget'] = {
+                'usage_bytes': self.governor.usage(),
+                **self.governor.stats
+            }
+        return info
+    
+    def _relative_path(self, path: Path, document_dir: Optional[str] = None) -> str:
+        """
+        Path as recorded in document metadata: relative to the document
+        directory, so outputs can be reopened from any cwd or after moving
+        output_base_dir (absolute when no relative path exists).
+        """
+        base = Path(document_dir) if document_dir is not None else self.document_dir
+        if base is None:
+            return str(Path(path).resolve())
+        try:
+            return os.path.relpath(Path(path).resolve(), base.resolve())
+        except ValueError:
+            # Different drives on Windows
+            return str(Path(path).resolve())
+    
+    def save_document(self, input_file: str, metadata: Dict[str, Any]):
+        """
+        Record document metadata in the store (no-op for the folders backend).
+        
+        Args:
+            input_file: Source document path
+            metadata: Document metadata
+        """
+        if self.store is not None:
+            self.flush()
+            self.store.put_document(self.document_key, input_file, metadata)
+    
+    def flush(self) -> List[WriteError]:
+        """
+        Wait for queued page writes (no-op for synchronous writes).
+        
+        Returns:
+            List[WriteError]: Writes that failed since the previous flush
+        """
+        return self.writer.flush() if self.writer is not None else []
+    
+    def close(self) -> List[WriteError]:
+        """
+        Flush and stop the background writer.
+        
+        Returns:
+            List[WriteError]: Writes that failed since the previous flush
+        """
+        errors = self.writer.close() if self.writer is not None else []
+        if self.store is not None:
+            self.store.close()
+            self.store = None
+        return errors
+    
+    def _write_page(self, result: ExtractionResult, page_number: int, page_dir: str):
+        """Write the configured per-page files"""
         page_dir = Path(page_dir)
         page_name = self.config.page_naming_format.format(num=page_number)
         
@@ -69,6 +346,35 @@ class OutputManager:
         if self.config.save_per_page.get('markdown', False):
             self._save_markdown(result, page_dir, page_name)
     
+    def _store_page(self, result: ExtractionResult, page_number: int, page_dir: str):
+        """Write the configured per-page outputs into the document store"""
+        save = self.config.save_per_page
+        self.store.put_page(
+            self.document_key,
+            page_number,
+            raw_output=result.raw_output if save.get('raw_output', True) else None,
+            grounding=self._grounding_data(result) if save.get('grounding_json', True) else None,
+            markdown=self._elements_to_markdown(result) if save.get('markdown', False) else None
+        )
+        
+        print(f"  ✓ Stored page {page_number}: {self.store.path.name}")
+    
+    def _store_page_files(self, page_number: int, page_dir: str):
+        """Move page image files into the store and remove the emptied directory"""
+        page_dir = Path(page_dir)
+        if not page_dir.is_dir():
+            return
+        
+        # Page images are named page_NNN_*.png (original, annotated, comparison)
+        prefix = f"page_{page_number:03d}_"
+        for path in sorted(page_dir.iterdir()):
+            if path.is_file() and path.name.startswith(prefix):
+                self.store.put_artifact(self.document_key, page_number, path.name, path)
+                path.unlink()
+        
+        if not any(page_dir.iterdir()):
+            page_dir.rmdir()
+    
     def _save_raw_output(self, result: ExtractionResult, page_dir: Path):
         """
         Save raw OCR output text.
@@ -77,23 +383,37 @@ class OutputManager:
             result: Extraction result
             page_dir: Output directory
         """
-        output_file = page_dir / "raw_output.txt"
-        
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(result.raw_output)
+        codec = self.codecs['raw_output']
+        output_file = codec.write_bytes(codec.path(page_dir / "raw_output.txt"), result.raw_output.encode('utf-8'))
         
         print(f"  ✓ Saved raw output: {output_file.name}")
     
     def _save_grounding_json(self, result: ExtractionResult, page_dir: Path):
         """
-        Save parsed elements as JSON.
+        Save parsed elements with the configured serializer.
         
         Args:
             result: Extraction result
             page_dir: Output directory
         """
-        output_file = page_dir / "grounding.json"
+        codec = self.codecs['grounding_json']
+        output_file = codec.write_bytes(
+            codec.path(page_dir / self.serializer.filename("grounding")),
+            self.serializer.dumps(self._grounding_data(result))
+        )
+        
+        print(f"  ✓ Saved grounding JSON: {output_file.name}")
+    
+    def _grounding_data(self, result: ExtractionResult) -> Dict[str, Any]:
+        """
+        Build the grounding JSON data for a page.
+        
+        Args:
+            result: Extraction result
         
+        Returns:
+            dict: Parse result with extraction metadata
+        """
         # Convert to dictionary
         data = result.parse_result.to_dict()
         
@@ -104,10 +424,23 @@ class OutputManager:
             'prompt_used': result.prompt_used[:100] + "..." if len(result.prompt_used) > 100 else result.prompt_used
         }
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        # Image payload stats (bytes sent, encode time)
+        if result.metadata and result.metadata.get('payload'):
+            data['extraction_metadata']['payload'] = result.metadata['payload']
         
-        print(f"  ✓ Saved grounding JSON: {output_file.name}")
+        # Mapping from model space to the page pixels the bboxes are in
+        if result.metadata and result.metadata.get('coordinate_transform'):
+            data['extraction_metadata']['coordinate_transform'] = result.metadata['coordinate_transform']
+        
+        # Duplicate/nested element counts from overlap suppression
+        if result.metadata and result.metadata.get('overlaps'):
+            data['extraction_metadata']['overlaps'] = result.metadata['overlaps']
+        
+        # Fragment/paragraph counts from paragraph merging
+        if result.metadata and result.metadata.get('paragraphs'):
+            data['extraction_metadata']['paragraphs'] = result.metadata['paragraphs']
+        
+        return data
     
     def _save_markdown(self, result: ExtractionResult, page_dir: Path, page_name: str):
         """
@@ -118,13 +451,12 @@ class OutputManager:
             page_dir: Output directory
             page_name: Base name for file
         """
-        output_file = page_dir / f"{page_name}.md"
+        codec = self.codecs['markdown']
         
         # Convert elements to markdown
         markdown_content = self._elements_to_markdown(result)
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(markdown_content)
+        output_file = codec.write_bytes(codec.path(page_dir / f"{page_name}.md"), markdown_content.encode('utf-8'))
         
         print(f"  ✓ Saved markdown: {output_file.name}")
     
@@ -195,16 +527,18 @@ class OutputManager:
         output_dir = Path(output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
         
+        codec = self.codecs['combined']
         if format == "markdown":
-            output_file = output_dir / "full_document.md"
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(combined_data.get('content', ''))
+            output_file = codec.write_bytes(
+                codec.path(output_dir / "full_document.md"), combined_data.get('content', '').encode('utf-8')
+            )
             print(f"✓ Saved combined markdown: {output_file}")
         
         elif format == "json":
-            output_file = output_dir / "full_document.json"
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(combined_data, f, indent=2, ensure_ascii=False)
+            output_file = codec.write_bytes(
+                codec.path(output_dir / self.serializer.filename("full_document")),
+                self.serializer.dumps(combined_data)
+            )
             print(f"✓ Saved combined JSON: {output_file}")
     
     def save_metadata(
@@ -223,10 +557,7 @@ class OutputManager:
             >>> manager.save_metadata(metadata, "output/doc")
         """
         output_dir = Path(output_dir)
-        output_file = output_dir / self.config.metadata_filename
-        
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(metadata, f, indent=2, ensure_ascii=False)
+        output_file = self.metadata_serializer.dump(metadata, output_dir / self.config.metadata_filename)
         
         print(f"✓ Saved metadata: {output_file}")
     
@@ -253,10 +584,7 @@ class OutputManager:
             >>> manager.save_statistics(stats, "output/doc")
         """
         output_dir = Path(output_dir)
-        output_file = output_dir / filename
-        
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(statistics, f, indent=2, ensure_ascii=False)
+        output_file = self.metadata_serializer.dump(statistics, output_dir / filename)
         
         print(f"✓ Saved statistics: {output_file}")
     
@@ -0,0 +1,268 @@
+"""
+Serializers Module
+Pluggable encoders for grounding, combined and metadata files.
+Compact JSON by default (orjson when installed), pretty JSON for export, msgpack for binary.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Union
+import json
+import mmap
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+
+class Serializer:
+    """
+    Encodes plain data (dicts, lists, strings, numbers) to bytes and back.
+    
+    Attributes:
+        name: Registry name
+        extension: File extension including the dot
+        binary: True if the encoding is not text
+    """
+    
+    name = "base"
+    extension = ""
+    binary = False
+    
+    def dumps(self, data: Any) -> bytes:
+        """Encode data to bytes"""
+        raise NotImplementedError("Subclasses must implement dumps()")
+    
+    def loads(self, payload: bytes) -> Any:
+        """Decode bytes produced by dumps()"""
+        raise NotImplementedError("Subclasses must implement loads()")
+    
+    def dump(self, data: Any, path: Union[str, Path]) -> Path:
+        """
+        Encode data into a file.
+        
+        Args:
+            data: Data to encode
+            path: Target file
+        
+        Returns:
+            Path: The written file
+        """
+        path = Path(path)
+        path.write_bytes(self.dumps(data))
+        return path
+    
+    def load(self, path: Union[str, Path]) -> Any:
+        """Decode a file written by dump()"""
+        return self.loads(Path(path).read_bytes())
+    
+    def load_mapped(self, path: Union[str, Path]) -> Any:
+        """
+        Decode a file through a read-only memory map.
+        
+        The decoder reads the mapped pages directly instead of a bytes copy
+        of the whole file, so peak memory is the decoded data only.
+        
+        Args:
+            path: File written by dump()
+        
+        Returns:
+            Decoded data
+        """
+        with open(path, 'rb') as f:
+            # Empty files cannot be mapped
+            if not Path(path).stat().st_size:
+                return self.loads(b"")
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                with memoryview(mapped) as view:
+                    return self.loads(view)
+    
+    def filename(self, stem: str) -> str:
+        """File name for stem with this serializer's extension"""
+        return f"{stem}{self.extension}"
+
+
+class JsonSerializer(Serializer):
+    """
+    UTF-8 JSON, compact unless indent is set.
+    
+    Uses orjson when installed (and indent is None or 2), else the stdlib
+    encoder with compact separators.
+    
+    Example:
+        >>> JsonSerializer().dumps({'a': [1, 2]})
+        b'{"a":[1,2]}'
+    """
+    
+    extension = ".json"
+    
+    def __init__(self, indent: int = None, fast: bool = True):
+        """
+        Initialize serializer.
+        
+        Args:
+            indent: Indentation for pretty output (None = compact)
+            fast: Use orjson when available
+        """
+        self.indent = indent
+        self.use_orjson = fast and ORJSON_AVAILABLE and indent in (None, 2)
+        self.name = "json-pretty" if indent else "json"
+    
+    def dumps(self, data: Any) -> bytes:
+        if self.use_orjson:
+            option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+            if self.indent:
+                option |= orjson.OPT_INDENT_2
+            return orjson.dumps(data, option=option)
+        
+        if self.indent:
+            text = json.dumps(data, indent=self.indent, ensure_ascii=False)
+        else:
+            text = json.dumps(data, separators=(',', ':'), ensure_ascii=False)
+        return text.encode('utf-8')
+    
+    def loads(self, payload: Union[bytes, memoryview, str]) -> Any:
+        if ORJSON_AVAILABLE:
+            return orjson.loads(payload)
+        if isinstance(payload, memoryview):
+            payload = payload.tobytes()
+        return json.loads(payload.decode('utf-8') if isinstance(payload, bytes) else payload)
+
+
+class MsgpackSerializer(Serializer):
+    """
+    MessagePack binary encoding (requires the msgpack package).
+    
+    Round-trips everything the JSON serializers do; tuples come back as lists.
+    """
+    
+    name = "msgpack"
+    extension = ".msgpack"
+    binary = True
+    
+    def __init__(self):
+        """Initialize serializer"""
+        if not MSGPACK_AVAILABLE:
+            raise ImportError("msgpack serializer requires msgpack. Install: pip install msgpack")
+    
+    def dumps(self, data: Any) -> bytes:
+        return msgpack.packb(data, use_bin_type=True)
+    
+    def loads(self, payload: bytes) -> Any:
+        return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+
+
+SERIALIZERS = {
+    "json": lambda: JsonSerializer(),
+    "json-pretty": lambda: JsonSerializer(indent=2),
+    "msgpack": lambda: MsgpackSerializer(),
+}
+
+
+def get_serializer(name: str) -> Serializer:
+    """
+    Create a serializer by name.
+    
+    Args:
+        name: "json" (compact), "json-pretty" or "msgpack"
+    
+    Returns:
+        Serializer: New serializer instance
+    
+    Raises:
+        ValueError: If name is unknown
+        ImportError: If the serializer's package is not installed
+    
+    Example:
+        >>> serializer = get_serializer("json")
+        >>> serializer.dump(result.to_record(), "result" + serializer.extension)
+    """
+    if name not in SERIALIZERS:
+        raise ValueError(f"Unknown serializer: {name}. Must be one of: {list(SERIALIZERS)}")
+    return SERIALIZERS[name]()
+
+
+def serializer_for_path(path: Union[str, Path]) -> Serializer:
+    """
+    Pick the serializer matching a file's extension.
+    
+    Args:
+        path: File written by a serializer
+    
+    Returns:
+        Serializer: msgpack for .msgpack (also compressed, e.g. .msgpack.gz), JSON otherwise
+    """
+    return get_serializer("msgpack" if ".msgpack" in Path(path).suffixes else "json")
+
+
+def list_serializers() -> Dict[str, bool]:
+    """Serializer names and whether each can be used here"""
+    return {"json": True, "json-pretty": True, "msgpack": MSGPACK_AVAILABLE}
+
+
+if __name__ == "__main__":
+    print("Testing serializers.py...\n")
+    
+    import time
+    
+    print(f"orjson available: {ORJSON_AVAILABLE}")
+    print(f"msgpack available: {MSGPACK_AVAILABLE}\n")
+    
+    data = {
+        'pages': [
+            {
+                'page_number': page,
+                'elements': [
+                    {'id': i, 'type': 'text', 'bbox': [10, 20, 300, 40 + i], 'content': f"行 {i} text " * 5,
+                     'confidence': None, 'metadata': {'parent_id': 1} if i % 7 == 0 else None}
+                    for i in range(60)
+                ]
+            }
+            for page in range(1, 201)
+        ]
+    }
+    
+    # Test 1: Round trip and size
+    print("Test 1: Round Trip")
+    print("-" * 60)
+    for name, available in list_serializers().items():
+        if not available:
+            print(f"{name:12s} skipped (not installed)")
+            continue
+        serializer = get_serializer(name)
+        start_time = time.perf_counter()
+        payload = serializer.dumps(data)
+        encode_time = time.perf_counter() - start_time
+        start_time = time.perf_counter()
+        restored = serializer.loads(payload)
+        decode_time = time.perf_counter() - start_time
+        print(
+            f"{name:12s} {len(payload) / 1e6:5.2f} MB  encode {encode_time * 1000:6.1f} ms  "
+            f"decode {decode_time * 1000:6.1f} ms  equal: {restored == data}"
+        )
+    
+    # Test 2: Baseline stdlib pretty JSON
+    print("\n" + "="*60)
+    print("Test 2: Baseline json.dumps(indent=2)")
+    print("-" * 60)
+    start_time = time.perf_counter()
+    text = json.dumps(data, indent=2, ensure_ascii=False)
+    print(f"stdlib pretty {len(text.encode('utf-8')) / 1e6:5.2f} MB  encode {(time.perf_counter() - start_time) * 1000:6.1f} ms")
+    
+    # Test 3: Unknown name
+    print("\n" + "="*60)
+    print("Test 3: Validation")
+    print("-" * 60)
+    try:
+        get_serializer("xml")
+    except ValueError as e:
+        print(f"✓ Caught: {e}")
+    
+    print("\n✅ serializers.py tests passed!")
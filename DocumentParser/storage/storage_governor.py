@@ -0,0 +1,383 @@
+"""
+Storage Governor Module
+Tracks disk use under output_base_dir by category and enforces budgets.
+Evicts least-recently-used reproducible files and refuses work before the disk fills.
+"""
+
+from pathlib import Path, PurePosixPath
+from typing import Dict, Optional, List, Set, Tuple, Union
+import os
+import shutil
+import threading
+import time
+
+
+# Categories whose files can be recreated (re-render, re-annotate) and so may be evicted
+EVICTABLE_CATEGORIES = ("renders", "annotations", "caches")
+CATEGORIES = ("renders", "annotations", "caches", "raw_outputs", "results")
+
+_ANNOTATION_SUFFIXES = ("_annotated.png", "_comparison.png", "_original.png")
+
+
+class StorageBudgetError(RuntimeError):
+    """Raised when new work would exceed a budget that eviction cannot satisfy"""
+
+
+def classify_path(relative_path: Union[str, Path], blob_subfolder: str = "blobs") -> str:
+    """
+    Storage category of a file under the output base directory.
+    
+    Args:
+        relative_path: Path relative to output_base_dir
+        blob_subfolder: Name of the page image blob store folder
+    
+    Returns:
+        str: renders, annotations, caches, raw_outputs or results
+    
+    Example:
+        >>> classify_path("manual/temp_pages/page_001.png")
+        'renders'
+        >>> classify_path("manual/pages/page_001/raw_output.txt.gz")
+        'raw_outputs'
+    """
+    path = PurePosixPath(Path(relative_path).as_posix())
+    parts = path.parts
+    if "temp_pages" in parts or (parts and parts[0] == blob_subfolder):
+        return "renders"
+    if "cache" in parts or ".cache" in parts:
+        return "caches"
+    if path.name.endswith(_ANNOTATION_SUFFIXES) or "visualizations" in parts:
+        return "annotations"
+    if path.name.startswith("raw_output.txt"):
+        return "raw_outputs"
+    return "results"
+
+
+class StorageGovernor:
+    """
+    Disk budget manager for an output tree.
+    
+    Keeps an index of files (category, bytes, last use) built by one
+    scan and refreshed per directory with track(). enforce() evicts the
+    least-recently-used files of over-budget evictable categories;
+    check() also keeps min_free_bytes plus room for the next unit of
+    work free on the disk, and raises StorageBudgetError with a
+    per-category breakdown when that cannot be satisfied or raw outputs
+    and results exceed their budgets. Protected files and files under
+    protected directories (the document being processed and the blobs it
+    references) are never evicted, so evictable categories can run over
+    budget until the document is released.
+    
+    Hardlinked files (deduplicated page images) are counted as
+    size / link count per link, so shared blobs are not double counted.
+    
+    Example:
+        >>> governor = StorageGovernor("output", budgets={'renders': 2 * 1024**3}, min_free_bytes=5 * 1024**3)
+        >>> governor.protect("output/manual")
+        >>> governor.check(required_bytes=20 * 1024**2)  # Before each page
+        >>> governor.track("output/manual/pages/page_001")
+        >>> governor.usage()
+        {'renders': 1048576, 'annotations': 0, ...}
+    """
+    
+    def __init__(
+        self,
+        root: Union[str, Path],
+        budgets: Optional[Dict[str, int]] = None,
+        min_free_bytes: int = 0,
+        blob_subfolder: str = "blobs"
+    ):
+        """
+        Initialize governor (the tree is scanned on first use).
+        
+        Args:
+            root: Output base directory
+            budgets: Maximum bytes per category (missing = unbounded)
+            min_free_bytes: Free disk space to keep (0 = no check)
+            blob_subfolder: Name of the page image blob store folder
+        """
+        budgets = budgets or {}
+        for category in budgets:
+            if category not in CATEGORIES:
+                raise ValueError(f"Unknown storage category: {category}. Must be one of: {list(CATEGORIES)}")
+        
+        self.root = Path(root)
+        self.budgets = dict(budgets)
+        self.min_free_bytes = min_free_bytes
+        self.blob_subfolder = blob_subfolder
+        # Relative path -> (category, accounted bytes, last use)
+        self._index: Dict[str, Tuple[str, int, float]] = {}
+        self._protected: Set[str] = set()
+        self._scanned = False
+        self._lock = threading.RLock()
+        self.stats = {'evicted_files': 0, 'evicted_bytes': 0, 'refusals': 0}
+    
+    # ========== Tracking ==========
+    
+    def track(self, path: Union[str, Path]) -> int:
+        """
+        Re-read a file or directory subtree into the index.
+        
+        Entries under path that no longer exist are dropped.
+        
+        Args:
+            path: File or directory under root
+        
+        Returns:
+            int: Bytes now tracked under path
+        """
+        with self._lock:
+            self._ensure_scanned()
+            return self._track(Path(path))
+    
+    def touch(self, path: Union[str, Path]):
+        """Mark a tracked file as used now (moves it to the back of the eviction order)"""
+        key = self._key(Path(path))
+        with self._lock:
+            if key in self._index:
+                category, size, _ = self._index[key]
+                self._index[key] = (category, size, time.time())
+    
+    def protect(self, path: Union[str, Path]):
+        """Never evict the file or files under path (e.g. the document in progress)"""
+        key = self._key(Path(path))
+        with self._lock:
+            self._protected.add(key)
+    
+    def release(self, path: Union[str, Path]):
+        """Undo protect()"""
+        key = self._key(Path(path))
+        with self._lock:
+            self._protected.discard(key)
+    
+    def usage(self) -> Dict[str, int]:
+        """Tracked bytes per category"""
+        with self._lock:
+            self._ensure_scanned()
+            totals = {category: 0 for category in CATEGORIES}
+            for category, size, _ in self._index.values():
+                totals[category] += size
+            return totals
+    
+    # ========== Enforcement ==========
+    
+    def enforce(self) -> Dict[str, int]:
+        """
+        Evict files until every evictable category fits its budget.
+        
+        Returns:
+            Dict[str, int]: Files and bytes evicted by this call
+        """
+        with self._lock:
+            self._ensure_scanned()
+            evicted = {'files': 0, 'bytes': 0}
+            usage = self.usage()
+            for category in EVICTABLE_CATEGORIES:
+                budget = self.budgets.get(category)
+                if budget is not None and usage[category] > budget:
+                    self._evict([category], usage[category] - budget, evicted)
+            return evicted
+    
+    def check(self, required_bytes: int = 0):
+        """
+        Make room for new work or refuse it.
+        
+        Enforces category budgets, then evicts reproducible files (oldest
+        first, any category) until required_bytes plus min_free_bytes are
+        free on the disk.
+        
+        Args:
+            required_bytes: Bytes the next unit of work is expected to write
+        
+        Raises:
+            StorageBudgetError: If raw_outputs or results are over budget,
+                or the disk cannot be freed enough
+        """
+        with self._lock:
+            self.enforce()
+            usage = self.usage()
+            
+            # Evictable categories may run over only by protected files, which are evicted once released
+            for category, budget in self.budgets.items():
+                if category not in EVICTABLE_CATEGORIES and usage[category] > budget:
+                    self._refuse(
+                        f"{category} use {_format_bytes(usage[category])} exceeds its budget of "
+                        f"{_format_bytes(budget)} and is never evicted", usage
+                    )
+            
+            if not self.min_free_bytes:
+                return
+            shortfall = self.min_free_bytes + required_bytes - self.free_bytes()
+            if shortfall > 0:
+                # Only delete files when that can actually free enough space
+                if shortfall <= self._evictable_bytes():
+                    self._evict(list(EVICTABLE_CATEGORIES), shortfall, {'files': 0, 'bytes': 0})
+                free = self.free_bytes()
+                if free < self.min_free_bytes + required_bytes:
+                    self._refuse(
+                        f"only {_format_bytes(free)} free on disk; {_format_bytes(required_bytes)} needed "
+                        f"plus {_format_bytes(self.min_free_bytes)} reserve", self.usage()
+                    )
+    
+    def free_bytes(self) -> int:
+        """Free space on the disk holding root"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        return shutil.disk_usage(self.root).free
+    
+    # ========== Internals ==========
+    
+    def _ensure_scanned(self):
+        if not self._scanned:
+            self._scanned = True
+            if self.root.exists():
+                self._track(self.root)
+    
+    def _key(self, path: Path) -> str:
+        try:
+            return path.resolve().relative_to(self.root.resolve()).as_posix()
+        except ValueError:
+            return path.as_posix()
+    
+    def _track(self, path: Path) -> int:
+        key = self._key(path)
+        prefix = "" if key == "." else key + "/"
+        for existing in [k for k in self._index if k == key or k.startswith(prefix)]:
+            del self._index[existing]
+        
+        tracked = 0
+        files = [path] if path.is_file() else (p for p in path.rglob('*') if p.is_file())
+        for file in files:
+            try:
+                status = file.stat()
+            except FileNotFoundError:
+                continue
+            relative = self._key(file)
+            size = status.st_size // max(1, status.st_nlink)
+            self._index[relative] = (
+                classify_path(relative, self.blob_subfolder),
+                size,
+                max(status.st_atime, status.st_mtime)
+            )
+            tracked += size
+        return tracked
+    
+    def _is_protected(self, key: str) -> bool:
+        # The key itself or any of its parent directories (O(depth), not O(protected))
+        if not self._protected:
+            return False
+        parts = key.split("/")
+        return any("/".join(parts[:depth]) in self._protected for depth in range(1, len(parts) + 1))
+    
+    def _evictable_bytes(self) -> int:
+        return sum(
+            size for key, (category, size, _) in self._index.items()
+            if category in EVICTABLE_CATEGORIES and not self._is_protected(key)
+        )
+    
+    def _evict(self, categories: List[str], target_bytes: int, evicted: Dict[str, int]):
+        """Delete least-recently-used unprotected files of categories until target_bytes are freed"""
+        candidates = sorted(
+            (last_used, key, size)
+            for key, (category, size, last_used) in self._index.items()
+            if category in categories and not self._is_protected(key)
+        )
+        freed = 0
+        for _, key, size in candidates:
+            if freed >= target_bytes:
+                break
+            try:
+                (self.root / key).unlink()
+            except FileNotFoundError:
+                pass
+            del self._index[key]
+            freed += size
+            evicted['files'] += 1
+            evicted['bytes'] += size
+            self.stats['evicted_files'] += 1
+            self.stats['evicted_bytes'] += size
+        
+        if evicted['files']:
+            print(f"  [STORAGE] Evicted {evicted['files']} file(s), {_format_bytes(evicted['bytes'])}")
+    
+    def _refuse(self, reason: str, usage: Dict[str, int]):
+        self.stats['refusals'] += 1
+        breakdown = ", ".join(f"{category} {_format_bytes(size)}" for category, size in usage.items())
+        raise StorageBudgetError(f"Refusing new work in {self.root}: {reason} (usage: {breakdown})")
+
+
+def _format_bytes(size: int) -> str:
+    """Human-readable byte count"""
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(size) < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
+
+
+if __name__ == "__main__":
+    print("Testing storage_governor.py...\n")
+    
+    import tempfile
+    
+    temp_dir = Path(tempfile.mkdtemp())
+    
+    def write(relative: str, size: int, age: float = 0.0):
+        path = temp_dir / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"\0" * size)
+        stamp = time.time() - age
+        os.utime(path, (stamp, stamp))
+    
+    for page in range(1, 6):
+        write(f"manual/temp_pages/page_{page:03d}.png", 100_000, age=100 - page)
+        write(f"manual/pages/page_{page:03d}/raw_output.txt", 5_000)
+        write(f"manual/pages/page_{page:03d}/grounding.json", 8_000)
+        write(f"manual/pages/page_{page:03d}/page_{page:03d}_annotated.png", 50_000, age=50 - page)
+    
+    # Test 1: Usage by category
+    print("Test 1: Usage")
+    print("-" * 60)
+    governor = StorageGovernor(temp_dir, budgets={'renders': 250_000, 'raw_outputs': 20_000})
+    print(f"Usage: {governor.usage()}")
+    
+    # Test 2: LRU eviction of renders
+    print("\n" + "="*60)
+    print("Test 2: Enforce Budgets")
+    print("-" * 60)
+    print(f"Evicted: {governor.enforce()}")
+    print(f"Renders left: {sorted(p.name for p in (temp_dir / 'manual' / 'temp_pages').iterdir())}")
+    
+    # Test 3: Non-evictable category over budget
+    print("\n" + "="*60)
+    print("Test 3: Refuse Work")
+    print("-" * 60)
+    try:
+        governor.check()
+    except StorageBudgetError as e:
+        print(f"✓ Caught: {e}")
+    
+    # Test 4: Disk reserve larger than the disk
+    governor = StorageGovernor(temp_dir, min_free_bytes=shutil.disk_usage(temp_dir).total)
+    governor.protect(temp_dir / "manual" / "temp_pages")
+    try:
+        governor.check()
+    except StorageBudgetError as e:
+        print(f"✓ Caught: {e}")
+    print(f"Protected renders kept: {len(list((temp_dir / 'manual' / 'temp_pages').iterdir()))}")
+    
+    # Test 5: Protected single files (blobs referenced by the document in progress)
+    print("\n" + "="*60)
+    print("Test 5: Protect Files")
+    print("-" * 60)
+    write("blobs/ab/ab01.png", 100_000, age=200)
+    write("blobs/cd/cd02.png", 100_000, age=100)
+    governor = StorageGovernor(temp_dir, budgets={'renders': 0})
+    governor.protect(temp_dir / "blobs" / "ab" / "ab01.png")
+    governor.enforce()
+    print(f"Blobs left: {sorted(p.name for p in (temp_dir / 'blobs').rglob('*.png'))}")
+    assert (temp_dir / "blobs" / "ab" / "ab01.png").exists()
+    governor.release(temp_dir / "blobs" / "ab" / "ab01.png")
+    governor.enforce()
+    print(f"Blobs left after release: {sorted(p.name for p in (temp_dir / 'blobs').rglob('*.png'))}")
+    
+    print("\n✅ storage_governor.py tests passed!")
@@ -5,10 +5,10 @@ Creates annotated images showing detected elements.
 """
 
 from pathlib import Path
-from typing import List, Optional, Dict, Tuple
+from typing import List, Optional, Dict, Tuple, Union
 from PIL import Image, ImageDraw, ImageFont
 
-from ..parsers import ParsedElement
+from ..parsers import ParsedElement, ElementTable
 
 
 class BBoxVisualizer:
@@ -119,7 +119,7 @@ class BBoxVisualizer:
     def visualize(
         self,
         image_path: str,
-        elements: List[ParsedElement],
+        elements: Union[List[ParsedElement], ElementTable],
         output_path: str
     ) -> str:
         """
@@ -127,7 +127,8 @@ class BBoxVisualizer:
         
         Args:
             image_path: Path to input image
-            elements: List of parsed elements with bounding boxes
+            elements: Parsed elements, or an ElementTable (drawn straight
+                from its columns without building element objects)
             output_path: Path to save annotated image
             
         Returns:
@@ -153,8 +154,13 @@ class BBoxVisualizer:
         draw = ImageDraw.Draw(img)
         
         # Draw each element
-        for element in elements:
-            self._draw_element(draw, element)
+        if isinstance(elements, ElementTable):
+            rows = zip(elements.bboxes.tolist(), elements.element_ids.tolist(), elements.get_types())
+            for bbox, element_id, element_type in rows:
+                self._draw_box(draw, bbox, element_id, element_type)
+        else:
+            for element in elements:
+                self._draw_element(draw, element)
         
         # Create output directory if needed
         output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -172,9 +178,24 @@ class BBoxVisualizer:
             draw: PIL ImageDraw object
             element: Element to draw
         """
-        bbox = element.bbox
-        element_type = element.element_type
+        self._draw_box(draw, element.bbox, element.element_id, element.element_type)
+    
+    def _draw_box(
+        self,
+        draw: ImageDraw.Draw,
+        bbox: List[int],
+        element_id: int,
+        element_type: str
+    ):
+        """
+        Draw one bounding box with its label.
         
+        Args:
+            draw: PIL ImageDraw object
+            bbox: Bounding box [x1, y1, x2, y2]
+            element_id: Element ID shown in the label
+            element_type: Element type (selects color and label)
+        """
         # Get color for this element type
         color = self.get_color(element_type)
         
@@ -187,12 +208,14 @@ class BBoxVisualizer:
         
         # Draw label if enabled
         if self.show_labels or self.show_ids:
-            self._draw_label(draw, element, color)
+            self._draw_label(draw, bbox, element_id, element_type, color)
     
     def _draw_label(
         self,
         draw: ImageDraw.Draw,
-        element: ParsedElement,
+        bbox: List[int],
+        element_id: int,
+        element_type: str,
         color: Tuple[int, int, int]
     ):
         """
@@ -200,17 +223,17 @@ class BBoxVisualizer:
         
         Args:
             draw: PIL ImageDraw object
-            element: Element to label
+            bbox: Bounding box of the element
+            element_id: Element ID
+            element_type: Element type
             color: Color for label
         """
-        bbox = element.bbox
-        
         # Construct label text
         label_parts = []
         if self.show_ids:
-            label_parts.append(f"#{element.element_id}")
+            label_parts.append(f"#{element_id}")
         if self.show_labels:
-            label_parts.append(element.element_type)
+            label_parts.append(element_type)
         
         label_text = ": ".join(label_parts)
         
@@ -297,12 +320,12 @@ class BBoxVisualizer:
         
         return str(output_path)
     
-    def get_statistics(self, elements: List[ParsedElement]) -> Dict[str, int]:
+    def get_statistics(self, elements: Union[List[ParsedElement], ElementTable]) -> Dict[str, int]:
         """
         Get statistics about elements.
         
         Args:
-            elements: List of elements
+            elements: List of elements or an ElementTable
             
         Returns:
             dict: Statistics by element type
@@ -311,6 +334,9 @@ class BBoxVisualizer:
             >>> stats = visualizer.get_statistics(elements)
             >>> print(f"Tables: {stats.get('table', 0)}")
         """
+        if isinstance(elements, ElementTable):
+            return elements.count_by_type()
+        
         stats = {}
         for element in elements:
             element_type = element.element_type
@@ -402,6 +428,16 @@ if __name__ == "__main__":
         stats = visualizer.get_statistics(elements)
         print(f"Statistics: {stats}")
         
+        # Test 5: Columnar input
+        print("\n" + "="*60)
+        print("Test 5: ElementTable Input")
+        print("-" * 60)
+        table = ElementTable.from_elements(elements)
+        table_output = visualizer.visualize(str(test_image), table, str(temp_dir / "annotated_table.png"))
+        same_image = Image.open(table_output).tobytes() == Image.open(result).tobytes()
+        print(f"Same drawing as element list: {same_image}")
+        print(f"Statistics: {visualizer.get_statistics(table)}")
+        
         # Cleanup
         import shutil
         shutil.rmtree(temp_dir)
@@ -47,6 +47,18 @@ setup(
             "black>=23.0.0",
             "flake8>=6.0.0",
         ],
+        "fast": [
+            "orjson>=3.9.0",
+        ],
+        "msgpack": [
+            "msgpack>=1.0.0",
+        ],
+        "zstd": [
+            "zstandard>=0.21.0",
+        ],
+        "analytics": [
+            "pyarrow>=14.0.0",
+        ],
     },
     entry_points={
         "console_scripts": [